@@ -11,13 +11,23 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from typing import Optional, List, Dict
 from datetime import datetime
+import asyncio
 import logging
+import math
+from itertools import chain, islice
 from pydantic import BaseModel
 
 # Real integrations
 from integrations.reddit_public import RedditPublicClient
 from integrations.polymarket_client import PolymarketClient
 from integrations.kalshi_client import KalshiClient
+from integrations.http_transport import close_async_client
+from integrations.market_search import MarketSearchIndex
+from integrations.market_record import to_records
+from services.market_sync import MarketSync, market_key
+from services.orderbook_recorder import OrderBookRecorder
+from services.price_stream import PriceStream, create_feed
+from services.post_store import create_post_store
 
 # Configure logging
 logging.basicConfig(
@@ -50,29 +60,120 @@ sentiment_analyzer = None
 
 # Simple in-memory cache - Aggressive cleanup to minimize memory
 markets_cache = {"polymarket": [], "kalshi": [], "timestamp": None}
-sentiment_cache = {}  # Cache sentiment results: {market_id: {result, timestamp}}
+sentiment_cache = {}  # Cache sentiment results: {market_id: {prediction, metrics, timestamp}}
 CACHE_TTL = 1800  # 30 minutes - Aggressive cleanup to reduce memory
 SENTIMENT_CACHE_TTL = 1800  # 30 minutes - Cache AI results
 MAX_CACHE_SIZE = 150  # Maximum total markets to cache
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Fetched posts and their sentiment, so repeat analyses only score new posts
+post_store = create_post_store()
+
+# Delta market state - refreshes only touch markets whose fingerprint changed
+market_sync = MarketSync()
+
+
+def invalidate_changed_sentiment(changes: Dict):
+    """Drop cached AI results for markets that moved on refresh or were delisted."""
+    # Live price ticks do not change what the social sentiment is about
+    updated = [] if changes.get('source') == 'ticks' else changes['updated']
+    for market in updated + changes['removed']:
+        sentiment_cache.pop(market.get('market_id'), None)
+
+
+market_sync.subscribe(invalidate_changed_sentiment)
+
+# Full-text index over every cached market, kept current by sync change sets
+market_index = MarketSearchIndex()
+market_sync.subscribe(market_index.apply_changes)
+
+# Top-of-book history (set ORDERBOOK_DIR to keep flushed segments on disk)
+orderbook_recorder = OrderBookRecorder(directory=os.getenv("ORDERBOOK_DIR"))
+
+
+def rebuild_markets_cache():
+    """Rebuild the per-platform cache lists from sync state (highest volume first)."""
+    markets = sorted(market_sync.markets(), key=lambda x: x.get('volume', 0), reverse=True)
+    markets_cache["polymarket"] = [m for m in markets if m.get('platform') == 'polymarket']
+    markets_cache["kalshi"] = [m for m in markets if m.get('platform') == 'kalshi']
+    return markets
+
+
+def refresh_cached_prices(updated: List[Dict]):
+    """Swap ticked markets into the cache lists in place; order is kept until the next rebuild."""
+    by_key = {market_key(m): m for m in updated}
+    for platform in ("polymarket", "kalshi"):
+        markets_cache[platform] = [by_key.get(market_key(m), m) for m in markets_cache[platform]]
+
+
+def predict_from_sentiment(market: Dict, metrics: Optional[Dict], reasoning: str = "Analysis unavailable") -> Dict:
+    """Predict a shift from the gap between social sentiment and the market's current price."""
+    predicted_shift = 0.0
+    confidence = "low"
+
+    if metrics:
+        sentiment_score = metrics.get('sentiment_score', 0.0)
+        positive_ratio = metrics.get('positive_ratio', 0.5)
+        mention_count = metrics.get('mention_count', 0)
+
+        current_prob = market.get('current_probability', 0.5)
+        sentiment_prob = (sentiment_score + 1) / 2
+        predicted_shift = (sentiment_prob - current_prob) * 100 * 0.7
+
+        if mention_count > 20:
+            confidence = "high"
+        elif mention_count > 10:
+            confidence = "medium"
+
+        reasoning = f"Sentiment: {sentiment_score:+.2f} ({int(positive_ratio*100)}% positive from {mention_count} posts). Market at {current_prob*100:.1f}%, sentiment suggests {sentiment_prob*100:.1f}%"
+
+    return {
+        "market_id": market.get('market_id'),
+        "predicted_shift": round(predicted_shift, 2),
+        "confidence_level": confidence,
+        "reasoning": reasoning,
+        "time_horizon": "6h",
+        "created_at": datetime.utcnow().isoformat()
+    }
+
+
+def refresh_cached_predictions(updated: List[Dict]):
+    """Re-predict ticked markets that have cached sentiment at their new price."""
+    for market in updated:
+        cached = sentiment_cache.get(market.get('market_id'))
+        if cached and cached.get('metrics'):
+            cached['prediction'] = predict_from_sentiment(market, cached['metrics'])
+
+
+# Live price ticks between REST refreshes (PRICE_FEED=simulated for local runs)
+price_feed = create_feed(os.getenv("PRICE_FEED"))
+price_stream = PriceStream(market_sync, price_feed) if price_feed else None
+price_stream_task = None
+
+if price_stream:
+    price_stream.subscribe(refresh_cached_prices)
+    price_stream.subscribe(refresh_cached_predictions)
+    price_stream.subscribe(orderbook_recorder.record)
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup."""
-    global reddit_client, polymarket_client, kalshi_client, sentiment_analyzer
+    global reddit_client, polymarket_client, kalshi_client, sentiment_analyzer, price_stream_task
 
     logger.info("🚀 Starting PRODUCTION server with REAL data...")
 
     # Initialize Reddit public client
     try:
-        reddit_client = RedditPublicClient()
+        # Repeat searches only fetch posts newer than the last poll; small windows keep memory flat
+        reddit_client = RedditPublicClient(poll_window_size=25, poll_max_queries=100)
         logger.info("✅ Reddit public API client ready")
     except Exception as e:
         logger.error(f"❌ Reddit client failed: {e}")
 
     # Initialize Polymarket client
     try:
-        polymarket_client = PolymarketClient()
+        polymarket_client = PolymarketClient(search_index=market_index)
         logger.info("✅ Polymarket API client ready")
     except Exception as e:
         logger.error(f"❌ Polymarket client failed: {e}")
@@ -90,7 +191,7 @@ async def startup_event():
         logger.info("Loading sentiment model (optimized for memory)...")
         sentiment_analyzer = pipeline(
             "sentiment-analysis",
-            model="distilbert-base-uncased-finetuned-sst-2-english",
+            model=SENTIMENT_MODEL,
             device=-1  # CPU only
         )
         logger.info("✅ AI sentiment analyzer loaded (memory-optimized mode)")
@@ -98,6 +199,20 @@ async def startup_event():
         logger.error(f"❌ Sentiment analyzer failed: {e}")
         sentiment_analyzer = None
 
+    # Start live price ingestion
+    if price_stream:
+        price_stream_task = asyncio.create_task(price_stream.run_forever())
+        logger.info(f"✅ Price stream started ({price_feed.name} feed)")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop streaming, release pooled upstream connections and persist buffered snapshots."""
+    if price_stream_task:
+        price_stream_task.cancel()
+    await close_async_client()
+    orderbook_recorder.flush()
+
 
 def analyze_sentiment_batch(texts: List[str]) -> List[Dict]:
     """Analyze sentiment using real AI model."""
@@ -153,14 +268,16 @@ def calculate_sentiment_metrics(posts: List[Dict]) -> Dict:
         }
 
     # Extract texts
-    texts = []
-    for post in posts:
-        if post.get('platform') == 'reddit':
-            text = f"{post.get('title', '')} {post.get('text', '')}"
-            texts.append(text)
+    text_posts = [p for p in posts if p.get('platform') == 'reddit']
+    texts = [f"{p.get('title', '')} {p.get('text', '')}" for p in text_posts]
 
-    # Analyze sentiments
-    sentiments = analyze_sentiment_batch(texts)
+    # Analyze sentiments (only posts the store has not scored with this model)
+    if post_store is not None:
+        stored = post_store.score_posts(text_posts, texts, SENTIMENT_MODEL, analyze_sentiment_batch)
+        scored = [(post, s) for post, s in zip(text_posts, stored) if s is not None]
+    else:
+        scored = list(zip(text_posts, analyze_sentiment_batch(texts)))
+    sentiments = [s for _, s in scored]
 
     if not sentiments:
         return {'sentiment_score': 0.0, 'mention_count': len(posts)}
@@ -169,7 +286,7 @@ def calculate_sentiment_metrics(posts: List[Dict]) -> Dict:
     weighted_scores = []
     total_weight = 0
 
-    for post, sentiment in zip(posts, sentiments):
+    for post, sentiment in scored:
         engagement = post.get('upvotes', 0) + post.get('num_comments', 0) * 2
         weight = max(engagement, 1)
 
@@ -246,52 +363,61 @@ async def get_markets(
         await fetch_fresh_markets()
 
     # Get markets based on platform filter
-    if platform == "polymarket":
-        markets = markets_cache["polymarket"]
-    elif platform == "kalshi":
-        markets = markets_cache["kalshi"]
+    if platform in ("polymarket", "kalshi"):
+        markets = markets_cache[platform]
     else:
         # Return both platforms
-        markets = markets_cache["polymarket"] + markets_cache["kalshi"]
+        markets = chain(markets_cache["polymarket"], markets_cache["kalshi"])
 
     # Filter by category
     if category:
-        markets = [m for m in markets if m.get("category") == category]
+        markets = (m for m in markets if m.get("category") == category)
 
-    return markets[:limit]
+    # Records are only expanded into dicts for the markets actually returned
+    return [m.to_dict() for m in islice(markets, limit)]
 
 
 async def fetch_fresh_markets():
-    """Fetch fresh markets from both Polymarket and Kalshi."""
+    """Fetch fresh markets from both Polymarket and Kalshi and apply them as a delta."""
     global markets_cache
-    import gc
 
-    # Clear old cache to free memory before fetching new data
-    if markets_cache["polymarket"] or markets_cache["kalshi"]:
-        markets_cache["polymarket"] = []
-        markets_cache["kalshi"] = []
-        gc.collect()  # Force garbage collection
-
-    polymarket_markets = []
-    kalshi_markets = []
-
-    # Fetch from Polymarket
-    if polymarket_client:
+    async def fetch_polymarket():
+        if not polymarket_client:
+            return []
         try:
             logger.info("Fetching REAL markets from Polymarket...")
-            polymarket_markets = polymarket_client.get_markets(limit=100, active=True)
-            logger.info(f"✅ Fetched {len(polymarket_markets)} markets from Polymarket")
+            markets = await polymarket_client.get_markets_async(limit=100, active=True)
+            logger.info(f"✅ Fetched {len(markets)} markets from Polymarket")
+            return markets
         except Exception as e:
             logger.error(f"Error fetching Polymarket markets: {e}")
+            return []
 
-    # Fetch from Kalshi
-    if kalshi_client:
+    async def fetch_kalshi():
+        if not kalshi_client:
+            return []
         try:
             logger.info("Fetching REAL markets from Kalshi...")
-            kalshi_markets = kalshi_client.get_markets(limit=100, status="open")
-            logger.info(f"✅ Fetched {len(kalshi_markets)} markets from Kalshi")
+            markets = await kalshi_client.get_markets_async(limit=100, status="open")
+            logger.info(f"✅ Fetched {len(markets)} markets from Kalshi")
+            return markets
         except Exception as e:
             logger.error(f"Error fetching Kalshi markets: {e}")
+            return []
+
+    # Fetch both venues concurrently on the shared connection pool
+    polymarket_markets, kalshi_markets = await asyncio.gather(fetch_polymarket(), fetch_kalshi())
+
+    # Cache compact records rather than the clients' nested dicts
+    polymarket_markets = to_records(polymarket_markets)
+    kalshi_markets = to_records(kalshi_markets)
+    orderbook_recorder.record(polymarket_markets + kalshi_markets)
+
+    # A failed venue returns [], so keep its last known markets instead of removing them all
+    if not polymarket_markets:
+        polymarket_markets = market_sync.markets('polymarket')
+    if not kalshi_markets:
+        kalshi_markets = market_sync.markets('kalshi')
 
     # Limit cache size to prevent memory overflow
     total_markets = len(polymarket_markets) + len(kalshi_markets)
@@ -306,16 +432,74 @@ async def fetch_fresh_markets():
         kalshi_markets = [m for m in all_markets if m.get('platform') == 'kalshi']
         logger.info(f"⚠️  Cache limited to {MAX_CACHE_SIZE} markets (was {total_markets})")
 
-    # Update cache
-    markets_cache["polymarket"] = polymarket_markets
-    markets_cache["kalshi"] = kalshi_markets
+    # Apply only inserts, updates and removals
+    market_sync.apply(polymarket_markets + kalshi_markets)
+
+    # Update cache (highest volume first)
+    markets = rebuild_markets_cache()
     markets_cache["timestamp"] = datetime.utcnow()
 
-    # Force garbage collection after cache update
-    import gc
-    gc.collect()
+    return markets
+
+
+@app.get("/api/markets/changes")
+async def get_market_changes(since: int = 0):
+    """Get market change sets recorded after a sequence number."""
+    changes = market_sync.changes_since(since)
+
+    return {
+        "sequence": market_sync.sequence,
+        "resync": changes is None,
+        "changes": [
+            {
+                "sequence": c['sequence'],
+                "timestamp": c['timestamp'],
+                "inserted": [m.to_dict() for m in c['inserted']],
+                "updated": [m.to_dict() for m in c['updated']],
+                "removed": [m.to_dict() for m in c['removed']],
+                "unchanged": c['unchanged']
+            }
+            for c in changes or []
+        ]
+    }
+
+
+@app.get("/api/markets/search")
+async def search_markets(q: str, platform: Optional[str] = None, limit: int = 20):
+    """Search cached markets (terms, `prefix*` and "quoted phrases")."""
+    if not len(market_index):
+        await fetch_fresh_markets()
+
+    return [
+        dict(hit['market'].to_dict(), score=hit['score'])
+        for hit in market_index.search(q, limit=limit, platform=platform)
+    ]
+
+
+@app.get("/api/markets/{market_id}/book")
+async def get_market_book(market_id: str, platform: str = "kalshi", hours: int = 24):
+    """Get recorded top-of-book snapshots (mid price and spread) for a market."""
+    start = datetime.now().timestamp() - hours * 3600
+    book = orderbook_recorder.history(platform, market_id, start=start, include_segments=True)
 
-    return polymarket_markets + kalshi_markets
+    def value(x):
+        return None if math.isnan(x) else round(float(x), 4)
+
+    return {
+        "market_id": market_id,
+        "platform": platform,
+        "snapshots": [
+            {
+                "timestamp": datetime.utcfromtimestamp(book['ts'][i]).isoformat(),
+                "yes_bid": value(book['yes_bid'][i]),
+                "yes_ask": value(book['yes_ask'][i]),
+                "mid": value(book['mid'][i]),
+                "spread": value(book['spread'][i]),
+                "liquidity": value(book['liquidity'][i])
+            }
+            for i in range(len(book['ts']))
+        ]
+    }
 
 
 @app.get("/api/markets/{market_id}")
@@ -324,7 +508,7 @@ async def get_market_details(market_id: str):
     global sentiment_cache
 
     # Search in both Polymarket and Kalshi caches
-    all_markets = markets_cache.get("polymarket", []) + markets_cache.get("kalshi", [])
+    all_markets = chain(markets_cache.get("polymarket", []), markets_cache.get("kalshi", []))
     market = next((m for m in all_markets if m.get("market_id") == market_id), None)
 
     if not market:
@@ -336,11 +520,13 @@ async def get_market_details(market_id: str):
     if cached and (now - cached['timestamp']).total_seconds() < SENTIMENT_CACHE_TTL:
         logger.info(f"💾 Using cached sentiment for {market_id}")
         return {
-            "market": market,
+            "market": market.to_dict(),
             "predictions": [cached['prediction']]
         }
 
     # REAL AI-powered prediction - Memory optimized
+    metrics = None
+    reasoning = "Analysis unavailable"
     try:
         title = market.get('title', '')
         keywords = ' '.join(title.split()[:3])
@@ -348,7 +534,7 @@ async def get_market_details(market_id: str):
         logger.info(f"🔍 Analyzing sentiment for: {keywords}")
 
         # Fetch Reddit posts - REDUCED to 5 posts for memory optimization
-        reddit_posts = reddit_client.search_posts(
+        reddit_posts = await reddit_client.poll_posts_async(
             query=keywords,
             subreddit="all",
             time_filter="day",
@@ -356,56 +542,36 @@ async def get_market_details(market_id: str):
         )
 
         if reddit_posts:
-            metrics = calculate_sentiment_metrics(reddit_posts)
-            sentiment_score = metrics.get('sentiment_score', 0.0)
-            positive_ratio = metrics.get('positive_ratio', 0.5)
-            mention_count = metrics.get('mention_count', 0)
-
-            current_prob = market.get('current_probability', 0.5)
-            sentiment_prob = (sentiment_score + 1) / 2
-
-            gap = sentiment_prob - current_prob
-            predicted_shift = gap * 100 * 0.7
-
-            if mention_count > 20:
-                confidence = "high"
-            elif mention_count > 10:
-                confidence = "medium"
-            else:
-                confidence = "low"
-
-            reasoning = f"Sentiment: {sentiment_score:+.2f} ({int(positive_ratio*100)}% positive from {mention_count} posts). Market at {current_prob*100:.1f}%, sentiment suggests {sentiment_prob*100:.1f}%"
-
-            logger.info(f"✅ AI Analysis: shift={predicted_shift:+.2f}%, confidence={confidence}, posts={mention_count}")
+            full_metrics = await asyncio.to_thread(calculate_sentiment_metrics, reddit_posts)
+            # Keep only what predict_from_sentiment reads, so price ticks can re-predict
+            metrics = {
+                'sentiment_score': full_metrics.get('sentiment_score', 0.0),
+                'positive_ratio': full_metrics.get('positive_ratio', 0.5),
+                'mention_count': full_metrics.get('mention_count', 0)
+            }
 
             # Aggressive memory cleanup
             import gc
-            del reddit_posts, metrics
+            del reddit_posts, full_metrics
             gc.collect()
         else:
-            predicted_shift = 0.0
-            confidence = "low"
             reasoning = "No recent social media discussion found"
             logger.warning(f"⚠️  No Reddit posts found for: {keywords}")
 
     except Exception as e:
         logger.error(f"Error in AI prediction: {e}")
-        predicted_shift = 0.0
-        confidence = "low"
-        reasoning = "Analysis unavailable"
 
-    prediction = {
-        "market_id": market_id,
-        "predicted_shift": round(predicted_shift, 2),
-        "confidence_level": confidence,
-        "reasoning": reasoning,
-        "time_horizon": "6h",
-        "created_at": datetime.utcnow().isoformat()
-    }
+    prediction = predict_from_sentiment(market, metrics, reasoning)
+    if metrics:
+        logger.info(
+            f"✅ AI Analysis: shift={prediction['predicted_shift']:+.2f}%, "
+            f"confidence={prediction['confidence_level']}, posts={metrics['mention_count']}"
+        )
 
     # Cache the result
     sentiment_cache[market_id] = {
         'prediction': prediction,
+        'metrics': metrics,
         'timestamp': now
     }
 
@@ -417,7 +583,7 @@ async def get_market_details(market_id: str):
             del sentiment_cache[key]
 
     return {
-        "market": market,
+        "market": market.to_dict(),
         "predictions": [prediction]
     }
 
@@ -432,7 +598,7 @@ async def analyze_topic(topic: str, hours_back: int = 24):
         logger.info(f"🔍 Analyzing REAL data for topic: {topic}")
 
         # Fetch Reddit posts - REDUCED to 5 posts for memory
-        reddit_posts = reddit_client.search_posts(
+        reddit_posts = await reddit_client.poll_posts_async(
             query=topic,
             subreddit="all",
             time_filter="day",
@@ -448,21 +614,15 @@ async def analyze_topic(topic: str, hours_back: int = 24):
         logger.info(f"📊 Found {len(reddit_posts)} real Reddit posts")
 
         # Analyze sentiment with REAL AI
-        sentiment_metrics = calculate_sentiment_metrics(reddit_posts)
-
-        # Match to markets
-        matched_markets = []
-        markets = markets_cache.get("polymarket", []) + markets_cache.get("kalshi", [])
-
-        for market in markets[:50]:  # Limit to 50 markets to save memory
-            title_lower = market.get("title", "").lower()
-            topic_words = topic.lower().split()
+        sentiment_metrics = await asyncio.to_thread(calculate_sentiment_metrics, reddit_posts)
 
-            if any(word in title_lower for word in topic_words):
-                matched_markets.append({
-                    "market": market,
-                    "similarity": 0.75
-                })
+        # Match to markets across the whole cached catalog, best first
+        hits = market_index.search(topic, limit=5, require_all=False)
+        top_score = hits[0]['score'] if hits else 1.0
+        matched_markets = [
+            {"market": hit['market'].to_dict(), "similarity": round(hit['score'] / top_score, 2)}
+            for hit in hits
+        ]
 
         posts_count = len(reddit_posts)
 
@@ -493,6 +653,7 @@ async def refresh_markets():
     return {
         "status": "success",
         "total_markets": len(markets),
+        "sequence": market_sync.sequence,
         "mode": "REAL_DATA",
         "source": "Polymarket + Kalshi Public APIs"
     }
@@ -510,6 +671,8 @@ async def clear_cache():
     markets_cache["polymarket"] = []
     markets_cache["kalshi"] = []
     markets_cache["timestamp"] = None
+    market_sync.clear()
+    market_index.clear()
     sentiment_cache.clear()
 
     # Force aggressive garbage collection
@@ -553,7 +716,8 @@ async def health_check():
             "reddit_client": reddit_client is not None,
             "polymarket_client": polymarket_client is not None,
             "kalshi_client": kalshi_client is not None,
-            "sentiment_analyzer": sentiment_analyzer is not None
+            "sentiment_analyzer": sentiment_analyzer is not None,
+            "price_stream": price_stream.stats if price_stream else None
         }
     }
 
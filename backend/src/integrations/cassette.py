@@ -0,0 +1,416 @@
+"""Record/replay HTTP cassettes for upstream integrations (offline, reproducible benchmarks)."""
+import os
+import io
+import gzip
+import json
+import time
+import base64
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+MODES = ('record', 'replay')
+
+# Dropped when recording: the stored body is already decoded and re-framed on replay
+HOP_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'})
+
+
+class CassetteMiss(LookupError):
+    """Replay found no recorded interaction for a request."""
+
+
+def _normalize_url(url: str) -> str:
+    """Sort query parameters so equivalent requests share a key."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+
+
+def _path_key(method: str, url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    return (method.upper(), f"{parts.netloc}{parts.path}")
+
+
+def _body_hash(body: Optional[bytes]) -> str:
+    return hashlib.blake2b(body, digest_size=8).hexdigest() if body else ''
+
+
+class Cassette:
+    """
+    Gzipped JSON-lines file of HTTP interactions.
+
+    In 'record' mode requests go to the network and each response is
+    appended to the file. In 'replay' mode responses come from the file:
+    requests are matched on method, URL (query order ignored) and body,
+    falling back to method + path so time-dependent parameters still hit.
+    Repeated requests cycle through the recordings for their key, so a
+    small cassette can drive a long load test.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = 'replay',
+        speed: float = 1.0,
+        extra_latency: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize cassette.
+
+        Args:
+            path: Cassette file (.jsonl.gz)
+            mode: 'record' or 'replay'
+            speed: Replay speed multiplier applied to recorded latency (0 = no delay)
+            extra_latency: Seconds added to every replayed response
+            error_rate: Fraction of replayed requests answered with error_status
+            timeout_rate: Fraction of replayed requests that raise a read timeout
+            error_status: Status used for injected errors
+            seed: Random seed for error injection (deterministic runs)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.speed = speed
+        self.extra_latency = extra_latency
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self._exact: Dict[Tuple[str, str, str], List[Dict]] = defaultdict(list)
+        self._loose: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        self._cursors: Dict[tuple, int] = defaultdict(int)
+        self.stats = {'recorded': 0, 'replayed': 0, 'misses': 0, 'injected_errors': 0, 'injected_timeouts': 0}
+
+        if mode == 'replay':
+            self._load()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._exact.values())
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            logger.warning(f"Cassette {self.path} not found; every request will miss")
+            return
+
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    self._index(json.loads(line))
+
+        logger.info(f"Loaded {len(self)} interactions from cassette {self.path}")
+
+    def _index(self, interaction: Dict):
+        self._exact[(interaction['method'], interaction['url'], interaction['body_hash'])].append(interaction)
+        self._loose[_path_key(interaction['method'], interaction['url'])].append(interaction)
+
+    def record(self, method: str, url: str, body: Optional[bytes], status: int,
+               headers: Dict[str, str], content: bytes, elapsed: float):
+        """
+        Append one interaction to the cassette file.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            body: Request body
+            status: Response status code
+            headers: Response headers
+            content: Decoded response body
+            elapsed: Seconds the upstream took to respond
+        """
+        try:
+            text, encoding = content.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            text, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+
+        interaction = {
+            'method': method.upper(),
+            'url': _normalize_url(url),
+            'body_hash': _body_hash(body),
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() not in HOP_HEADERS},
+            'body': text,
+            'body_encoding': encoding,
+            'elapsed': round(elapsed, 4)
+        }
+
+        # Appending gzip members keeps the file valid even if the process dies mid-run
+        with self._lock:
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(json.dumps(interaction) + '\n')
+            self._index(interaction)
+            self.stats['recorded'] += 1
+
+    def lookup(self, method: str, url: str, body: Optional[bytes]) -> Dict:
+        """
+        Find the next recorded interaction for a request.
+
+        Raises:
+            CassetteMiss: Nothing recorded for this method and path
+        """
+        method = method.upper()
+        url = _normalize_url(url)
+        exact_key = (method, url, _body_hash(body))
+
+        with self._lock:
+            key, candidates = exact_key, self._exact.get(exact_key)
+            if not candidates:
+                key = _path_key(method, url)
+                candidates = self._loose.get(key)
+            if not candidates:
+                self.stats['misses'] += 1
+                raise CassetteMiss(f"No recorded interaction for {method} {url}")
+
+            interaction = candidates[self._cursors[key] % len(candidates)]
+            self._cursors[key] += 1
+            self.stats['replayed'] += 1
+        return interaction
+
+    def plan(self, interaction: Dict) -> Tuple[float, Optional[str]]:
+        """
+        Decide how to replay an interaction.
+
+        Returns:
+            (delay in seconds, fault) where fault is None, 'error' or 'timeout'
+        """
+        delay = self.extra_latency
+        if self.speed > 0:
+            delay += interaction.get('elapsed', 0.0) / self.speed
+
+        with self._lock:
+            roll = self._random.random()
+            if roll < self.timeout_rate:
+                self.stats['injected_timeouts'] += 1
+                return delay, 'timeout'
+            if roll < self.timeout_rate + self.error_rate:
+                self.stats['injected_errors'] += 1
+                return delay, 'error'
+        return delay, None
+
+    @staticmethod
+    def body(interaction: Dict) -> bytes:
+        """Decoded response body of an interaction."""
+        if interaction.get('body_encoding') == 'base64':
+            return base64.b64decode(interaction['body'])
+        return interaction['body'].encode('utf-8')
+
+    def async_transport(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> 'CassetteTransport':
+        """
+        httpx transport bound to this cassette.
+
+        Args:
+            transport: Network transport used while recording. httpx ignores a
+                client's http2/limits once a transport is given, so pass one
+                built with the production pool settings.
+        """
+        return CassetteTransport(self, transport)
+
+    def adapter(self) -> 'CassetteAdapter':
+        """requests adapter bound to this cassette."""
+        return CassetteAdapter(self)
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records through to the network or replays from a cassette."""
+
+    def __init__(self, cassette: Cassette, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+
+        if self.cassette.mode == 'record':
+            started = time.monotonic()
+            response = await self._transport.handle_async_request(request)
+            try:
+                content = await response.aread()
+            finally:
+                await response.aclose()
+            elapsed = time.monotonic() - started
+
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_HEADERS}
+            self.cassette.record(request.method, str(request.url), body, response.status_code,
+                                 headers, content, elapsed)
+            return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+        interaction = self.cassette.lookup(request.method, str(request.url), body)
+        delay, fault = self.cassette.plan(interaction)
+        if delay:
+            await asyncio.sleep(delay)
+        if fault == 'timeout':
+            raise httpx.ReadTimeout("Injected cassette timeout", request=request)
+        if fault == 'error':
+            return httpx.Response(self.cassette.error_status, content=b'', request=request)
+
+        return httpx.Response(
+            interaction['status'],
+            headers=interaction['headers'],
+            content=Cassette.body(interaction),
+            request=request
+        )
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class CassetteAdapter(HTTPAdapter):
+    """requests adapter that records through to the network or replays from a cassette."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        body = request.body.encode('utf-8') if isinstance(request.body, str) else request.body
+
+        if self.cassette.mode == 'record':
+            response = super().send(request, **kwargs)
+            content = response.content
+            self.cassette.record(request.method, request.url, body, response.status_code,
+                                 dict(response.headers), content, response.elapsed.total_seconds())
+            return response
+
+        interaction = self.cassette.lookup(request.method, request.url, body)
+        delay, fault = self.cassette.plan(interaction)
+        if delay:
+            time.sleep(delay)
+        if fault == 'timeout':
+            raise requests.exceptions.ReadTimeout("Injected cassette timeout", request=request)
+        if fault == 'error':
+            return self._build(request, self.cassette.error_status, {}, b'')
+
+        return self._build(request, interaction['status'], interaction['headers'], Cassette.body(interaction))
+
+    @staticmethod
+    def _build(request, status: int, headers: Dict[str, str], content: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(content)
+        response._content = content
+        response._content_consumed = True
+        response.reason = requests.status_codes._codes.get(status, ('',))[0].upper()
+        return response
+
+
+_cassette: Optional[Cassette] = None
+_cassette_loaded = False
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Get the process-wide cassette configured from the environment, if any.
+
+    HTTP_CASSETTE is the cassette path. HTTP_CASSETTE_MODE is 'replay'
+    (the default) or 'record'. Replay can be tuned with HTTP_CASSETTE_SPEED,
+    HTTP_CASSETTE_LATENCY, HTTP_CASSETTE_ERROR_RATE,
+    HTTP_CASSETTE_TIMEOUT_RATE and HTTP_CASSETTE_SEED.
+
+    Returns:
+        Shared Cassette, or None when HTTP_CASSETTE is unset
+    """
+    global _cassette, _cassette_loaded
+    if not _cassette_loaded:
+        _cassette_loaded = True
+        path = os.getenv("HTTP_CASSETTE")
+        if path:
+            seed = os.getenv("HTTP_CASSETTE_SEED")
+            _cassette = Cassette(
+                path,
+                mode=os.getenv("HTTP_CASSETTE_MODE", "replay"),
+                speed=float(os.getenv("HTTP_CASSETTE_SPEED", "1")),
+                extra_latency=float(os.getenv("HTTP_CASSETTE_LATENCY", "0")),
+                error_rate=float(os.getenv("HTTP_CASSETTE_ERROR_RATE", "0")),
+                timeout_rate=float(os.getenv("HTTP_CASSETTE_TIMEOUT_RATE", "0")),
+                seed=int(seed) if seed else None
+            )
+            logger.info(f"HTTP cassette enabled ({_cassette.mode}) at {path}")
+    return _cassette
+
+
+def use_cassette(cassette: Optional[Cassette]):
+    """Install (or with None, remove) the process-wide cassette, e.g. from a benchmark script."""
+    global _cassette, _cassette_loaded
+    _cassette, _cassette_loaded = cassette, True
+
+
+def mount_session(session: requests.Session) -> requests.Session:
+    """
+    Route a requests session through the configured cassette, if any.
+
+    Args:
+        session: Session to configure
+
+    Returns:
+        The same session
+    """
+    cassette = get_cassette()
+    if cassette is not None:
+        adapter = cassette.adapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    path = os.path.join(tempfile.mkdtemp(), 'demo.jsonl.gz')
+
+    # Record against a fake upstream instead of the network
+    upstream = httpx.MockTransport(lambda request: httpx.Response(200, json={'events': [], 'path': request.url.path}))
+    recorder = Cassette(path, mode='record')
+
+    async def record():
+        async with httpx.AsyncClient(transport=CassetteTransport(recorder, upstream)) as client:
+            for page in range(3):
+                await client.get('https://gamma-api.polymarket.com/events', params={'offset': page * 100})
+
+    asyncio.run(record())
+    print(f"Recorded: {recorder.stats}")
+
+    # Replay at 10x with 20% injected 503s
+    player = Cassette(path, mode='replay', speed=10, error_rate=0.2, seed=7)
+
+    async def replay():
+        async with httpx.AsyncClient(transport=player.async_transport()) as client:
+            statuses = []
+            for _ in range(20):
+                response = await client.get('https://gamma-api.polymarket.com/events', params={'offset': 0})
+                statuses.append(response.status_code)
+            return statuses
+
+    print(f"Replayed statuses: {asyncio.run(replay())}")
+    print(f"Replay stats: {player.stats}")
+
+    session = requests.Session()
+    session.mount('https://', player.adapter())
+    print(f"requests replay: {session.get('https://gamma-api.polymarket.com/events?offset=200').json()}")
@@ -0,0 +1,125 @@
+"""Concurrent topic x source fetch scheduler with merged, deduplicated results."""
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+
+FetchResult = Union[List[Dict], Awaitable[List[Dict]]]
+T = TypeVar('T')
+
+
+def merge_posts(batches: Iterable[List[Dict]], key: str = 'id') -> List[Dict]:
+    """
+    Concatenate post lists, keeping the first copy of each post id.
+
+    Args:
+        batches: Post lists (e.g. one per subreddit)
+        key: Field identifying a post
+
+    Returns:
+        Deduplicated posts in first-seen order
+    """
+    seen = set()
+    merged = []
+    for posts in batches:
+        for post in posts:
+            post_id = post.get(key)
+            if post_id is not None:
+                if post_id in seen:
+                    continue
+                seen.add(post_id)
+            merged.append(post)
+    return merged
+
+
+async def run_sweep(
+    topics: List[str],
+    sources: List[str],
+    fetch: Callable[[str, str], FetchResult],
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> Dict[str, List[Dict]]:
+    """
+    Fetch every topic from every source with bounded concurrency.
+
+    Pacing is left to the upstream's shared token bucket, which `fetch`
+    is expected to take from (directly or via retry_with_backoff), so the
+    sweep runs as fast as the rate limit allows. Blocking fetch functions
+    run in worker threads. A failed request is logged and contributes no
+    posts instead of failing the sweep.
+
+    Args:
+        topics: Search topics
+        sources: Sources to search per topic (e.g. subreddits)
+        fetch: fetch(topic, source) -> posts, sync or async
+        concurrency: Requests in flight at once
+
+    Returns:
+        Dict mapping topic to posts, deduplicated by post id
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    is_async = asyncio.iscoroutinefunction(fetch)
+
+    async def run(topic: str, source: str) -> List[Dict]:
+        async with semaphore:
+            try:
+                if is_async:
+                    return await fetch(topic, source)
+                return await asyncio.to_thread(fetch, topic, source)
+            except Exception as e:
+                logger.error(f"Error fetching {source} for topic '{topic}': {e}")
+                return []
+
+    started = time.monotonic()
+    batches = await asyncio.gather(*(run(topic, source) for topic in topics for source in sources))
+
+    results = {}
+    for i, topic in enumerate(topics):
+        results[topic] = merge_posts(batches[i * len(sources):(i + 1) * len(sources)])
+        logger.info(f"Total {len(results[topic])} posts for topic: {topic}")
+
+    logger.info(
+        f"Swept {len(topics)} topics x {len(sources)} sources in {time.monotonic() - started:.1f}s "
+        f"(concurrency {concurrency})"
+    )
+    return results
+
+
+def run_blocking(sweep: Callable[[], Awaitable[T]], name: str) -> T:
+    """
+    Run a sweep to completion from synchronous code.
+
+    asyncio.run cannot start inside a running event loop (and a second loop
+    would not share the pooled async client), so calling a blocking wrapper
+    from async code raises a RuntimeError naming the coroutine to await.
+
+    Args:
+        sweep: Returns the coroutine to run (only called outside an event loop)
+        name: Name of the blocking wrapper, e.g. 'TwitterClient.fetch_topics_data'
+
+    Returns:
+        The sweep's result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(sweep())
+    raise RuntimeError(f"{name} cannot run inside an event loop; await {name}_async instead")
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    async def fake_fetch(topic: str, subreddit: str) -> List[Dict]:
+        await asyncio.sleep(0.2)
+        # Cross-posts show up in several subreddits with the same id
+        return [{'id': f"{topic}-{n}", 'subreddit': subreddit} for n in range(5)] + \
+               [{'id': f"{topic}-{subreddit}", 'subreddit': subreddit}]
+
+    sweep = asyncio.run(run_sweep(['bitcoin', 'election'], ['news', 'politics', 'Bitcoin'], fake_fetch))
+    for topic, posts in sweep.items():
+        print(f"{topic}: {len(posts)} unique posts")
@@ -0,0 +1,124 @@
+"""Shared pooled async HTTP client for upstream integrations."""
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+import httpx
+
+try:
+    from integrations.cassette import get_cassette
+except ImportError:
+    from .cassette import get_cassette
+
+logger = logging.getLogger(__name__)
+
+# Pool configuration (override via environment)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional 'h2' package."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide async HTTP client, creating it on first use.
+
+    All integrations share one connection pool, so keep-alive connections
+    to each upstream are reused across requests and clients. When
+    HTTP_CASSETTE is set, requests are recorded or replayed instead.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _async_client
+
+    if _async_client is None or _async_client.is_closed:
+        http2 = _http2_available()
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+        cassette = get_cassette()
+        _async_client = httpx.AsyncClient(
+            http2=http2,
+            # A custom transport bypasses the client's http2/limits, so the cassette
+            # records through a network transport built with the same pool settings
+            transport=cassette.async_transport(httpx.AsyncHTTPTransport(http2=http2, limits=limits)) if cassette is not None else None,
+            timeout=HTTP_TIMEOUT,
+            limits=limits,
+            follow_redirects=True
+        )
+        logger.info(
+            f"Shared HTTP client created (http2={http2}, "
+            f"max_connections={HTTP_MAX_CONNECTIONS}, keepalive={HTTP_MAX_KEEPALIVE})"
+        )
+
+    return _async_client
+
+
+async def close_async_client():
+    """Close the shared client and release pooled connections."""
+    global _async_client
+
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+        logger.info("Shared HTTP client closed")
+    _async_client = None
+
+
+async def fetch_in_chunks(
+    ids: List[str],
+    fetch_chunk: Callable[[List[str]], Awaitable[Dict[str, Dict]]],
+    chunk_size: int = 50,
+    concurrency: int = 4
+) -> Dict[str, Dict]:
+    """
+    Resolve many ids with multi-id requests, a few chunks in flight at once.
+
+    A failed chunk or an id missing from its response is reported in
+    'errors' instead of raising, so one bad id never sinks the batch.
+
+    Args:
+        ids: Ids to fetch (duplicates are fetched once)
+        fetch_chunk: Coroutine taking a list of ids and returning {id: result}
+        chunk_size: Ids per request
+        concurrency: Requests in flight at once
+
+    Returns:
+        Dict with 'results' ({id: result}) and 'errors' ({id: message})
+    """
+    unique_ids = list(dict.fromkeys(str(i) for i in ids))
+    chunks = [unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+    results: Dict[str, Dict] = {}
+    errors: Dict[str, str] = {}
+
+    async def run(chunk: List[str]):
+        async with semaphore:
+            try:
+                found = await fetch_chunk(chunk)
+            except Exception as e:
+                logger.error(f"Error fetching chunk of {len(chunk)} ids: {e}")
+                errors.update((i, str(e)) for i in chunk)
+                return
+
+        for i in chunk:
+            if found.get(i) is not None:
+                results[i] = found[i]
+            else:
+                errors[i] = "not found"
+
+    await asyncio.gather(*(run(chunk) for chunk in chunks))
+    return {'results': results, 'errors': errors}
@@ -0,0 +1,234 @@
+"""Incremental decoding of large JSON array payloads from upstream APIs."""
+import json
+import logging
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAMING_AVAILABLE = ijson is not None
+
+_SCALAR_EVENTS = {'null', 'boolean', 'integer', 'double', 'number', 'string'}
+
+
+class JSONItemStream:
+    """
+    Push decoder that returns the items of one JSON array as body chunks arrive.
+
+    Only the requested field paths of each item are materialized; every other
+    value is tokenized and dropped. Without ijson installed the body is buffered
+    and decoded in one go on close(), with the same projection applied.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        fields: Optional[Sequence[str]] = None,
+        scalars: Sequence[str] = ()
+    ):
+        """
+        Initialize item stream.
+
+        Args:
+            prefix: ijson path of the array items ('item' for a top-level array,
+                'events.item' for {"events": [...]})
+            fields: Dotted paths kept inside each item, e.g. 'markets.item.ticker'
+                (None keeps whole items)
+            scalars: Top-level scalar paths to capture alongside, e.g. 'cursor'
+        """
+        self.prefix = prefix
+        self.scalars: Dict = {}
+        self._scalar_paths = set(scalars)
+        self._leaves = set(fields) if fields else None
+        self._containers = set()
+        for path in self._leaves or ():
+            while '.' in path:
+                path = path.rsplit('.', 1)[0]
+                self._containers.add(path)
+        self._wanted_cache: Dict[str, bool] = {}
+
+        self._items: List = []
+        self._builder = None
+
+        if ijson is not None:
+            self._events = ijson.sendable_list()
+            self._parser = ijson.parse_coro(self._events, use_float=True)
+        else:
+            self._chunks: List[bytes] = []
+
+    def _wanted(self, path: str) -> bool:
+        """Whether a path relative to the item root is part of the projection."""
+        if self._leaves is None or not path:
+            return True
+
+        wanted = self._wanted_cache.get(path)
+        if wanted is None:
+            wanted = path in self._leaves or path in self._containers
+            head = path
+            while not wanted and '.' in head:
+                head = head.rsplit('.', 1)[0]
+                wanted = head in self._leaves
+            self._wanted_cache[path] = wanted
+        return wanted
+
+    def _handle(self, prefix: str, event: str, value):
+        """Route one parser event into the current item builder."""
+        if self._builder is None:
+            if prefix == self.prefix:
+                if event in ('start_map', 'start_array'):
+                    self._builder = ObjectBuilder()
+                    self._builder.event(event, value)
+                elif event in _SCALAR_EVENTS:
+                    self._items.append(value)
+            elif prefix in self._scalar_paths and event in _SCALAR_EVENTS:
+                self.scalars[prefix] = value
+            return
+
+        relative = prefix[len(self.prefix) + 1:]
+        if event == 'map_key':
+            keep = self._wanted(f"{relative}.{value}" if relative else value)
+        else:
+            keep = self._wanted(relative)
+        if keep:
+            self._builder.event(event, value)
+
+        if prefix == self.prefix and event in ('end_map', 'end_array'):
+            self._items.append(self._builder.value)
+            self._builder = None
+
+    def _drain(self) -> List:
+        """Process buffered parser events and hand back completed items."""
+        for prefix, event, value in self._events:
+            self._handle(prefix, event, value)
+        del self._events[:]
+
+        items, self._items = self._items, []
+        return items
+
+    def feed(self, chunk: bytes) -> List:
+        """
+        Decode another chunk of the body.
+
+        Args:
+            chunk: Raw response bytes
+
+        Returns:
+            Items completed by this chunk
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        if not chunk:
+            return []
+        if ijson is None:
+            self._chunks.append(chunk)
+            return []
+
+        try:
+            self._parser.send(chunk)
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid JSON payload: {e}") from e
+        return self._drain()
+
+    def close(self) -> List:
+        """
+        Finish decoding.
+
+        Returns:
+            Items completed at end of body
+
+        Raises:
+            ValueError: If the body is not valid JSON
+        """
+        if ijson is not None:
+            try:
+                self._parser.close()
+            except ijson.JSONError as e:
+                raise ValueError(f"Invalid JSON payload: {e}") from e
+            return self._drain()
+
+        data = json.loads(b''.join(self._chunks))
+        self._chunks = []
+        for path in self._scalar_paths:
+            value = _select_path(data, path.split('.'))
+            if value is not None:
+                self.scalars[path] = value
+        return [self._project(item) for item in _select_items(data, self.prefix.split('.'))]
+
+    def _project(self, value, path: str = ''):
+        """Apply the field projection to an already decoded item."""
+        if self._leaves is None or path in self._leaves:
+            return value
+        if isinstance(value, dict):
+            return {
+                key: self._project(child, f"{path}.{key}" if path else key)
+                for key, child in value.items()
+                if self._wanted(f"{path}.{key}" if path else key)
+            }
+        if isinstance(value, list):
+            child_path = f"{path}.item" if path else 'item'
+            return [self._project(child, child_path) for child in value]
+        return value
+
+
+def _select_items(data, parts: List[str]) -> Iterator:
+    """Walk an ijson-style path ('item' = array element) through decoded JSON."""
+    if not parts:
+        yield data
+        return
+
+    head, rest = parts[0], parts[1:]
+    if head == 'item' and isinstance(data, list):
+        for child in data:
+            yield from _select_items(child, rest)
+    elif isinstance(data, dict) and head in data:
+        yield from _select_items(data[head], rest)
+
+
+def _select_path(data, parts: List[str]):
+    """Look up a plain dotted path in decoded JSON."""
+    for part in parts:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def iter_json_items(chunks: Iterable[bytes], stream: JSONItemStream) -> Iterator:
+    """
+    Yield array items from a synchronous chunk iterator.
+
+    Args:
+        chunks: Response body chunks (e.g. requests' iter_content)
+        stream: Configured JSONItemStream
+
+    Yields:
+        Decoded (projected) items
+    """
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+    yield from stream.close()
+
+
+async def aiter_json_items(chunks: AsyncIterator[bytes], stream: JSONItemStream) -> AsyncIterator:
+    """
+    Yield array items from an async chunk iterator.
+
+    Args:
+        chunks: Response body chunks (e.g. httpx's aiter_bytes)
+        stream: Configured JSONItemStream
+
+    Yields:
+        Decoded (projected) items
+    """
+    async for chunk in chunks:
+        for item in stream.feed(chunk):
+            yield item
+    for item in stream.close():
+        yield item
@@ -1,31 +1,41 @@
 """Kalshi API integration for prediction market data."""
 import os
+import time
+import asyncio
 import requests
-from typing import List, Dict, Optional
-from datetime import datetime
+import httpx
+from typing import AsyncIterator, Iterator, List, Dict, Optional
+from datetime import datetime, timezone
 import logging
-from functools import wraps
-import time
+
+try:
+    from integrations.http_transport import get_async_client, fetch_in_chunks
+    from integrations.cassette import mount_session
+    from integrations.resilience import retry_with_backoff
+    from integrations.json_stream import JSONItemStream, iter_json_items, aiter_json_items, STREAM_CHUNK_SIZE
+    from integrations.price_history import PriceHistoryStore, PRICE_SCALE
+    from integrations.taxonomy import get_taxonomy
+except ImportError:
+    from .http_transport import get_async_client, fetch_in_chunks
+    from .cassette import mount_session
+    from .resilience import retry_with_backoff
+    from .json_stream import JSONItemStream, iter_json_items, aiter_json_items, STREAM_CHUNK_SIZE
+    from .price_history import PriceHistoryStore, PRICE_SCALE
+    from .taxonomy import get_taxonomy
 
 logger = logging.getLogger(__name__)
 
+# Event fields read during normalization; everything else is skipped while decoding
+EVENT_FIELDS = ('series_ticker', 'category') + tuple(
+    f"markets.item.{field}" for field in (
+        'ticker', 'title', 'subtitle', 'category', 'status', 'close_time', 'volume', 'open_interest',
+        'last_price_dollars', 'yes_bid_dollars', 'yes_ask_dollars', 'no_bid_dollars', 'no_ask_dollars',
+        'liquidity_dollars'
+    )
+)
 
-def retry_with_backoff(max_retries=3, backoff_factor=2):
-    """Retry decorator with exponential backoff."""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise
-                    wait_time = backoff_factor ** attempt
-                    logger.warning(f"Retry {attempt+1}/{max_retries} after {wait_time}s: {e}")
-                    time.sleep(wait_time)
-        return wrapper
-    return decorator
+# Minimum seconds between history syncs of one ticker; reads in between are local only
+HISTORY_SYNC_INTERVAL = 60
 
 
 class KalshiClient:
@@ -33,22 +43,30 @@ class KalshiClient:
 
     BASE_URL = "https://api.elections.kalshi.com/trade-api/v2"
 
-    def __init__(self):
-        """Initialize Kalshi client."""
+    def __init__(self, history_store: Optional[PriceHistoryStore] = None):
+        """
+        Initialize Kalshi client.
+
+        Args:
+            history_store: Local price history cache (defaults to one under PRICE_HISTORY_DIR, if set)
+        """
         self.api_key = os.getenv("KALSHI_API_KEY")
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.history_store = history_store or PriceHistoryStore(os.getenv("PRICE_HISTORY_DIR"))
+        self._history_synced: Dict[str, float] = {}  # Ticker -> monotonic time of last successful sync
+        self.taxonomy = get_taxonomy()
+        self.headers = {
             'Accept': 'application/json',
             'User-Agent': 'AI-Mindshare-Analyzer/1.0'
-        })
+        }
 
         if self.api_key:
-            self.session.headers.update({
-                "Authorization": f"Bearer {self.api_key}"
-            })
+            self.headers["Authorization"] = f"Bearer {self.api_key}"
+
+        self.session = mount_session(requests.Session())
+        self.session.headers.update(self.headers)
         logger.info("Kalshi client initialized successfully")
 
-    @retry_with_backoff(max_retries=3)
+    @retry_with_backoff(max_retries=3, upstream='kalshi')
     def get_markets(
         self,
         limit: int = 100,
@@ -67,212 +85,495 @@ class KalshiClient:
             List of market dictionaries
         """
         try:
-            params = {
-                "limit": limit,
-                "status": status,
-                "with_nested_markets": "true"
-            }
-            if category:
-                params["series_ticker"] = category
+            processed_markets = list(self.stream_markets(limit, status, category))
 
-            response = self.session.get(
-                f"{self.BASE_URL}/events",
-                params=params,
-                timeout=15
-            )
+            logger.info(f"Fetched {len(processed_markets)} markets from Kalshi events")
+            return processed_markets
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching Kalshi markets: {e}")
+            raise
+
+    def stream_markets(
+        self,
+        limit: int = 100,
+        status: str = "open",
+        category: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield normalized markets while the events response is still downloading.
+
+        The body is decoded incrementally, keeping only EVENT_FIELDS of one
+        event at a time instead of the whole payload.
+
+        Args:
+            limit: Maximum number of events
+            status: Market status ('open', 'closed', 'settled')
+            category: Filter by category (series ticker)
+
+        Yields:
+            Market dictionaries
+        """
+        now = datetime.now(timezone.utc)
+
+        with self.session.get(
+            f"{self.BASE_URL}/events",
+            params=self._events_params(limit, status, category),
+            timeout=15,
+            stream=True
+        ) as response:
             response.raise_for_status()
 
-            data = response.json()
-            events = data.get("events", [])
+            stream = JSONItemStream('events.item', EVENT_FIELDS)
+            for event in iter_json_items(response.iter_content(STREAM_CHUNK_SIZE), stream):
+                yield from self._normalize_event(event, status, now)
 
-            # Extract markets from events and normalize
-            processed_markets = []
-            from datetime import timezone
-            now = datetime.now(timezone.utc)
-
-            for event in events:
-                series_ticker = event.get('series_ticker', '')
-                markets = event.get('markets', [])
-
-                for market in markets:
-                    # Filter by close time if status is open
-                    close_time_str = market.get('close_time')
-                    if status == "open" and close_time_str:
-                        try:
-                            close_time = self._parse_datetime(close_time_str)
-                            if close_time and close_time <= now:
-                                continue  # Skip expired
-                        except Exception:
-                            pass
-
-                    # Calculate yes price with fallback
-                    yes_price = 0.0
-                    try:
-                        last_price = market.get("last_price_dollars")
-                        if last_price and float(last_price) > 0:
-                            yes_price = float(last_price)
-                        else:
-                            yes_bid = float(market.get("yes_bid_dollars", 0.0) or 0.0)
-                            yes_ask = float(market.get("yes_ask_dollars", 0.0) or 0.0)
-
-                            if yes_bid > 0 and yes_ask > 0:
-                                yes_price = (yes_bid + yes_ask) / 2
-                            elif yes_ask > 0:
-                                yes_price = yes_ask
-                            elif yes_bid > 0:
-                                yes_price = yes_bid
-                    except (ValueError, TypeError):
-                        yes_price = 0.0
-
-                    # Get volume in cents and convert to dollars
-                    volume_cents = market.get("volume", 0) or 0
-                    volume_dollars = volume_cents / 100.0
-
-                    # Filter: Minimal volume filter to remove inactive markets
-                    # Polymarket: $1,000 minimum, Kalshi: $50 minimum
-                    if volume_dollars < 50:
-                        continue
-
-                    # Format close time
-                    try:
-                        close_time = self._parse_datetime(close_time_str)
-                        close_time_formatted = close_time.strftime('%b %d, %Y') if close_time else 'TBD'
-                    except Exception:
-                        close_time_formatted = 'TBD'
-
-                    ticker = market.get('ticker', '')
-
-                    # Normalize category to lowercase for consistency
-                    raw_category = market.get('category', '').lower()
-                    # Map Kalshi categories to standard categories
-                    category_map = {
-                        'politics': 'politics',
-                        'crypto': 'cryptocurrency',
-                        'cryptocurrency': 'cryptocurrency',
-                        'tech': 'technology',
-                        'technology': 'technology',
-                        'sports': 'sports',
-                        'finance': 'finance',
-                        'economics': 'finance',
-                        'culture': 'other',
-                        'science': 'technology',
-                        'climate': 'other'
-                    }
-                    normalized_category = category_map.get(raw_category, raw_category or 'other')
-
-                    processed_markets.append({
-                        'platform': 'kalshi',
-                        'market_id': ticker,
-                        'title': market.get('title', ''),
-                        'description': market.get('subtitle', ''),
-                        'category': normalized_category,
-                        'current_probability': yes_price,
-                        'volume': volume_dollars,
-                        'end_date': close_time_str,
-                        'end_date_formatted': close_time_formatted,
-                        'status': market.get('status', 'unknown'),
-                        'close_time': self._parse_datetime(close_time_str),
-                        'metadata': {
-                            'ticker': ticker,
-                            'series_ticker': series_ticker,
-                            'slug': series_ticker.lower() if series_ticker else ticker.lower(),
-                            'open_interest': market.get('open_interest', 0),
-                            'yes_bid_dollars': market.get('yes_bid_dollars', 0),
-                            'yes_ask_dollars': market.get('yes_ask_dollars', 0),
-                            'no_bid_dollars': market.get('no_bid_dollars', 0),
-                            'no_ask_dollars': market.get('no_ask_dollars', 0)
-                        }
-                    })
+    async def stream_markets_async(
+        self,
+        limit: int = 100,
+        status: str = "open",
+        category: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Async variant of stream_markets using the shared pooled HTTP client.
+
+        Args:
+            limit: Maximum number of events
+            status: Market status ('open', 'closed', 'settled')
+            category: Filter by category (series ticker)
+
+        Yields:
+            Market dictionaries
+        """
+        now = datetime.now(timezone.utc)
+
+        async with get_async_client().stream(
+            "GET",
+            f"{self.BASE_URL}/events",
+            params=self._events_params(limit, status, category),
+            headers=self.headers,
+            timeout=15
+        ) as response:
+            response.raise_for_status()
+
+            stream = JSONItemStream('events.item', EVENT_FIELDS)
+            async for event in aiter_json_items(response.aiter_bytes(), stream):
+                for market in self._normalize_event(event, status, now):
+                    yield market
+
+    async def get_markets_async(
+        self,
+        limit: int = 100,
+        status: str = "open",
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Async variant of get_markets using the shared pooled HTTP client.
+
+        Retries happen per page in _get_events_page_async.
+
+        Args:
+            limit: Maximum number of markets to return
+            status: Market status ('open', 'closed', 'settled')
+            category: Filter by category (e.g., 'politics', 'crypto')
+
+        Returns:
+            List of market dictionaries
+        """
+        try:
+            data = await self._get_events_page_async(self._events_params(limit, status, category))
+            events = data.get("events", [])
+            processed_markets = self._normalize_events(events, status)
 
             logger.info(f"Fetched {len(processed_markets)} markets from {len(events)} Kalshi events")
             return processed_markets
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching Kalshi markets: {e}")
             raise
 
-    @retry_with_backoff(max_retries=3)
-    def get_market_details(self, market_ticker: str) -> Optional[Dict]:
+    async def iter_markets_async(
+        self,
+        status: str = "open",
+        category: Optional[str] = None,
+        page_size: int = 200,
+        max_pages: Optional[int] = None,
+        prefetch: int = 2
+    ) -> AsyncIterator[Dict]:
         """
-        Get detailed information for a specific market.
+        Stream normalized markets across every page of the events endpoint.
+
+        Pages are chained by Kalshi's cursor, so the next page is fetched in the
+        background while the current one is being normalized. At most `prefetch`
+        raw pages are held in memory at any time.
 
         Args:
-            market_ticker: Market ticker/ID
+            status: Market status ('open', 'closed', 'settled')
+            category: Filter by category (series ticker)
+            page_size: Events per page (Kalshi allows up to 200)
+            max_pages: Stop after this many pages (None = whole catalog)
+            prefetch: Raw pages buffered ahead of the consumer
 
-        Returns:
-            Market details dictionary
+        Yields:
+            Market dictionaries
         """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+
+        async def produce():
+            cursor = None
+            pages = 0
+            try:
+                while True:
+                    data = await self._get_events_page_async(
+                        self._events_params(page_size, status, category, cursor)
+                    )
+
+                    events = data.get("events", [])
+                    await queue.put(events)
+
+                    pages += 1
+                    cursor = data.get("cursor")
+                    if not cursor or not events or (max_pages and pages >= max_pages):
+                        break
+            except Exception as e:
+                await queue.put(e)
+            await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        total = 0
         try:
-            response = self.session.get(
-                f"{self.BASE_URL}/markets/{market_ticker}",
-                timeout=10
-            )
+            while True:
+                page = await queue.get()
+                if page is None:
+                    break
+                if isinstance(page, Exception):
+                    logger.error(f"Error paginating Kalshi events after {total} markets: {page}")
+                    raise page
+
+                for market in self._normalize_events(page, status):
+                    total += 1
+                    yield market
+        finally:
+            producer.cancel()
+
+        logger.info(f"Streamed {total} markets from Kalshi events")
+
+    @retry_with_backoff(max_retries=3, upstream='kalshi')
+    async def _get_events_page_async(self, params: Dict) -> Dict:
+        """Fetch one page of the events endpoint on the shared async client, decoding only EVENT_FIELDS."""
+        async with get_async_client().stream(
+            "GET",
+            f"{self.BASE_URL}/events",
+            params=params,
+            headers=self.headers,
+            timeout=15
+        ) as response:
             response.raise_for_status()
 
-            market = response.json().get("market", {})
+            stream = JSONItemStream('events.item', EVENT_FIELDS, scalars=('cursor',))
+            events = [event async for event in aiter_json_items(response.aiter_bytes(), stream)]
+            return {"events": events, "cursor": stream.scalars.get('cursor')}
+
+    @staticmethod
+    def _events_params(
+        limit: int,
+        status: str,
+        category: Optional[str],
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """Build query parameters for the events endpoint."""
+        params = {
+            "limit": limit,
+            "status": status,
+            "with_nested_markets": "true"
+        }
+        if category:
+            params["series_ticker"] = category
+        if cursor:
+            params["cursor"] = cursor
+        return params
+
+    def _normalize_events(self, events: List[Dict], status: str) -> List[Dict]:
+        """
+        Flatten Kalshi events into normalized market dictionaries.
+
+        Args:
+            events: Raw events with nested markets
+            status: Requested market status (expired markets are dropped for 'open')
+
+        Returns:
+            List of market dictionaries
+        """
+        processed_markets = []
+        now = datetime.now(timezone.utc)
+
+        for event in events:
+            processed_markets.extend(self._normalize_event(event, status, now))
+
+        return processed_markets
+
+    def _normalize_event(self, event: Dict, status: str, now: datetime) -> List[Dict]:
+        """
+        Flatten one Kalshi event into normalized market dictionaries.
+
+        Args:
+            event: Raw event with nested markets (at least EVENT_FIELDS)
+            status: Requested market status (expired markets are dropped for 'open')
+            now: Reference time for the expiry check
+
+        Returns:
+            List of market dictionaries
+        """
+        processed_markets = []
+        series_ticker = event.get('series_ticker', '')
+        markets = event.get('markets', [])
+
+        for market in markets:
+            # Filter by close time if status is open
+            close_time_str = market.get('close_time')
+            if status == "open" and close_time_str:
+                try:
+                    close_time = self._parse_datetime(close_time_str)
+                    if close_time and close_time <= now:
+                        continue  # Skip expired
+                except Exception:
+                    pass
+
+            # Calculate yes price with fallback
+            yes_price = 0.0
+            try:
+                last_price = market.get("last_price_dollars")
+                if last_price and float(last_price) > 0:
+                    yes_price = float(last_price)
+                else:
+                    yes_bid = float(market.get("yes_bid_dollars", 0.0) or 0.0)
+                    yes_ask = float(market.get("yes_ask_dollars", 0.0) or 0.0)
+
+                    if yes_bid > 0 and yes_ask > 0:
+                        yes_price = (yes_bid + yes_ask) / 2
+                    elif yes_ask > 0:
+                        yes_price = yes_ask
+                    elif yes_bid > 0:
+                        yes_price = yes_bid
+            except (ValueError, TypeError):
+                yes_price = 0.0
+
+            # Get volume in cents and convert to dollars
+            volume_cents = market.get("volume", 0) or 0
+            volume_dollars = volume_cents / 100.0
+
+            # Filter: Minimal volume filter to remove inactive markets
+            # Polymarket: $1,000 minimum, Kalshi: $50 minimum
+            if volume_dollars < 50:
+                continue
+
+            # Format close time
+            try:
+                close_time = self._parse_datetime(close_time_str)
+                close_time_formatted = close_time.strftime('%b %d, %Y') if close_time else 'TBD'
+            except Exception:
+                close_time_formatted = 'TBD'
+
+            ticker = market.get('ticker', '')
+
+            # Shared taxonomy: Kalshi's own category when it maps, else keyword rules
+            normalized_category = self.taxonomy.classify(
+                ticker,
+                market.get('title', ''),
+                market.get('subtitle', ''),
+                market.get('category') or event.get('category')
+            )
 
-            return {
+            processed_markets.append({
                 'platform': 'kalshi',
-                'market_id': market.get('ticker'),
-                'title': market.get('title'),
+                'market_id': ticker,
+                'title': market.get('title', ''),
                 'description': market.get('subtitle', ''),
-                'category': market.get('category', ''),
-                'current_probability': market.get('yes_ask', 0) / 100.0,
-                'volume': market.get('volume', 0),
-                'close_time': self._parse_datetime(market.get('close_time')),
+                'category': normalized_category,
+                'current_probability': yes_price,
+                'volume': volume_dollars,
+                'end_date': close_time_str,
+                'end_date_formatted': close_time_formatted,
+                'status': market.get('status', 'unknown'),
+                'close_time': self._parse_datetime(close_time_str),
                 'metadata': {
+                    'ticker': ticker,
+                    'series_ticker': series_ticker,
+                    'slug': series_ticker.lower() if series_ticker else ticker.lower(),
                     'open_interest': market.get('open_interest', 0),
-                    'liquidity': market.get('liquidity', 0),
-                    'yes_bid': market.get('yes_bid', 0),
-                    'yes_ask': market.get('yes_ask', 0),
-                    'no_bid': market.get('no_bid', 0),
-                    'no_ask': market.get('no_ask', 0),
-                    'rules': market.get('rules', ''),
-                    'can_close_early': market.get('can_close_early', False)
+                    'yes_bid_dollars': market.get('yes_bid_dollars', 0),
+                    'yes_ask_dollars': market.get('yes_ask_dollars', 0),
+                    'no_bid_dollars': market.get('no_bid_dollars', 0),
+                    'no_ask_dollars': market.get('no_ask_dollars', 0),
+                    'liquidity_dollars': market.get('liquidity_dollars', 0)
                 }
-            }
+            })
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching Kalshi market {market_ticker}: {e}")
-            return None
+        return processed_markets
+
+    async def get_market_details_bulk(
+        self,
+        market_tickers: List[str],
+        chunk_size: int = 100,
+        concurrency: int = 4
+    ) -> Dict[str, Dict]:
+        """
+        Get details for many markets with multi-ticker queries.
+
+        Args:
+            market_tickers: Market tickers
+            chunk_size: Tickers per request
+            concurrency: Requests in flight at once
+
+        Returns:
+            Dict with 'results' ({ticker: details}) and 'errors' ({ticker: message})
+        """
+        details = await fetch_in_chunks(market_tickers, self._get_markets_by_ticker_async, chunk_size, concurrency)
+        logger.info(
+            f"Fetched details for {len(details['results'])} Kalshi markets "
+            f"({len(details['errors'])} errors)"
+        )
+        return details
+
+    @retry_with_backoff(max_retries=3, upstream='kalshi')
+    async def _get_markets_by_ticker_async(self, market_tickers: List[str]) -> Dict[str, Dict]:
+        """Fetch one chunk of markets (?tickers=A,B,...) on the shared async client."""
+        response = await get_async_client().get(
+            f"{self.BASE_URL}/markets",
+            params={"tickers": ",".join(market_tickers), "limit": len(market_tickers)},
+            headers=self.headers,
+            timeout=15
+        )
+        response.raise_for_status()
+
+        markets = response.json().get("markets", [])
+        return {market.get('ticker'): self._normalize_detail(market) for market in markets}
+
+    def _normalize_detail(self, market: Dict) -> Dict:
+        """Normalize a full market object from the markets endpoints."""
+        return {
+            'platform': 'kalshi',
+            'market_id': market.get('ticker'),
+            'title': market.get('title'),
+            'description': market.get('subtitle', ''),
+            'category': self.taxonomy.classify(
+                market.get('ticker'), market.get('title', ''), market.get('subtitle', ''), market.get('category')
+            ),
+            'current_probability': market.get('yes_ask', 0) / 100.0,
+            'volume': market.get('volume', 0),
+            'close_time': self._parse_datetime(market.get('close_time')),
+            'metadata': {
+                'open_interest': market.get('open_interest', 0),
+                'liquidity': market.get('liquidity', 0),
+                'yes_bid': market.get('yes_bid', 0),
+                'yes_ask': market.get('yes_ask', 0),
+                'no_bid': market.get('no_bid', 0),
+                'no_ask': market.get('no_ask', 0),
+                'rules': market.get('rules', ''),
+                'can_close_early': market.get('can_close_early', False)
+            }
+        }
 
     def get_market_history(
         self,
         market_ticker: str,
         min_ts: Optional[int] = None,
-        max_ts: Optional[int] = None
+        max_ts: Optional[int] = None,
+        refresh: bool = True
     ) -> List[Dict]:
         """
-        Get historical price data for a market.
+        Get historical price data for a market from the local store.
+
+        The API is only asked for points newer than the last stored one, and
+        at most once per HISTORY_SYNC_INTERVAL per ticker; other calls are
+        served from the store. A range ending at or before the newest stored
+        point never triggers a sync.
+
+        Note: points carry only the stored columns ts, yes_bid, yes_ask and
+        volume. Other fields of the raw API history points are not kept.
 
         Args:
             market_ticker: Market ticker
             min_ts: Minimum timestamp (Unix)
             max_ts: Maximum timestamp (Unix)
+            refresh: Sync new points from the API first if the stored series is stale
+
+        Returns:
+            List of historical data points (ts, yes_bid, yes_ask, volume)
+        """
+        if refresh:
+            last_ts = self.history_store.last_ts(market_ticker)
+            covered = last_ts is not None and max_ts is not None and max_ts <= last_ts
+            stale = time.monotonic() - self._history_synced.get(market_ticker, float('-inf')) >= HISTORY_SYNC_INTERVAL
+            if not covered and stale:
+                self.sync_market_history(market_ticker)
+
+        return self.history_store.to_points(market_ticker, min_ts, max_ts)
+
+    def sync_market_history(self, market_ticker: str) -> int:
+        """
+        Fetch history points after the last stored one into the local store.
+
+        Args:
+            market_ticker: Market ticker
 
         Returns:
-            List of historical data points
+            Number of new points stored
         """
+        last_ts = self.history_store.last_ts(market_ticker)
+        params = {'limit': 1000}
+        if last_ts is not None:
+            params['min_ts'] = last_ts + 1
+
+        added = 0
         try:
-            params = {}
-            if min_ts:
-                params['min_ts'] = min_ts
-            if max_ts:
-                params['max_ts'] = max_ts
-
-            response = self.session.get(
-                f"{self.BASE_URL}/markets/{market_ticker}/history",
-                params=params,
-                timeout=10
-            )
-            response.raise_for_status()
+            while True:
+                # Pages stored before a failure are kept; the next sync resumes after them
+                data = self._get_history_page(market_ticker, params)
+                points = [self._history_point(point) for point in data.get("history", [])]
+                added += self.history_store.append(market_ticker, points)
+
+                cursor = data.get("cursor")
+                if not cursor:
+                    break
+                params['cursor'] = cursor
 
-            history = response.json().get("history", [])
-            return history
+            self._history_synced[market_ticker] = time.monotonic()
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching market history: {e}")
-            return []
+
+        if added:
+            logger.info(f"Stored {added} new history points for {market_ticker}")
+        return added
+
+    @staticmethod
+    def _history_point(point: Dict) -> Dict:
+        """
+        Normalize an API history point to the store's integer-cent prices.
+
+        Prefers the *_dollars fields the API now returns (as on markets) and
+        falls back to the legacy integer-cent fields.
+        """
+        normalized = {'ts': point.get('ts'), 'volume': point.get('volume') or 0}
+        for field in ('yes_bid', 'yes_ask'):
+            dollars = point.get(f"{field}_dollars")
+            if dollars not in (None, ''):
+                normalized[field] = round(float(dollars) * PRICE_SCALE)
+            else:
+                normalized[field] = point.get(field) or 0
+        return normalized
+
+    @retry_with_backoff(max_retries=3, upstream='kalshi')
+    def _get_history_page(self, market_ticker: str, params: Dict) -> Dict:
+        """Fetch one page of market history, raising so the retry decorator sees failures."""
+        response = self.session.get(
+            f"{self.BASE_URL}/markets/{market_ticker}/history",
+            params=params,
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
 
     def get_markets_by_category(self, categories: List[str]) -> Dict[str, List[Dict]]:
         """
@@ -289,7 +590,6 @@ class KalshiClient:
             try:
                 markets = self.get_markets(limit=50, category=category)
                 results[category] = markets
-                time.sleep(0.5)  # Rate limiting
             except Exception as e:
                 logger.error(f"Error fetching category '{category}': {e}")
                 results[category] = []
@@ -0,0 +1,239 @@
+"""Compact read-only market record for in-memory caches."""
+import sys
+import json
+import struct
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Core fields stored in slots; anything else a venue adds is packed against a shared layout
+FIELDS = ('platform', 'market_id', 'title', 'description', 'category', 'current_probability', 'volume', 'close_time')
+INTERNED_FIELDS = ('platform', 'category')
+INTERN_MAX_LENGTH = 32  # Shorter metadata strings (status, series tickers, slugs) are interned
+
+
+class _Layout(NamedTuple):
+    """Shared description of a record's metadata and extras: keys, how each value is stored, and the packer."""
+    keys: Tuple[str, ...]  # Metadata keys, then extra keys
+    meta_count: int
+    kinds: Tuple[Optional[str], ...]  # None = kept as an object, 'f'/'i' = number, 'sN' = decimal string with N places
+    packer: struct.Struct
+
+
+_layouts: Dict[Tuple, _Layout] = {}
+
+
+def _layout(keys: Tuple[str, ...], meta_count: int, kinds: Tuple[Optional[str], ...]) -> _Layout:
+    """Return one shared layout per distinct keys and kinds, so records don't each carry them."""
+    layout = _layouts.get((keys, meta_count, kinds))
+    if layout is None:
+        packed = sum(kind is not None for kind in kinds)
+        layout = _layouts[(keys, meta_count, kinds)] = _Layout(
+            tuple(sys.intern(k) for k in keys), meta_count, kinds, struct.Struct(f'<{packed}d')
+        )
+    return layout
+
+
+def _numeric_kind(value) -> Optional[str]:
+    """How a value can be packed as a double and rebuilt exactly, or None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, float):
+        return 'f'
+    if isinstance(value, int):
+        return 'i' if abs(value) < 2 ** 53 else None
+    if isinstance(value, str) and '.' in value:
+        # Decimal strings such as Kalshi's '0.4100' price fields
+        places = len(value) - value.index('.') - 1
+        try:
+            return f's{places}' if f"{float(value):.{places}f}" == value else None
+        except ValueError:
+            return None
+    return None
+
+
+def _share(value, market_id):
+    """Reuse one string object for repeated or common values (a ticker equal to market_id, a status)."""
+    if not isinstance(value, str):
+        return value
+    if value == market_id:
+        return market_id
+    return sys.intern(value) if len(value) <= INTERN_MAX_LENGTH else value
+
+
+def _pack(metadata: Dict, extras: Dict, market_id) -> Tuple[_Layout, bytes, tuple]:
+    """Split metadata and extras into a shared layout, their numbers packed as doubles and their other values."""
+    values = list(metadata.values()) + list(extras.values())
+    kinds = tuple(_numeric_kind(v) for v in values)
+    layout = _layout(tuple(metadata) + tuple(extras), len(metadata), kinds)
+    numbers = [float(v) for v, kind in zip(values, kinds) if kind is not None]
+    others = tuple(_share(v, market_id) for v, kind in zip(values, kinds) if kind is None)
+    return layout, layout.packer.pack(*numbers), others
+
+
+def _unpack(layout: _Layout, packed: bytes, others: tuple, start: int = 0, stop: Optional[int] = None) -> Dict:
+    """Rebuild the keys start:stop of a layout from _pack's output."""
+    numbers = iter(layout.packer.unpack(packed))
+    objects = iter(others)
+    result = {}
+    for i, (key, kind) in enumerate(zip(layout.keys, layout.kinds)):
+        if stop is not None and i >= stop:
+            break
+        if kind is None:
+            value = next(objects)
+        elif kind == 'f':
+            value = next(numbers)
+        elif kind == 'i':
+            value = int(next(numbers))
+        else:
+            value = f"{next(numbers):.{kind[1:]}f}"
+        if i >= start:
+            result[key] = value
+    return result
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class MarketRecord(Mapping):
+    """
+    Slotted replacement for a normalized market dict.
+
+    Behaves as a read-only mapping (``record['title']``, ``record.get(...)``,
+    ``dict(record)``), so existing dict-based code keeps working, but costs a
+    fraction of the memory: no per-record hash tables, interned platform and
+    category strings, and metadata/extras stored against a shared layout of
+    interned keys, with their numeric values (bids, asks, liquidity, open
+    interest, including decimal strings) packed into one bytes object instead
+    of separate float and str objects. The JSON-ready dict is only built when
+    a response needs it.
+    """
+
+    __slots__ = FIELDS + ('_layout', '_packed', '_values')
+
+    def __init__(self, market: Dict):
+        """
+        Build a record from a normalized market dictionary.
+
+        Args:
+            market: Market dictionary from KalshiClient or PolymarketClient
+        """
+        for field in FIELDS:
+            value = market.get(field)
+            if field in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            object.__setattr__(self, field, value)
+
+        layout, packed, others = _pack(
+            market.get('metadata') or {},
+            {k: v for k, v in market.items() if k not in FIELDS and k != 'metadata'},
+            self.market_id
+        )
+        object.__setattr__(self, '_layout', layout)
+        object.__setattr__(self, '_packed', packed)
+        object.__setattr__(self, '_values', others)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MarketRecord is read-only; build a new record instead")
+
+    @property
+    def metadata(self) -> Dict:
+        """Venue metadata as a fresh dict."""
+        return _unpack(self._layout, self._packed, self._values, stop=self._layout.meta_count)
+
+    def _extras(self) -> Dict:
+        return _unpack(self._layout, self._packed, self._values, start=self._layout.meta_count)
+
+    @property
+    def _extra_keys(self) -> Tuple[str, ...]:
+        return self._layout.keys[self._layout.meta_count:]
+
+    def __getitem__(self, key: str):
+        if key in FIELDS:
+            return getattr(self, key)
+        if key == 'metadata':
+            return self.metadata
+        if key not in self._extra_keys:
+            raise KeyError(key)
+        return self._extras()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        yield from self._extra_keys
+        yield 'metadata'
+
+    def __len__(self) -> int:
+        return len(FIELDS) + len(self._extra_keys) + 1
+
+    def __repr__(self) -> str:
+        return f"MarketRecord({self.platform}:{self.market_id})"
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the normalized market shape (for API responses)."""
+        market = {field: getattr(self, field) for field in FIELDS}
+        market.update(self._extras())
+        market['metadata'] = self.metadata
+        return market
+
+    def to_json(self) -> str:
+        """Serialize straight to JSON."""
+        return json.dumps(self.to_dict(), default=_json_default)
+
+
+def to_records(markets: List[Dict]) -> List[MarketRecord]:
+    """Convert normalized market dicts (or records) into records."""
+    return [m if isinstance(m, MarketRecord) else MarketRecord(m) for m in markets]
+
+
+def records_to_json(records: List[Mapping]) -> str:
+    """Serialize a list of records as one JSON array without an intermediate list of dicts."""
+    return '[' + ','.join(
+        r.to_json() if isinstance(r, MarketRecord) else json.dumps(r, default=_json_default)
+        for r in records
+    ) + ']'
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import tracemalloc
+
+    sample = {
+        'platform': 'kalshi',
+        'market_id': 'KXFED-25MAR-T4.25',
+        'title': 'Fed funds rate above 4.25%?',
+        'description': 'After the March meeting',
+        'category': 'finance',
+        'current_probability': 0.42,
+        'volume': 125000.0,
+        'end_date': '2025-03-19T18:00:00Z',
+        'end_date_formatted': 'Mar 19, 2025',
+        'status': 'active',
+        'close_time': datetime(2025, 3, 19, 18),
+        'metadata': {
+            'ticker': 'KXFED-25MAR-T4.25', 'series_ticker': 'KXFED', 'slug': 'kxfed',
+            'open_interest': 5000, 'yes_bid_dollars': '0.4100', 'yes_ask_dollars': '0.4300',
+            'no_bid_dollars': '0.5700', 'no_ask_dollars': '0.5900', 'liquidity_dollars': '2500.00'
+        }
+    }
+
+    # Decode each market separately so strings and numbers are not shared, as with a real response
+    payload = json.dumps(dict(sample, close_time=None))
+
+    tracemalloc.start()
+    dicts = [json.loads(payload) for _ in range(1000)]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    del dicts
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    records = [MarketRecord(json.loads(payload)) for _ in range(1000)]
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"1000 dicts: {dict_bytes / 1000:.0f} B/market, 1000 records: {record_bytes / 1000:.0f} B/market")
+    assert records[0].to_dict() == json.loads(payload)
+    print(records[0]['title'], records[0].get('status'), records[0]['metadata']['ticker'])
+    print(records_to_json(records[:1])[:120])
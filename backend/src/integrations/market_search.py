@@ -0,0 +1,243 @@
+"""In-process inverted index for full-text search over cached markets."""
+import re
+import bisect
+import math
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = frozenset({'a', 'an', 'and', 'are', 'be', 'by', 'for', 'in', 'is', 'of', 'on', 'or', 'the', 'to', 'will'})
+
+# Field -> ranking weight; fields are indexed at separate position offsets so phrases never span them
+FIELD_WEIGHTS = {'title': 3.0, 'category': 2.0, 'description': 1.0}
+FIELD_GAP = 10000
+MAX_PREFIX_EXPANSIONS = 50
+
+
+def tokenize(text: str, offset: int = 0) -> List[Tuple[str, int]]:
+    """
+    Split text into lowercase terms with positions.
+
+    Stopwords are dropped but still advance the position, so phrase
+    queries keep their spacing.
+
+    Args:
+        text: Text to tokenize
+        offset: Position of the first token
+
+    Returns:
+        List of (term, position)
+    """
+    return [
+        (term, offset + i)
+        for i, term in enumerate(TOKEN_PATTERN.findall((text or '').lower()))
+        if term not in STOPWORDS
+    ]
+
+
+def _parse_query(query: str) -> Tuple[List[List[Tuple[str, int]]], List[str], List[str]]:
+    """Split a query into phrases ("..."), prefix terms (term*) and plain terms."""
+    phrases = [tokenize(p) for p in re.findall(r'"([^"]+)"', query)]
+    remainder = re.sub(r'"[^"]*"', ' ', query)
+
+    prefixes = [t.rstrip('*') for t in re.findall(r"([a-z0-9]+)\*", remainder.lower())]
+    remainder = re.sub(r"[A-Za-z0-9]+\*", ' ', remainder)
+
+    terms = [term for term, _ in tokenize(remainder)]
+    return [p for p in phrases if p], prefixes, terms
+
+
+class MarketSearchIndex:
+    """Positional inverted index over market titles, descriptions and categories."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[str, Dict[Tuple[str, str], List[int]]] = defaultdict(dict)
+        self._vocabulary: List[str] = []  # Sorted, for prefix lookups
+        self._doc_terms: Dict[Tuple[str, str], List[str]] = {}
+        self._markets: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    @staticmethod
+    def _key(market: Dict) -> Tuple[str, str]:
+        return (market.get('platform', ''), str(market.get('market_id')))
+
+    def _remove_locked(self, key: Tuple[str, str]):
+        for term in self._doc_terms.pop(key, ()):
+            docs = self._postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(key, None)
+            if not docs:
+                del self._postings[term]
+                position = bisect.bisect_left(self._vocabulary, term)
+                if position < len(self._vocabulary) and self._vocabulary[position] == term:
+                    self._vocabulary.pop(position)
+        self._markets.pop(key, None)
+
+    def upsert(self, market: Dict):
+        """
+        Index a market, replacing any previous version.
+
+        Args:
+            market: Normalized market dictionary
+        """
+        key = self._key(market)
+        positions: Dict[str, List[int]] = defaultdict(list)
+        for i, field in enumerate(FIELD_WEIGHTS):
+            for term, position in tokenize(market.get(field, ''), offset=i * FIELD_GAP):
+                positions[term].append(position)
+
+        with self._lock:
+            self._remove_locked(key)
+            for term, term_positions in positions.items():
+                if term not in self._postings:
+                    bisect.insort(self._vocabulary, term)
+                self._postings[term][key] = term_positions
+            self._doc_terms[key] = list(positions)
+            self._markets[key] = market
+
+    def upsert_many(self, markets: Iterable[Dict]):
+        """Index several markets."""
+        for market in markets:
+            self.upsert(market)
+
+    def remove(self, market: Dict):
+        """Drop a market from the index."""
+        with self._lock:
+            self._remove_locked(self._key(market))
+
+    def apply_changes(self, changes: Dict):
+        """
+        Apply a MarketSync change set.
+
+        Args:
+            changes: Dict with 'inserted', 'updated' and 'removed' market lists
+        """
+        self.upsert_many(changes['inserted'] + changes['updated'])
+        for market in changes['removed']:
+            self.remove(market)
+
+    def clear(self):
+        """Drop every market."""
+        with self._lock:
+            self._postings.clear()
+            self._vocabulary.clear()
+            self._doc_terms.clear()
+            self._markets.clear()
+
+    def _term_scores(self, term: str) -> Dict[Tuple[str, str], float]:
+        """tf-idf contribution of one term per document, with field weights."""
+        docs = self._postings.get(term)
+        if not docs:
+            return {}
+
+        idf = math.log(1 + len(self._markets) / len(docs))
+        weights = list(FIELD_WEIGHTS.values())
+        return {
+            key: idf * sum(weights[min(p // FIELD_GAP, len(weights) - 1)] for p in positions)
+            for key, positions in docs.items()
+        }
+
+    def _prefix_scores(self, prefix: str) -> Dict[Tuple[str, str], float]:
+        """Best score over vocabulary terms starting with the prefix."""
+        scores: Dict[Tuple[str, str], float] = {}
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            for key, score in self._term_scores(term).items():
+                scores[key] = max(scores.get(key, 0.0), score)
+        return scores
+
+    def _phrase_scores(self, phrase: List[Tuple[str, int]]) -> Dict[Tuple[str, str], float]:
+        """Score documents containing every term of the phrase at the right spacing."""
+        first_term, first_position = phrase[0]
+        candidates = set(self._postings.get(first_term, {}))
+        for term, _ in phrase[1:]:
+            candidates &= set(self._postings.get(term, {}))
+
+        scores = {}
+        for key in candidates:
+            starts = {p - first_position for p in self._postings[first_term][key]}
+            for term, position in phrase[1:]:
+                starts &= {p - position for p in self._postings[term][key]}
+                if not starts:
+                    break
+            if starts:
+                scores[key] = 2.0 * sum(self._term_scores(term).get(key, 0.0) for term, _ in phrase)
+        return scores
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        platform: Optional[str] = None,
+        require_all: bool = True
+    ) -> List[Dict]:
+        """
+        Rank markets for a query.
+
+        Supports plain terms, prefix terms (`elect*`) and quoted phrases.
+
+        Args:
+            query: Search query
+            limit: Maximum results
+            platform: Only return markets from this platform
+            require_all: Every term/phrase must match (False ranks partial matches too)
+
+        Returns:
+            List of {'market', 'score'} dicts, best first
+        """
+        phrases, prefixes, terms = _parse_query(query)
+
+        with self._lock:
+            clauses = (
+                [self._term_scores(t) for t in terms] +
+                [self._prefix_scores(p) for p in prefixes] +
+                [self._phrase_scores(p) for p in phrases]
+            )
+            if not clauses:
+                return []
+
+            if require_all:
+                keys = set(min(clauses, key=len))
+                for clause in clauses:
+                    keys &= clause.keys()
+            else:
+                keys = set().union(*clauses)
+
+            if platform:
+                keys = {k for k in keys if k[0] == platform}
+
+            ranked = sorted(
+                ((sum(c.get(k, 0.0) for c in clauses), k) for k in keys),
+                key=lambda item: (-item[0], item[1])
+            )[:limit]
+
+            return [{'market': self._markets[k], 'score': round(score, 4)} for score, k in ranked]
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    index = MarketSearchIndex()
+    index.upsert_many([
+        {'platform': 'polymarket', 'market_id': '1', 'title': 'Will Bitcoin reach $100k in 2025?',
+         'description': 'Resolves YES if BTC trades above 100,000', 'category': 'cryptocurrency'},
+        {'platform': 'kalshi', 'market_id': 'PRES', 'title': 'Who will win the presidential election?',
+         'description': 'US presidential election 2028', 'category': 'politics'},
+        {'platform': 'kalshi', 'market_id': 'FED', 'title': 'Fed rate cut in March',
+         'description': 'Federal Reserve decision', 'category': 'finance'},
+    ])
+
+    for q in ['bitcoin', 'elect*', '"presidential election"', 'fed*', 'crypto* 2025']:
+        print(q, [(hit['market']['market_id'], hit['score']) for hit in index.search(q)])
@@ -1,47 +1,60 @@
 """Polymarket GraphQL API integration for prediction market data."""
 import os
+import json
+import asyncio
 import requests
-from typing import List, Dict, Optional
-from datetime import datetime
+import httpx
+from typing import AsyncIterator, Iterator, List, Dict, Optional
+from collections import deque
+from datetime import datetime, timezone
 import logging
-from functools import wraps
-import time
 
-logger = logging.getLogger(__name__)
+try:
+    from integrations.http_transport import get_async_client, fetch_in_chunks
+    from integrations.cassette import mount_session
+    from integrations.resilience import retry_with_backoff
+    from integrations.json_stream import JSONItemStream, iter_json_items, aiter_json_items, STREAM_CHUNK_SIZE
+    from integrations.market_search import MarketSearchIndex
+    from integrations.taxonomy import get_taxonomy
+except ImportError:
+    from .http_transport import get_async_client, fetch_in_chunks
+    from .cassette import mount_session
+    from .resilience import retry_with_backoff
+    from .json_stream import JSONItemStream, iter_json_items, aiter_json_items, STREAM_CHUNK_SIZE
+    from .market_search import MarketSearchIndex
+    from .taxonomy import get_taxonomy
 
+logger = logging.getLogger(__name__)
 
-def retry_with_backoff(max_retries=3, backoff_factor=2):
-    """Retry decorator with exponential backoff."""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise
-                    wait_time = backoff_factor ** attempt
-                    logger.warning(f"Retry {attempt+1}/{max_retries} after {wait_time}s: {e}")
-                    time.sleep(wait_time)
-        return wrapper
-    return decorator
+# Gamma event fields read during normalization; everything else is skipped while decoding
+EVENT_FIELDS = (
+    'id', 'title', 'description', 'volume', 'liquidity', 'endDate', 'slug',
+    'markets.item.outcomePrices', 'markets.item.outcomes', 'markets.item.bestBid', 'markets.item.bestAsk'
+)
 
 
 class PolymarketClient:
     """Client for fetching data from Polymarket GraphQL API."""
 
-    def __init__(self):
-        """Initialize Polymarket client."""
+    def __init__(self, search_index: Optional[MarketSearchIndex] = None):
+        """
+        Initialize Polymarket client.
+
+        Args:
+            search_index: Index of the cached catalog, kept current by the owner
+                (e.g. subscribed to MarketSync); search_markets only reads it
+        """
         # Use public Gamma API (no auth required)
         self.gamma_url = "https://gamma-api.polymarket.com"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             "Content-Type": "application/json"
-        })
+        }
+        self.session = mount_session(requests.Session())
+        self.session.headers.update(self.headers)
+        self.search_index = search_index if search_index is not None else MarketSearchIndex()
+        self.taxonomy = get_taxonomy()
         logger.info("Polymarket client initialized successfully (using Gamma API)")
 
-    @retry_with_backoff(max_retries=3)
     def get_markets(
         self,
         limit: int = 100,
@@ -57,200 +70,407 @@ class PolymarketClient:
             offset: Pagination offset
 
         Returns:
-            List of market dictionaries
+            List of market dictionaries (empty if the request failed after retries)
         """
         try:
-            # Use Gamma API events endpoint
-            url = f"{self.gamma_url}/events"
-            params = {'limit': limit}
-            if active:
-                params['closed'] = 'false'  # Get only open markets
+            processed_markets = self._get_markets(limit, active, offset)
+
+            logger.info(f"Fetched {len(processed_markets)} events from Polymarket Gamma API")
+            return processed_markets
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error fetching Polymarket events: {e}")
+            return []  # Return empty list instead of raising
+
+    @retry_with_backoff(max_retries=3, upstream='polymarket')
+    def _get_markets(self, limit: int, active: bool, offset: int) -> List[Dict]:
+        """Collect stream_markets, raising so the retry decorator sees failures."""
+        return list(self.stream_markets(limit, active, offset))
+
+    def stream_markets(
+        self,
+        limit: int = 100,
+        active: bool = True,
+        offset: int = 0
+    ) -> Iterator[Dict]:
+        """
+        Yield normalized markets while the events response is still downloading.
+
+        The body is decoded incrementally, keeping only EVENT_FIELDS of one
+        event at a time instead of the whole payload.
+
+        Args:
+            limit: Maximum number of events
+            active: Only active markets
+            offset: Pagination offset
 
-            response = self.session.get(url, params=params, timeout=15)
+        Yields:
+            Market dictionaries
+        """
+        now = datetime.now(timezone.utc)
+        seen = 0
+
+        with self.session.get(
+            f"{self.gamma_url}/events",
+            params=self._events_params(limit, active, offset),
+            timeout=15,
+            stream=True
+        ) as response:
             response.raise_for_status()
 
-            events_data = response.json()
-
-            # Events data is a list
-            if not isinstance(events_data, list):
-                logger.warning(f"Unexpected response format: {type(events_data)}")
-                return []
-
-            # Filter for truly active markets (end date in future)
-            from datetime import datetime, timezone
-            now = datetime.now(timezone.utc)
-
-            active_events = []
-            for event in events_data:
-                end_date_str = event.get('endDate')
-                if end_date_str:
-                    try:
-                        end_date = self._parse_datetime(end_date_str)
-                        if end_date and end_date > now:
-                            active_events.append(event)
-                    except Exception:
-                        continue
-
-            logger.info(f"Filtered to {len(active_events)} active events (from {len(events_data)} total)")
-
-            # Process events
-            processed_markets = []
-            for event in active_events[:limit]:
-                # Get the first market in the event
-                markets = event.get('markets', [])
-                if not markets:
+            stream = JSONItemStream('item', EVENT_FIELDS)
+            for event in iter_json_items(response.iter_content(STREAM_CHUNK_SIZE), stream):
+                if not self._is_active(event, now):
                     continue
+                seen += 1
+                market = self._normalize_event(event)
+                if market:
+                    yield market
+                if seen >= limit:
+                    break
+
+    async def stream_markets_async(
+        self,
+        limit: int = 100,
+        active: bool = True,
+        offset: int = 0
+    ) -> AsyncIterator[Dict]:
+        """
+        Async variant of stream_markets using the shared pooled HTTP client.
 
-                # Use first market for probability
-                first_market = markets[0]
+        Args:
+            limit: Maximum number of events
+            active: Only active markets
+            offset: Pagination offset
 
-                # Parse outcome prices
-                try:
-                    outcome_prices_str = first_market.get('outcomePrices', '[]')
-                    if isinstance(outcome_prices_str, str):
-                        import json
-                        outcome_prices = json.loads(outcome_prices_str)
-                    else:
-                        outcome_prices = outcome_prices_str
-
-                    probability = float(outcome_prices[0]) if outcome_prices else 0.5
-                except (ValueError, IndexError, TypeError):
-                    probability = 0.5
-
-                # Categorize based on description
-                title = event.get('title', '')
-                description = event.get('description', '')
-                category = self._categorize_market(title, description)
-
-                # Filter: Only include markets with volume >= $1,000
-                volume = float(event.get('volume', 0))
-                if volume < 1000:
+        Yields:
+            Market dictionaries
+        """
+        now = datetime.now(timezone.utc)
+        seen = 0
+
+        async with get_async_client().stream(
+            "GET",
+            f"{self.gamma_url}/events",
+            params=self._events_params(limit, active, offset),
+            headers=self.headers,
+            timeout=15
+        ) as response:
+            response.raise_for_status()
+
+            stream = JSONItemStream('item', EVENT_FIELDS)
+            async for event in aiter_json_items(response.aiter_bytes(), stream):
+                if not self._is_active(event, now):
                     continue
+                seen += 1
+                market = self._normalize_event(event)
+                if market:
+                    yield market
+                if seen >= limit:
+                    break
+
+    async def get_markets_async(
+        self,
+        limit: int = 100,
+        active: bool = True,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Async variant of get_markets using the shared pooled HTTP client.
 
-                processed_markets.append({
-                    'platform': 'polymarket',
-                    'market_id': str(event.get('id', '')),
-                    'title': title,
-                    'description': description,
-                    'category': category,
-                    'current_probability': probability,
-                    'volume': volume,
-                    'close_time': self._parse_datetime(event.get('endDate')),
-                    'metadata': {
-                        'outcomes': json.loads(first_market.get('outcomes', '[]')) if isinstance(first_market.get('outcomes'), str) else first_market.get('outcomes', []),
-                        'outcome_prices': outcome_prices,
-                        'liquidity': float(event.get('liquidity', 0)),
-                        'slug': event.get('slug', ''),  # Event slug for URL
-                        'resolved_at': None
-                    }
-                })
+        Args:
+            limit: Maximum number of markets
+            active: Only active markets
+            offset: Pagination offset
+
+        Returns:
+            List of market dictionaries
+        """
+        try:
+            events = await self._get_events_async(self._events_params(limit, active, offset))
+            processed_markets = self._normalize_events(events, limit)
 
             logger.info(f"Fetched {len(processed_markets)} events from Polymarket Gamma API")
             return processed_markets
 
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Error fetching Polymarket events: {e}")
-            return []  # Return empty list instead of raising
+            return []
 
-    @retry_with_backoff(max_retries=3)
-    def get_market_details(self, market_id: str) -> Optional[Dict]:
+    async def iter_markets_async(
+        self,
+        active: bool = True,
+        page_size: int = 100,
+        concurrency: int = 4,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
         """
-        Get detailed information for a specific market.
+        Stream normalized markets across every offset page of the events endpoint.
+
+        Up to `concurrency` pages are requested ahead; markets are yielded in
+        offset order and each raw page is released once it has been normalized.
 
         Args:
-            market_id: Market ID
+            active: Only active markets
+            page_size: Events per page
+            concurrency: Pages in flight at once
+            max_pages: Stop after this many pages (None = whole catalog)
 
-        Returns:
-            Market details dictionary
-        """
-        query = """
-        query Market($id: ID!) {
-            market(id: $id) {
-                id
-                question
-                description
-                outcomes
-                outcomePrices
-                volume
-                liquidity
-                endDate
-                resolvedAt
-                category
-                slug
-                tags
-                image
-            }
-        }
+        Yields:
+            Market dictionaries
         """
+        async def fetch_page(page: int) -> List[Dict]:
+            return await self._get_events_async(self._events_params(page_size, active, page * page_size))
 
-        variables = {"id": market_id}
+        in_flight = deque()
+        next_page = 0
+        exhausted = False
+        total = 0
 
         try:
-            response = self.session.post(
-                self.api_url,
-                json={"query": query, "variables": variables},
-                timeout=10
-            )
+            while True:
+                while not exhausted and len(in_flight) < concurrency and (max_pages is None or next_page < max_pages):
+                    in_flight.append(asyncio.create_task(fetch_page(next_page)))
+                    next_page += 1
+
+                if not in_flight:
+                    break
+
+                try:
+                    events = await in_flight.popleft()
+                except httpx.HTTPError as e:
+                    logger.error(f"Error paginating Polymarket events after {total} markets: {e}")
+                    raise
+
+                # A short page is the last one; anything requested beyond it is empty
+                if len(events) < page_size:
+                    exhausted = True
+                    while in_flight:
+                        in_flight.pop().cancel()
+
+                for market in self._normalize_events(events, len(events)):
+                    total += 1
+                    yield market
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+        logger.info(f"Streamed {total} markets from Polymarket Gamma API")
+
+    @retry_with_backoff(max_retries=3, upstream='polymarket')
+    async def _get_events_async(self, params: Dict) -> List[Dict]:
+        """Fetch the Gamma events endpoint on the shared async client, decoding only EVENT_FIELDS."""
+        async with get_async_client().stream(
+            "GET",
+            f"{self.gamma_url}/events",
+            params=params,
+            headers=self.headers,
+            timeout=15
+        ) as response:
             response.raise_for_status()
 
-            data = response.json()
-            market = data.get("data", {}).get("market", {})
+            stream = JSONItemStream('item', EVENT_FIELDS)
+            return [event async for event in aiter_json_items(response.aiter_bytes(), stream)]
 
-            if not market:
-                return None
+    @staticmethod
+    def _events_params(limit: int, active: bool, offset: int = 0) -> Dict:
+        """Build query parameters for the Gamma events endpoint."""
+        params = {'limit': limit}
+        if offset:
+            params['offset'] = offset
+        if active:
+            params['closed'] = 'false'  # Get only open markets
+        return params
+
+    def _normalize_events(self, events_data, limit: int) -> List[Dict]:
+        """
+        Convert Gamma events into normalized market dictionaries.
 
-            outcome_prices = market.get('outcomePrices', [])
-            probability = float(outcome_prices[0]) if outcome_prices else 0.5
+        Args:
+            events_data: Decoded events response
+            limit: Maximum number of events to process
 
-            return {
-                'platform': 'polymarket',
-                'market_id': market.get('id'),
-                'title': market.get('question'),
-                'description': market.get('description', ''),
-                'category': market.get('category', ''),
-                'current_probability': probability,
-                'volume': float(market.get('volume', 0)),
-                'close_time': self._parse_datetime(market.get('endDate')),
-                'metadata': {
-                    'outcomes': market.get('outcomes', []),
-                    'outcome_prices': outcome_prices,
-                    'liquidity': market.get('liquidity', 0),
-                    'slug': market.get('slug', ''),
-                    'resolved_at': market.get('resolvedAt'),
-                    'tags': market.get('tags', []),
-                    'image': market.get('image', '')
-                }
-            }
+        Returns:
+            List of market dictionaries
+        """
+        # Events data is a list
+        if not isinstance(events_data, list):
+            logger.warning(f"Unexpected response format: {type(events_data)}")
+            return []
+
+        # Filter for truly active markets (end date in future)
+        now = datetime.now(timezone.utc)
+        active_events = [event for event in events_data if self._is_active(event, now)]
+
+        logger.info(f"Filtered to {len(active_events)} active events (from {len(events_data)} total)")
+
+        # Process events
+        processed_markets = []
+        for event in active_events[:limit]:
+            market = self._normalize_event(event)
+            if market:
+                processed_markets.append(market)
+
+        return processed_markets
+
+    def _is_active(self, event: Dict, now: datetime) -> bool:
+        """Whether an event's end date is still in the future."""
+        end_date_str = event.get('endDate')
+        if not end_date_str:
+            return False
+        try:
+            end_date = self._parse_datetime(end_date_str)
+            return bool(end_date and end_date > now)
+        except Exception:
+            return False
+
+    def _normalize_event(self, event: Dict, min_volume: float = 1000) -> Optional[Dict]:
+        """
+        Convert one Gamma event into a normalized market dictionary.
+
+        Args:
+            event: Event with at least EVENT_FIELDS
+            min_volume: Volume floor in dollars
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching Polymarket market {market_id}: {e}")
+        Returns:
+            Market dictionary, or None for events without markets or below the volume floor
+        """
+        # Get the first market in the event
+        markets = event.get('markets', [])
+        if not markets:
+            return None
+
+        # Filter: Only include markets with volume >= $1,000 (before decoding outcome strings)
+        volume = float(event.get('volume', 0) or 0)
+        if volume < min_volume:
             return None
 
-    @retry_with_backoff(max_retries=3)
+        # Use first market for probability
+        first_market = markets[0]
+
+        # Parse outcome prices
+        outcome_prices = []
+        try:
+            outcome_prices_str = first_market.get('outcomePrices', '[]')
+            if isinstance(outcome_prices_str, str):
+                outcome_prices = json.loads(outcome_prices_str)
+            else:
+                outcome_prices = outcome_prices_str
+
+            probability = float(outcome_prices[0]) if outcome_prices else 0.5
+        except (ValueError, IndexError, TypeError):
+            probability = 0.5
+
+        # Categorize based on description
+        title = event.get('title', '')
+        description = event.get('description', '')
+        category = self.taxonomy.classify(str(event.get('id', '')), title, description)
+
+        outcomes = first_market.get('outcomes', [])
+        if isinstance(outcomes, str):
+            try:
+                outcomes = json.loads(outcomes)
+            except ValueError:
+                outcomes = []
+
+        return {
+            'platform': 'polymarket',
+            'market_id': str(event.get('id', '')),
+            'title': title,
+            'description': description,
+            'category': category,
+            'current_probability': probability,
+            'volume': volume,
+            'close_time': self._parse_datetime(event.get('endDate')),
+            'metadata': {
+                'outcomes': outcomes,
+                'outcome_prices': outcome_prices,
+                'liquidity': float(event.get('liquidity', 0) or 0),
+                'best_bid': first_market.get('bestBid'),
+                'best_ask': first_market.get('bestAsk'),
+                'slug': event.get('slug', ''),  # Event slug for URL
+                'resolved_at': None
+            }
+        }
+
+    async def get_market_details_bulk(
+        self,
+        market_ids: List[str],
+        chunk_size: int = 50,
+        concurrency: int = 4
+    ) -> Dict[str, Dict]:
+        """
+        Get details for many markets with multi-id Gamma queries.
+
+        Args:
+            market_ids: Market IDs (Gamma event ids)
+            chunk_size: Ids per request
+            concurrency: Requests in flight at once
+
+        Returns:
+            Dict with 'results' ({market_id: details}) and 'errors' ({market_id: message})
+        """
+        details = await fetch_in_chunks(market_ids, self._get_event_details_async, chunk_size, concurrency)
+        logger.info(
+            f"Fetched details for {len(details['results'])} Polymarket markets "
+            f"({len(details['errors'])} errors)"
+        )
+        return details
+
+    @retry_with_backoff(max_retries=3, upstream='polymarket')
+    async def _get_event_details_async(self, market_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch one chunk of events by id (?id=a&id=b...) on the shared async client."""
+        response = await get_async_client().get(
+            f"{self.gamma_url}/events",
+            params=[('id', market_id) for market_id in market_ids] + [('limit', len(market_ids))],
+            headers=self.headers,
+            timeout=15
+        )
+        response.raise_for_status()
+
+        events = response.json()
+        if not isinstance(events, list):
+            return {}
+        return {str(event.get('id')): self._normalize_detail(event) for event in events}
+
+    def _normalize_detail(self, event: Dict) -> Dict:
+        """Normalize a full Gamma event, without the listing volume floor."""
+        market = self._normalize_event(event, min_volume=0) or {
+            'platform': 'polymarket',
+            'market_id': str(event.get('id', '')),
+            'title': event.get('title', ''),
+            'description': event.get('description', ''),
+            'category': self.taxonomy.classify(str(event.get('id', '')), event.get('title', ''), event.get('description', '')),
+            'current_probability': 0.5,
+            'volume': float(event.get('volume', 0) or 0),
+            'close_time': self._parse_datetime(event.get('endDate')),
+            'metadata': {'outcomes': [], 'outcome_prices': [], 'liquidity': float(event.get('liquidity', 0) or 0),
+                         'slug': event.get('slug', '')}
+        }
+
+        market['metadata'].update({
+            'resolved_at': event.get('closedTime') if event.get('closed') else None,
+            'tags': [tag.get('label', '') for tag in event.get('tags') or [] if isinstance(tag, dict)],
+            'image': event.get('image', '')
+        })
+        return market
+
     def search_markets(self, search_term: str, limit: int = 50) -> List[Dict]:
         """
-        Search markets by keyword.
+        Search active markets by keyword in the cached catalog's index.
+
+        Never calls upstream; markets reach the index through whatever keeps
+        it current (see __init__).
 
         Args:
-            search_term: Search query
+            search_term: Search query (terms, `prefix*` or "quoted phrase")
             limit: Maximum results
 
         Returns:
             List of matching markets
         """
-        # Note: Actual GraphQL schema may vary - this is a simplified implementation
-        # You may need to fetch all markets and filter locally
-        all_markets = self.get_markets(limit=limit * 2)
-
-        # Filter by search term in title or description
-        search_lower = search_term.lower()
-        matching_markets = [
-            m for m in all_markets
-            if search_lower in m['title'].lower() or
-               search_lower in m.get('description', '').lower()
-        ]
-
-        return matching_markets[:limit]
+        hits = self.search_index.search(search_term, limit=limit, platform='polymarket')
+        return [hit['market'] for hit in hits]
 
     def get_markets_by_category(self, categories: List[str]) -> Dict[str, List[Dict]]:
         """
@@ -290,22 +510,6 @@ class PolymarketClient:
             return f"https://polymarket.com/event/{market_slug}"
         return "https://polymarket.com/"
 
-    @staticmethod
-    def _categorize_market(question: str, description: str) -> str:
-        """Categorize market based on keywords in question/description."""
-        text = f"{question} {description}".lower()
-
-        if any(word in text for word in ['election', 'president', 'vote', 'senate', 'congress', 'political']):
-            return 'politics'
-        elif any(word in text for word in ['bitcoin', 'crypto', 'ethereum', 'btc', 'eth', 'blockchain']):
-            return 'cryptocurrency'
-        elif any(word in text for word in ['nba', 'nfl', 'soccer', 'football', 'baseball', 'sports', 'championship']):
-            return 'sports'
-        elif any(word in text for word in ['tech', 'ai', 'technology', 'software', 'apple', 'google', 'microsoft']):
-            return 'technology'
-        else:
-            return 'other'
-
     @staticmethod
     def _parse_datetime(dt_string: Optional[str]) -> Optional[datetime]:
         """Parse datetime string to datetime object."""
@@ -340,5 +544,6 @@ if __name__ == "__main__":
         print(f"URL: {client.get_market_url(slug)}")
 
     # Search markets
+    client.search_index.upsert_many(markets)
     search_results = client.search_markets("election", limit=5)
     print(f"\nFound {len(search_results)} markets matching 'election'")
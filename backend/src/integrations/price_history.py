@@ -0,0 +1,274 @@
+"""Local columnar store for market price history."""
+import os
+import bisect
+import logging
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('ts', 'yes_bid', 'yes_ask', 'volume')
+PRICE_SCALE = 100  # yes_bid/yes_ask are stored as integer cents; divide by this for a 0-1 probability
+BLOCK_SIZE = 4096  # Points per sealed, delta-encoded block
+
+
+def _narrow(deltas: np.ndarray) -> np.ndarray:
+    """Store deltas as int32 unless a jump does not fit."""
+    if len(deltas) and (deltas.min() < np.iinfo(np.int32).min or deltas.max() > np.iinfo(np.int32).max):
+        return deltas
+    return deltas.astype(np.int32)
+
+
+class _Block:
+    """Sealed run of points: first row kept absolute, the rest as deltas."""
+
+    __slots__ = ('base', 'deltas', 'start_ts', 'end_ts', 'size')
+
+    def __init__(self, rows: Dict[str, np.ndarray]):
+        self.base = {c: int(rows[c][0]) for c in COLUMNS}
+        self.deltas = {c: _narrow(np.diff(rows[c])) for c in COLUMNS}
+        self.start_ts = int(rows['ts'][0])
+        self.end_ts = int(rows['ts'][-1])
+        self.size = len(rows['ts'])
+
+    def decode(self) -> Dict[str, np.ndarray]:
+        """Rebuild absolute columns with a cumulative sum."""
+        decoded = {}
+        for c in COLUMNS:
+            column = np.empty(self.size, dtype=np.int64)
+            column[0] = self.base[c]
+            np.cumsum(self.deltas[c], dtype=np.int64, out=column[1:])
+            column[1:] += self.base[c]
+            decoded[c] = column
+        return decoded
+
+
+class _Series:
+    """Delta-encoded blocks plus an uncompressed tail that new points append to."""
+
+    def __init__(self):
+        self.blocks: List[_Block] = []
+        self.block_starts: List[int] = []
+        self.tail: Dict[str, List[int]] = {c: [] for c in COLUMNS}
+        self.dirty = False
+
+    @property
+    def last_ts(self) -> Optional[int]:
+        if self.tail['ts']:
+            return self.tail['ts'][-1]
+        return self.blocks[-1].end_ts if self.blocks else None
+
+    def __len__(self) -> int:
+        return sum(b.size for b in self.blocks) + len(self.tail['ts'])
+
+    def append(self, rows: Dict[str, List[int]]):
+        for c in COLUMNS:
+            self.tail[c].extend(rows[c])
+        self.dirty = True
+
+        while len(self.tail['ts']) >= BLOCK_SIZE:
+            sealed = {c: np.asarray(self.tail[c][:BLOCK_SIZE], dtype=np.int64) for c in COLUMNS}
+            self.blocks.append(_Block(sealed))
+            self.block_starts.append(self.blocks[-1].start_ts)
+            for c in COLUMNS:
+                del self.tail[c][:BLOCK_SIZE]
+
+    def slice(self, start: Optional[int], end: Optional[int]) -> Dict[str, np.ndarray]:
+        """Decode only the blocks overlapping [start, end]."""
+        lo = 0 if start is None else max(bisect.bisect_right(self.block_starts, start) - 1, 0)
+        hi = len(self.blocks) if end is None else bisect.bisect_right(self.block_starts, end)
+
+        parts = [b.decode() for b in self.blocks[lo:hi]]
+        if self.tail['ts'] and (end is None or self.tail['ts'][0] <= end):
+            parts.append({c: np.asarray(self.tail[c], dtype=np.int64) for c in COLUMNS})
+
+        if not parts:
+            return {c: np.zeros(0, dtype=np.int64) for c in COLUMNS}
+
+        columns = {c: np.concatenate([p[c] for p in parts]) for c in COLUMNS}
+        ts = columns['ts']
+        i = 0 if start is None else np.searchsorted(ts, start, side='left')
+        j = len(ts) if end is None else np.searchsorted(ts, end, side='right')
+        return {c: columns[c][i:j] for c in COLUMNS}
+
+
+class PriceHistoryStore:
+    """Per-ticker price history (ts, yes bid/ask, volume) with optional on-disk persistence."""
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Initialize price history store.
+
+        Args:
+            directory: Where series are persisted as .npz files (None = memory only)
+        """
+        self.directory = directory
+        self._series: Dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, ticker: str) -> str:
+        return os.path.join(self.directory, f"{ticker.replace('/', '_')}.npz")
+
+    def _get(self, ticker: str) -> _Series:
+        """Get a series, loading it from disk on first access."""
+        series = self._series.get(ticker)
+        if series is None:
+            series = _Series()
+            if self.directory and os.path.exists(self._path(ticker)):
+                with np.load(self._path(ticker)) as data:
+                    series.append({c: data[c].tolist() for c in COLUMNS})
+                series.dirty = False
+            self._series[ticker] = series
+        return series
+
+    def last_ts(self, ticker: str) -> Optional[int]:
+        """Timestamp of the newest stored point, or None if nothing is stored."""
+        with self._lock:
+            return self._get(ticker).last_ts
+
+    def count(self, ticker: str) -> int:
+        """Number of stored points for a ticker."""
+        with self._lock:
+            return len(self._get(ticker))
+
+    def append(self, ticker: str, points: List[Dict]) -> int:
+        """
+        Append API history points newer than the stored series.
+
+        Args:
+            ticker: Market ticker
+            points: Dicts with 'ts', 'yes_bid', 'yes_ask', 'volume'
+
+        Returns:
+            Number of points added
+        """
+        with self._lock:
+            series = self._get(ticker)
+            last_ts = series.last_ts
+
+            fresh = sorted(
+                (p for p in points if p.get('ts') is not None and (last_ts is None or p['ts'] > last_ts)),
+                key=lambda p: p['ts']
+            )
+            if not fresh:
+                return 0
+
+            rows = {c: [] for c in COLUMNS}
+            previous_ts = last_ts
+            for point in fresh:
+                if point['ts'] == previous_ts:
+                    continue
+                previous_ts = point['ts']
+                for c in COLUMNS:
+                    rows[c].append(int(point.get(c) or 0))
+
+            series.append(rows)
+            return len(rows['ts'])
+
+    def range(self, ticker: str, start: Optional[int] = None, end: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Slice a ticker's history.
+
+        Args:
+            ticker: Market ticker
+            start: First timestamp included (Unix seconds)
+            end: Last timestamp included (Unix seconds)
+
+        Returns:
+            Dict of int64 column arrays keyed by COLUMNS
+        """
+        with self._lock:
+            return self._get(ticker).slice(start, end)
+
+    def resample(
+        self,
+        ticker: str,
+        interval: int,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Downsample history into fixed buckets, keeping the last point of each.
+
+        Args:
+            ticker: Market ticker
+            interval: Bucket size in seconds
+            start: First timestamp included
+            end: Last timestamp included
+
+        Returns:
+            Dict with bucket 'ts' (bucket start), 'yes_bid', 'yes_ask', 'mid',
+            'volume' (last cumulative value) and 'volume_delta' per non-empty bucket
+        """
+        columns = self.range(ticker, start, end)
+        ts = columns['ts']
+        if not len(ts):
+            return {c: np.zeros(0) for c in COLUMNS + ('mid', 'volume_delta')}
+
+        buckets = ts // interval
+        last = np.append(np.flatnonzero(np.diff(buckets)), len(ts) - 1)
+        volume = columns['volume'][last]
+
+        return {
+            'ts': buckets[last] * interval,
+            'yes_bid': columns['yes_bid'][last],
+            'yes_ask': columns['yes_ask'][last],
+            'mid': (columns['yes_bid'][last] + columns['yes_ask'][last]) / 2,
+            'volume': volume,
+            'volume_delta': np.diff(volume, prepend=columns['volume'][0])
+        }
+
+    def to_points(self, ticker: str, start: Optional[int] = None, end: Optional[int] = None) -> List[Dict]:
+        """Range slice as a list of point dictionaries (API response shape)."""
+        columns = self.range(ticker, start, end)
+        return [
+            dict(zip(COLUMNS, row))
+            for row in zip(*(columns[c].tolist() for c in COLUMNS))
+        ]
+
+    def flush(self) -> int:
+        """
+        Persist series changed since the last flush.
+
+        Returns:
+            Number of series written
+        """
+        if not self.directory:
+            return 0
+
+        written = 0
+        with self._lock:
+            for ticker, series in self._series.items():
+                if not series.dirty:
+                    continue
+                columns = series.slice(None, None)
+                np.savez_compressed(self._path(ticker), **columns)
+                series.dirty = False
+                written += 1
+
+        if written:
+            logger.info(f"Flushed price history for {written} tickers")
+        return written
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    store = PriceHistoryStore()
+    points = [
+        {'ts': 1700000000 + i * 60, 'yes_bid': 40 + i % 5, 'yes_ask': 42 + i % 5, 'volume': i * 10}
+        for i in range(10000)
+    ]
+    print(f"Added {store.append('DEMO', points)} points, last ts {store.last_ts('DEMO')}")
+    print(f"Added again: {store.append('DEMO', points[-10:])}")
+
+    window = store.range('DEMO', 1700000000 + 3600, 1700000000 + 7200)
+    print(f"1h window: {len(window['ts'])} points")
+
+    hourly = store.resample('DEMO', 3600)
+    print(f"Hourly buckets: {len(hourly['ts'])}, first mid {hourly['mid'][0]}")
@@ -1,37 +1,32 @@
 """Reddit API integration for fetching social data."""
 import os
+import time
+import threading
 import requests
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime
 import logging
-from functools import wraps
-import time
 
 logger = logging.getLogger(__name__)
 
 # Import mock data generator
 try:
     from integrations.mock_data_generator import MockDataGenerator
+    from integrations.resilience import retry_with_backoff
+    from integrations.fetch_scheduler import run_sweep, run_blocking, DEFAULT_CONCURRENCY
 except ImportError:
     from .mock_data_generator import MockDataGenerator
+    from .resilience import retry_with_backoff
+    from .fetch_scheduler import run_sweep, run_blocking, DEFAULT_CONCURRENCY
 
-
-def retry_with_backoff(max_retries=3, backoff_factor=2):
-    """Retry decorator with exponential backoff."""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise
-                    wait_time = backoff_factor ** attempt
-                    logger.warning(f"Retry {attempt+1}/{max_retries} after {wait_time}s: {e}")
-                    time.sleep(wait_time)
-        return wrapper
-    return decorator
+# Comment loading (one /comments request per post, so kept optional and capped)
+COMMENTS_PER_POST = 5
+COMMENT_MAX_POSTS = 10      # Posts (highest score first) that get comments per call
+COMMENT_CONCURRENCY = 4
+COMMENT_CACHE_TTL = 600
+COMMENT_CACHE_SIZE = 2000
 
 
 class RedditClient:
@@ -57,15 +52,19 @@ class RedditClient:
         self.use_public_json = use_public_json
         self.mock_generator = MockDataGenerator() if use_mock else None
         self.user_agent = user_agent
+        self._praw_config = {
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'user_agent': user_agent
+        }
+        self._local = threading.local()
+        self._comment_cache: OrderedDict = OrderedDict()
+        self._comment_lock = threading.Lock()
+        self._comment_executor: Optional[ThreadPoolExecutor] = None
 
         if not self.use_mock and not self.use_public_json:
             try:
-                import praw
-                self.reddit = praw.Reddit(
-                    client_id=client_id,
-                    client_secret=client_secret,
-                    user_agent=user_agent
-                )
+                self.reddit  # Create the first instance now so bad credentials fall back early
                 logger.info("Reddit client initialized with PRAW")
             except Exception as e:
                 logger.warning(f"Failed to initialize PRAW, using public JSON: {e}")
@@ -75,13 +74,138 @@ class RedditClient:
         else:
             logger.info("Reddit client initialized in MOCK MODE")
 
-    @retry_with_backoff(max_retries=3)
+    @property
+    def reddit(self):
+        """PRAW instance for the current thread (PRAW is not thread-safe)."""
+        instance = getattr(self._local, 'reddit', None)
+        if instance is None:
+            import praw
+            instance = praw.Reddit(**self._praw_config)
+            self._local.reddit = instance
+        return instance
+
+    @property
+    def comment_executor(self) -> ThreadPoolExecutor:
+        """
+        Long-lived pool for comment requests.
+
+        Its workers keep their thread-local PRAW instance (and OAuth token)
+        across calls instead of creating new ones for every batch.
+        """
+        with self._comment_lock:
+            if self._comment_executor is None:
+                self._comment_executor = ThreadPoolExecutor(
+                    max_workers=COMMENT_CONCURRENCY,
+                    thread_name_prefix='reddit-comments'
+                )
+            return self._comment_executor
+
+    def close(self):
+        """Shut down the comment worker pool."""
+        with self._comment_lock:
+            executor, self._comment_executor = self._comment_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _submission_to_post(submission) -> Dict:
+        """Normalize a PRAW submission from a listing (no extra requests)."""
+        return {
+            'id': submission.id,
+            'title': submission.title,
+            'text': submission.selftext,
+            'subreddit': submission.subreddit.display_name,
+            'created_at': datetime.fromtimestamp(submission.created_utc),
+            'upvotes': submission.score,
+            'upvote_ratio': submission.upvote_ratio,
+            'num_comments': submission.num_comments,
+            'author': str(submission.author) if submission.author else '[deleted]',
+            'url': submission.url,
+            'top_comments': [],  # Filled by load_top_comments when requested
+            'platform': 'reddit'
+        }
+
+    @retry_with_backoff(max_retries=3, upstream='reddit')
+    def _fetch_top_comments(self, post_id: str, per_post: int) -> List[str]:
+        """One /comments request for a post, asking Reddit for only its top `per_post` comments."""
+        submission = self.reddit.submission(id=post_id)
+        submission.comment_sort = 'top'
+        submission.comment_limit = per_post
+        return [
+            comment.body for comment in submission.comments
+            if hasattr(comment, 'body')  # Skip MoreComments placeholders instead of expanding them
+        ][:per_post]
+
+    def load_top_comments(
+        self,
+        posts: List[Dict],
+        per_post: int = COMMENTS_PER_POST,
+        max_posts: int = COMMENT_MAX_POSTS
+    ) -> List[Dict]:
+        """
+        Fill 'top_comments' for the highest-scoring posts, in place.
+
+        Reddit has no multi-post comments endpoint, so this bounds the
+        per-post cost instead: posts without comments are skipped, only the
+        top `max_posts` by score are fetched, requests run on the client's
+        comment_executor (COMMENT_CONCURRENCY at once) under the shared
+        reddit token bucket, and results are cached.
+
+        Args:
+            posts: Posts from search_posts/get_subreddit_posts
+            per_post: Comments kept per post
+            max_posts: Posts that get comments
+
+        Returns:
+            The same posts
+        """
+        now = time.time()
+        wanted = sorted(
+            (p for p in posts if p.get('num_comments')),
+            key=lambda p: p.get('upvotes', 0),
+            reverse=True
+        )[:max_posts]
+
+        to_fetch = []
+        with self._comment_lock:
+            for post in wanted:
+                cached = self._comment_cache.get(post['id'])
+                if cached and now - cached[0] < COMMENT_CACHE_TTL:
+                    post['top_comments'] = cached[1][:per_post]
+                else:
+                    to_fetch.append(post)
+
+        def fetch(post: Dict):
+            try:
+                return post, self._fetch_top_comments(post['id'], per_post)
+            except Exception as e:
+                logger.error(f"Error fetching comments for {post['id']}: {e}")
+                return post, None
+
+        if to_fetch:
+            fetched = list(self.comment_executor.map(fetch, to_fetch))
+
+            with self._comment_lock:
+                for post, comments in fetched:
+                    if comments is None:
+                        continue
+                    post['top_comments'] = comments
+                    self._comment_cache[post['id']] = (now, comments)
+                    self._comment_cache.move_to_end(post['id'])
+                while len(self._comment_cache) > COMMENT_CACHE_SIZE:
+                    self._comment_cache.popitem(last=False)
+
+        logger.info(f"Loaded comments for {len(wanted)} posts ({len(to_fetch)} requests)")
+        return posts
+
+    @retry_with_backoff(max_retries=3, upstream='reddit')
     def search_posts(
         self,
         query: str,
         subreddit: Optional[str] = None,
         time_filter: str = "day",
-        limit: int = 100
+        limit: int = 100,
+        include_comments: bool = False
     ) -> List[Dict]:
         """
         Search for posts matching query.
@@ -91,6 +215,7 @@ class RedditClient:
             subreddit: Specific subreddit to search (None for all)
             time_filter: 'hour', 'day', 'week', 'month', 'year', 'all'
             limit: Maximum number of posts to return
+            include_comments: Also load top comments (see load_top_comments)
 
         Returns:
             List of post dictionaries with text, metrics, timestamp
@@ -101,28 +226,12 @@ class RedditClient:
             else:
                 search_target = self.reddit.subreddit("all")
 
-            posts = []
-            for submission in search_target.search(query, time_filter=time_filter, limit=limit):
-                # Get top comments for additional context
-                submission.comments.replace_more(limit=0)
-                top_comments = [
-                    comment.body for comment in submission.comments.list()[:5]
-                ]
-
-                posts.append({
-                    'id': submission.id,
-                    'title': submission.title,
-                    'text': submission.selftext,
-                    'subreddit': submission.subreddit.display_name,
-                    'created_at': datetime.fromtimestamp(submission.created_utc),
-                    'upvotes': submission.score,
-                    'upvote_ratio': submission.upvote_ratio,
-                    'num_comments': submission.num_comments,
-                    'author': str(submission.author) if submission.author else '[deleted]',
-                    'url': submission.url,
-                    'top_comments': top_comments,
-                    'platform': 'reddit'
-                })
+            posts = [
+                self._submission_to_post(submission)
+                for submission in search_target.search(query, time_filter=time_filter, limit=limit)
+            ]
+            if include_comments:
+                self.load_top_comments(posts)
 
             logger.info(f"Fetched {len(posts)} posts for query: {query}")
             return posts
@@ -131,13 +240,14 @@ class RedditClient:
             logger.error(f"Error fetching Reddit posts: {e}")
             raise
 
-    @retry_with_backoff(max_retries=3)
+    @retry_with_backoff(max_retries=3, upstream='reddit')
     def get_subreddit_posts(
         self,
         subreddit: str,
         sort: str = "hot",
         time_filter: str = "day",
-        limit: int = 100
+        limit: int = 100,
+        include_comments: bool = False
     ) -> List[Dict]:
         """
         Get posts from specific subreddit.
@@ -147,6 +257,7 @@ class RedditClient:
             sort: 'hot', 'new', 'top', 'rising', 'controversial'
             time_filter: For 'top' and 'controversial' sorts
             limit: Maximum number of posts
+            include_comments: Also load top comments (see load_top_comments)
 
         Returns:
             List of post dictionaries
@@ -168,27 +279,9 @@ class RedditClient:
             else:
                 raise ValueError(f"Invalid sort method: {sort}")
 
-            posts = []
-            for submission in submissions:
-                submission.comments.replace_more(limit=0)
-                top_comments = [
-                    comment.body for comment in submission.comments.list()[:5]
-                ]
-
-                posts.append({
-                    'id': submission.id,
-                    'title': submission.title,
-                    'text': submission.selftext,
-                    'subreddit': submission.subreddit.display_name,
-                    'created_at': datetime.fromtimestamp(submission.created_utc),
-                    'upvotes': submission.score,
-                    'upvote_ratio': submission.upvote_ratio,
-                    'num_comments': submission.num_comments,
-                    'author': str(submission.author) if submission.author else '[deleted]',
-                    'url': submission.url,
-                    'top_comments': top_comments,
-                    'platform': 'reddit'
-                })
+            posts = [self._submission_to_post(submission) for submission in submissions]
+            if include_comments:
+                self.load_top_comments(posts)
 
             logger.info(f"Fetched {len(posts)} posts from r/{subreddit}")
             return posts
@@ -201,21 +294,47 @@ class RedditClient:
         self,
         topics: List[str],
         relevant_subreddits: Optional[List[str]] = None,
-        time_filter: str = "day"
+        time_filter: str = "day",
+        concurrency: int = DEFAULT_CONCURRENCY
     ) -> Dict[str, List[Dict]]:
         """
-        Fetch posts for multiple topics from relevant subreddits.
+        Fetch posts for multiple topics from relevant subreddits (blocking).
+
+        Use fetch_topics_data_async from inside an event loop.
 
         Args:
             topics: List of search topics
             relevant_subreddits: List of subreddits to search (None for all)
             time_filter: Time range for posts
+            concurrency: Requests in flight at once
 
         Returns:
-            Dictionary mapping topic to list of posts
+            Dictionary mapping topic to list of posts, deduplicated by post id
+        """
+        return run_blocking(
+            lambda: self.fetch_topics_data_async(topics, relevant_subreddits, time_filter, concurrency),
+            'RedditClient.fetch_topics_data'
+        )
+
+    async def fetch_topics_data_async(
+        self,
+        topics: List[str],
+        relevant_subreddits: Optional[List[str]] = None,
+        time_filter: str = "day",
+        concurrency: int = DEFAULT_CONCURRENCY
+    ) -> Dict[str, List[Dict]]:
         """
-        results = {}
+        Fetch every topic x subreddit concurrently, paced by the shared reddit token bucket.
 
+        Args:
+            topics: List of search topics
+            relevant_subreddits: List of subreddits to search (None for all)
+            time_filter: Time range for posts
+            concurrency: Requests in flight at once (PRAW calls run in worker threads)
+
+        Returns:
+            Dictionary mapping topic to list of posts, deduplicated by post id
+        """
         # Default subreddits for different categories
         if not relevant_subreddits:
             relevant_subreddits = [
@@ -224,25 +343,10 @@ class RedditClient:
                 'technology', 'sports'
             ]
 
-        for topic in topics:
-            all_posts = []
-            for subreddit in relevant_subreddits:
-                try:
-                    posts = self.search_posts(
-                        query=topic,
-                        subreddit=subreddit,
-                        time_filter=time_filter,
-                        limit=50
-                    )
-                    all_posts.extend(posts)
-                    time.sleep(0.5)  # Rate limiting
-                except Exception as e:
-                    logger.error(f"Error fetching r/{subreddit} for topic '{topic}': {e}")
-
-            results[topic] = all_posts
-            logger.info(f"Total {len(all_posts)} posts for topic: {topic}")
-
-        return results
+        def fetch(topic: str, subreddit: str) -> List[Dict]:
+            return self.search_posts(query=topic, subreddit=subreddit, time_filter=time_filter, limit=50)
+
+        return await run_sweep(topics, relevant_subreddits, fetch, concurrency=concurrency)
 
 
 # Example usage and testing
@@ -1,24 +1,133 @@
 """Reddit public JSON API - no authentication required."""
+import time
+import threading
 import requests
-from typing import List, Dict, Optional
+import httpx
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 import logging
-import time
+
+try:
+    from integrations.resilience import get_limiter
+    from integrations.cassette import mount_session
+    from integrations.http_transport import get_async_client
+    from integrations.fetch_scheduler import run_sweep, run_blocking, DEFAULT_CONCURRENCY
+except ImportError:
+    from .resilience import get_limiter
+    from .cassette import mount_session
+    from .http_transport import get_async_client
+    from .fetch_scheduler import run_sweep, run_blocking, DEFAULT_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SUBREDDITS = [
+    'all', 'news', 'worldnews', 'politics',
+    'cryptocurrency', 'CryptoMarkets', 'Bitcoin',
+    'technology', 'sports'
+]
+
+# Incremental polling
+TIME_FILTER_SECONDS = {'hour': 3600, 'day': 86400, 'week': 604800, 'month': 2592000, 'year': 31536000}
+POLL_PAGE_SIZE = 100
+POLL_MAX_PAGES = 5               # Newer pages followed per poll
+POLL_WINDOW_SIZE = 500           # Posts kept per (query, subreddit)
+POLL_FULL_REFRESH_SECONDS = 900  # Full refetch interval (refreshes scores, recovers a deleted anchor)
+POLL_MAX_QUERIES = 200           # Windows kept (least recently polled evicted first)
+
+
+class _PollWindow:
+    """Cached newest-first results for one (query, subreddit, time_filter)."""
+
+    __slots__ = ('posts', 'newest_fullname', 'newest_ts', 'refreshed_at')
+
+    def __init__(self):
+        self.posts: Dict[str, Dict] = {}
+        self.newest_fullname: Optional[str] = None
+        self.newest_ts = 0.0
+        self.refreshed_at = time.time()
+
+    def merge(self, fresh: List[Dict], max_age: Optional[int], max_posts: int = POLL_WINDOW_SIZE) -> List[Dict]:
+        """Add posts, advance the cursor, evict expired/excess posts; returns posts not seen before."""
+        new = [p for p in fresh if p['id'] not in self.posts]
+        for post in fresh:
+            self.posts[post['id']] = post
+            ts = post['created_at'].timestamp()
+            if ts >= self.newest_ts and post.get('fullname'):
+                self.newest_ts, self.newest_fullname = ts, post['fullname']
+
+        cutoff = time.time() - max_age if max_age else None
+        ordered = sorted(self.posts.values(), key=lambda p: p['created_at'], reverse=True)
+        kept = [p for p in ordered if cutoff is None or p['created_at'].timestamp() >= cutoff][:max_posts]
+        self.posts = {p['id']: p for p in kept}
+        return new
+
+    def newest(self, limit: int) -> List[Dict]:
+        return sorted(self.posts.values(), key=lambda p: p['created_at'], reverse=True)[:limit]
+
 
 class RedditPublicClient:
     """Client for Reddit public JSON API (no auth needed)."""
 
-    def __init__(self):
-        """Initialize Reddit public client."""
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, poll_window_size: int = POLL_WINDOW_SIZE, poll_max_queries: int = POLL_MAX_QUERIES):
+        """
+        Initialize Reddit public client.
+
+        Args:
+            poll_window_size: Posts kept per polled search
+            poll_max_queries: Polled searches kept (least recently polled evicted first)
+        """
+        self.headers = {
             'User-Agent': 'MindshareAnalyzer/1.0 (Educational/Research)'
-        })
+        }
+        self.session = mount_session(requests.Session())
+        self.session.headers.update(self.headers)
+        self._windows: OrderedDict = OrderedDict()
+        self._windows_lock = threading.Lock()
+        self.poll_window_size = poll_window_size
+        self.poll_max_queries = poll_max_queries
+        self.poll_stats = {'polls': 0, 'full_fetches': 0, 'requests': 0, 'new_posts': 0}
         logger.info("Reddit public JSON client initialized")
 
+    @staticmethod
+    def _search_request(query: str, subreddit: str, time_filter: str, limit: int):
+        """URL and params for a search.json request."""
+        url = f"https://www.reddit.com/r/{subreddit}/search.json"
+        params = {
+            'q': query,
+            't': time_filter,
+            'limit': min(limit, 100),
+            'sort': 'relevance',
+            'restrict_sr': 'on' if subreddit != 'all' else 'off'
+        }
+        return url, params
+
+    @staticmethod
+    def _parse_posts(data: Dict) -> List[Dict]:
+        """Normalize a listing response into post dictionaries."""
+        posts = []
+
+        for child in data.get('data', {}).get('children', []):
+            post_data = child.get('data', {})
+
+            posts.append({
+                'id': post_data.get('id'),
+                'title': post_data.get('title', ''),
+                'text': post_data.get('selftext', ''),
+                'subreddit': post_data.get('subreddit', ''),
+                'created_at': datetime.fromtimestamp(post_data.get('created_utc', 0)),
+                'upvotes': post_data.get('score', 0),
+                'upvote_ratio': post_data.get('upvote_ratio', 0.5),
+                'num_comments': post_data.get('num_comments', 0),
+                'author': post_data.get('author', '[deleted]'),
+                'url': f"https://reddit.com{post_data.get('permalink', '')}",
+                'top_comments': [],  # Public JSON doesn't include comments
+                'platform': 'reddit',
+                'fullname': post_data.get('name')
+            })
+
+        return posts
+
     def search_posts(
         self,
         query: str,
@@ -39,39 +148,13 @@ class RedditPublicClient:
             List of post dictionaries
         """
         try:
-            url = f"https://www.reddit.com/r/{subreddit}/search.json"
-            params = {
-                'q': query,
-                't': time_filter,
-                'limit': min(limit, 100),
-                'sort': 'relevance',
-                'restrict_sr': 'on' if subreddit != 'all' else 'off'
-            }
+            url, params = self._search_request(query, subreddit, time_filter, limit)
 
+            get_limiter('reddit_public').acquire()
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
-            posts = []
-
-            for child in data.get('data', {}).get('children', []):
-                post_data = child.get('data', {})
-
-                posts.append({
-                    'id': post_data.get('id'),
-                    'title': post_data.get('title', ''),
-                    'text': post_data.get('selftext', ''),
-                    'subreddit': post_data.get('subreddit', ''),
-                    'created_at': datetime.fromtimestamp(post_data.get('created_utc', 0)),
-                    'upvotes': post_data.get('score', 0),
-                    'upvote_ratio': post_data.get('upvote_ratio', 0.5),
-                    'num_comments': post_data.get('num_comments', 0),
-                    'author': post_data.get('author', '[deleted]'),
-                    'url': f"https://reddit.com{post_data.get('permalink', '')}",
-                    'top_comments': [],  # Public JSON doesn't include comments
-                    'platform': 'reddit'
-                })
-
+            posts = self._parse_posts(response.json())
             logger.info(f"Fetched {len(posts)} posts from r/{subreddit} for query: {query}")
             return posts
 
@@ -79,6 +162,42 @@ class RedditPublicClient:
             logger.error(f"Error fetching from Reddit: {e}")
             return []
 
+    async def search_posts_async(
+        self,
+        query: str,
+        subreddit: str = "all",
+        time_filter: str = "day",
+        limit: int = 100
+    ) -> List[Dict]:
+        """
+        Async search_posts on the shared connection pool.
+
+        Waits on the shared reddit_public token bucket without blocking the event loop.
+
+        Args:
+            query: Search query
+            subreddit: Subreddit name (default: "all")
+            time_filter: 'hour', 'day', 'week', 'month', 'year'
+            limit: Maximum posts to return
+
+        Returns:
+            List of post dictionaries
+        """
+        try:
+            url, params = self._search_request(query, subreddit, time_filter, limit)
+
+            await get_limiter('reddit_public').acquire_async()
+            response = await get_async_client().get(url, params=params, headers=self.headers, timeout=10)
+            response.raise_for_status()
+
+            posts = self._parse_posts(response.json())
+            logger.info(f"Fetched {len(posts)} posts from r/{subreddit} for query: {query}")
+            return posts
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching from Reddit: {e}")
+            return []
+
     def get_subreddit_posts(
         self,
         subreddit: str,
@@ -106,30 +225,11 @@ class RedditPublicClient:
                 url = f"https://www.reddit.com/r/{subreddit}/{sort}.json"
                 params = {'limit': min(limit, 100)}
 
+            get_limiter('reddit_public').acquire()
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
-            posts = []
-
-            for child in data.get('data', {}).get('children', []):
-                post_data = child.get('data', {})
-
-                posts.append({
-                    'id': post_data.get('id'),
-                    'title': post_data.get('title', ''),
-                    'text': post_data.get('selftext', ''),
-                    'subreddit': post_data.get('subreddit', ''),
-                    'created_at': datetime.fromtimestamp(post_data.get('created_utc', 0)),
-                    'upvotes': post_data.get('score', 0),
-                    'upvote_ratio': post_data.get('upvote_ratio', 0.5),
-                    'num_comments': post_data.get('num_comments', 0),
-                    'author': post_data.get('author', '[deleted]'),
-                    'url': f"https://reddit.com{post_data.get('permalink', '')}",
-                    'top_comments': [],
-                    'platform': 'reddit'
-                })
-
+            posts = self._parse_posts(response.json())
             logger.info(f"Fetched {len(posts)} posts from r/{subreddit}")
             return posts
 
@@ -137,42 +237,211 @@ class RedditPublicClient:
             logger.error(f"Error fetching subreddit: {e}")
             return []
 
+    def _poll_start(self, query: str, subreddit: str, time_filter: str) -> Tuple[tuple, Optional[_PollWindow], bool]:
+        """Cached window for the search (None if never polled) and whether a full fetch is due."""
+        key = (query.lower(), subreddit.lower(), time_filter)
+        with self._windows_lock:
+            window = self._windows.get(key)
+            if window is not None:
+                self._windows.move_to_end(key)
+            self.poll_stats['polls'] += 1
+        full = window is None or not window.newest_fullname or \
+            time.time() - window.refreshed_at > POLL_FULL_REFRESH_SECONDS
+        return key, window, full
+
+    def _poll_finish(self, key: tuple, window: Optional[_PollWindow], full: bool, fresh: List[Dict],
+                     limit: int, new_only: bool) -> List[Dict]:
+        """
+        Merge fetched posts into the window for `key` and build the poll result.
+
+        A full fetch merges into the existing window too, so posts seen by
+        earlier polls are not reported as new again.
+        """
+        with self._windows_lock:
+            if window is None:
+                window = _PollWindow()
+            if full:
+                # Re-anchor on the listing just fetched, in case the old anchor post was deleted
+                window.newest_ts, window.newest_fullname = 0.0, None
+                window.refreshed_at = time.time()
+                self.poll_stats['full_fetches'] += 1
+
+            new = window.merge(fresh, TIME_FILTER_SECONDS.get(key[2]), self.poll_window_size)
+            self._windows[key] = window
+            self._windows.move_to_end(key)
+            while len(self._windows) > self.poll_max_queries:
+                self._windows.popitem(last=False)
+            self.poll_stats['new_posts'] += len(new)
+            result = new if new_only else window.newest(limit)
+
+        logger.info(f"Polled r/{key[1]} for '{key[0]}': {len(new)} new, {len(window.posts)} in window")
+        return result
+
+    def _poll_failed(self, window: Optional[_PollWindow], limit: int, new_only: bool) -> List[Dict]:
+        """Poll result when a full fetch failed: the cached window, left untouched."""
+        if window is None or new_only:
+            return []
+        with self._windows_lock:
+            return window.newest(limit)
+
+    def _poll_params(self, query: str, subreddit: str, time_filter: str, limit: int, before: Optional[str]):
+        url, params = self._search_request(query, subreddit, time_filter, limit)
+        params['sort'] = 'new'  # `before` pagination only means "newer" on a date-sorted listing
+        if before:
+            params['before'] = before
+        return url, params
+
+    def _get_listing(self, url: str, params: Dict) -> Dict:
+        get_limiter('reddit_public').acquire()
+        with self._windows_lock:
+            self.poll_stats['requests'] += 1
+        response = self.session.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_listing_async(self, url: str, params: Dict) -> Dict:
+        await get_limiter('reddit_public').acquire_async()
+        with self._windows_lock:
+            self.poll_stats['requests'] += 1
+        response = await get_async_client().get(url, params=params, headers=self.headers, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def poll_posts(
+        self,
+        query: str,
+        subreddit: str = "all",
+        time_filter: str = "day",
+        limit: int = 100,
+        new_only: bool = False
+    ) -> List[Dict]:
+        """
+        Incrementally poll a search, fetching only posts newer than the last poll.
+
+        The first poll (and one every POLL_FULL_REFRESH_SECONDS) fetches the
+        newest `limit` posts. Later polls page forward with Reddit's `before`
+        cursor from the newest post already seen and merge the results into
+        a cached window. Results are sorted by date, not relevance.
+
+        Args:
+            query: Search query
+            subreddit: Subreddit name (default: "all")
+            time_filter: 'hour', 'day', 'week', 'month', 'year'
+            limit: Posts returned (and fetched on a full poll)
+            new_only: Return only posts not seen by earlier polls
+
+        Returns:
+            Newest posts in the window (or only the new ones)
+        """
+        key, window, full = self._poll_start(query, subreddit, time_filter)
+        fresh = []
+        try:
+            if full:
+                url, params = self._poll_params(query, subreddit, time_filter, limit, None)
+                fresh = self._parse_posts(self._get_listing(url, params))
+            else:
+                before = window.newest_fullname
+                for _ in range(POLL_MAX_PAGES):
+                    url, params = self._poll_params(query, subreddit, time_filter, POLL_PAGE_SIZE, before)
+                    page = self._parse_posts(self._get_listing(url, params))
+                    fresh.extend(page)
+                    if len(page) < POLL_PAGE_SIZE:
+                        break
+                    before = page[0]['fullname']
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error polling Reddit: {e}")
+            if full:
+                return self._poll_failed(window, limit, new_only)
+        return self._poll_finish(key, window, full, fresh, limit, new_only)
+
+    async def poll_posts_async(
+        self,
+        query: str,
+        subreddit: str = "all",
+        time_filter: str = "day",
+        limit: int = 100,
+        new_only: bool = False
+    ) -> List[Dict]:
+        """Async poll_posts on the shared connection pool (same arguments and result)."""
+        key, window, full = self._poll_start(query, subreddit, time_filter)
+        fresh = []
+        try:
+            if full:
+                url, params = self._poll_params(query, subreddit, time_filter, limit, None)
+                fresh = self._parse_posts(await self._get_listing_async(url, params))
+            else:
+                before = window.newest_fullname
+                for _ in range(POLL_MAX_PAGES):
+                    url, params = self._poll_params(query, subreddit, time_filter, POLL_PAGE_SIZE, before)
+                    page = self._parse_posts(await self._get_listing_async(url, params))
+                    fresh.extend(page)
+                    if len(page) < POLL_PAGE_SIZE:
+                        break
+                    before = page[0]['fullname']
+        except httpx.HTTPError as e:
+            logger.error(f"Error polling Reddit: {e}")
+            if full:
+                return self._poll_failed(window, limit, new_only)
+        return self._poll_finish(key, window, full, fresh, limit, new_only)
+
     def fetch_topics_data(
         self,
         topics: List[str],
-        relevant_subreddits: Optional[List[str]] = None
+        relevant_subreddits: Optional[List[str]] = None,
+        max_subreddits: int = 3,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        incremental: bool = False
     ) -> Dict[str, List[Dict]]:
         """
-        Fetch posts for multiple topics.
+        Fetch posts for multiple topics (blocking; use fetch_topics_data_async inside an event loop).
 
         Args:
             topics: List of topics
             relevant_subreddits: Subreddits to search
+            max_subreddits: Subreddits searched per topic
+            concurrency: Requests in flight at once
+            incremental: Use poll_posts (newest posts, only new ones fetched on repeat sweeps)
 
         Returns:
-            Dict mapping topic to posts
+            Dict mapping topic to posts, deduplicated by post id
         """
-        if not relevant_subreddits:
-            relevant_subreddits = [
-                'all', 'news', 'worldnews', 'politics',
-                'cryptocurrency', 'CryptoMarkets', 'Bitcoin',
-                'technology', 'sports'
-            ]
-
-        results = {}
+        subreddits = (relevant_subreddits or DEFAULT_SUBREDDITS)[:max_subreddits]
+        search = self.poll_posts if incremental else self.search_posts
+        return run_blocking(lambda: run_sweep(
+            topics,
+            subreddits,
+            lambda topic, subreddit: search(topic, subreddit, limit=25),
+            concurrency=concurrency
+        ), 'RedditPublicClient.fetch_topics_data')
+
+    async def fetch_topics_data_async(
+        self,
+        topics: List[str],
+        relevant_subreddits: Optional[List[str]] = None,
+        max_subreddits: int = 3,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        incremental: bool = False
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch posts for multiple topics concurrently, paced by the reddit_public token bucket.
 
-        for topic in topics:
-            all_posts = []
+        Args:
+            topics: List of topics
+            relevant_subreddits: Subreddits to search
+            max_subreddits: Subreddits searched per topic
+            concurrency: Requests in flight at once
+            incremental: Use poll_posts_async (newest posts, only new ones fetched on repeat sweeps)
 
-            for subreddit in relevant_subreddits[:3]:  # Limit to avoid rate limits
-                posts = self.search_posts(topic, subreddit, limit=25)
-                all_posts.extend(posts)
-                time.sleep(2)  # Rate limiting - be respectful
+        Returns:
+            Dict mapping topic to posts, deduplicated by post id
+        """
+        subreddits = (relevant_subreddits or DEFAULT_SUBREDDITS)[:max_subreddits]
+        search = self.poll_posts_async if incremental else self.search_posts_async
 
-            results[topic] = all_posts
-            logger.info(f"Total {len(all_posts)} posts for topic: {topic}")
+        async def fetch(topic: str, subreddit: str) -> List[Dict]:
+            return await search(topic, subreddit, limit=25)
 
-        return results
+        return await run_sweep(topics, subreddits, fetch, concurrency=concurrency)
 
 
 # Test if __main__
@@ -0,0 +1,400 @@
+"""Shared retry and rate-limiting utilities for upstream integrations."""
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import wraps
+from typing import Dict, Optional, Tuple
+import requests
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Default per-upstream limits: (requests per second, burst capacity)
+# Override with RATE_LIMIT_<UPSTREAM>="<rate>:<burst>", e.g. RATE_LIMIT_KALSHI="10:10"
+UPSTREAM_LIMITS: Dict[str, Tuple[float, int]] = {
+    'kalshi': (20.0, 20),            # Basic tier read limit
+    'polymarket': (10.0, 20),        # Gamma API
+    'reddit': (100 / 60, 10),        # OAuth: 100 queries per minute
+    'reddit_public': (10 / 60, 10),  # Unauthenticated JSON: 10 queries per minute
+    'twitter': (450 / 900, 5),       # Recent search: 450 requests per 15 minutes (app auth)
+}
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token-bucket limiter usable from both threads and coroutines."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def penalize(self, seconds: float):
+        """Drain the bucket so no caller proceeds for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated = time.monotonic()
+
+    def acquire(self):
+        """Block the current thread until a token is available."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait for a token without blocking the event loop."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(upstream: str) -> TokenBucket:
+    """
+    Get the process-wide limiter for an upstream.
+
+    Args:
+        upstream: Upstream name (see UPSTREAM_LIMITS)
+
+    Returns:
+        Shared TokenBucket
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(upstream)
+        if limiter is None:
+            rate, burst = UPSTREAM_LIMITS.get(upstream, (5.0, 5))
+            override = os.getenv(f"RATE_LIMIT_{upstream.upper()}")
+            if override:
+                try:
+                    rate_str, burst_str = override.split(':')
+                    rate, burst = float(rate_str), int(burst_str)
+                except ValueError:
+                    logger.warning(f"Ignoring malformed RATE_LIMIT_{upstream.upper()}={override}")
+            limiter = TokenBucket(rate, burst)
+            _limiters[upstream] = limiter
+        return limiter
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker for one upstream.
+
+    Closed: calls go through and consecutive failures are counted.
+    Open: after `failure_threshold` consecutive failures calls are rejected
+    for `recovery_timeout` seconds. Half-open: then up to
+    `half_open_max_calls` probe calls are let through; a success closes the
+    circuit, a failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Upstream name (for logs and metrics)
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before probing
+            half_open_max_calls: Probe calls allowed at once while half-open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._metrics = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+
+    @property
+    def state(self) -> str:
+        """Current state, moving open -> half-open once the recovery timeout has passed."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit {self.name} half-open, probing upstream")
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (counts a probe when half-open)."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self._metrics['rejected'] += 1
+            return False
+
+    def record_success(self):
+        """Record a successful call."""
+        with self._lock:
+            self._metrics['successes'] += 1
+            self._failures = 0
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self._state = self.CLOSED
+
+    def record_failure(self, exc: Optional[Exception] = None):
+        """Record a failed call, opening the circuit when the threshold is reached."""
+        with self._lock:
+            self._metrics['failures'] += 1
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._metrics['opened'] += 1
+                    logger.warning(
+                        f"Circuit {self.name} open for {self.recovery_timeout:.0f}s "
+                        f"after {self._failures} failures: {exc}"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, func, *args, **kwargs):
+        """
+        Call `func` through the breaker.
+
+        Raises:
+            CircuitOpenError: The circuit is open
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit {self.name} is open")
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if counts_as_failure(e):
+                self.record_failure(e)
+            else:
+                self.record_success()  # The upstream answered; the request itself was bad
+            raise
+        self.record_success()
+        return result
+
+    def metrics(self) -> Dict:
+        """State and counters."""
+        with self._lock:
+            state = self._current_state()
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'retry_in': round(max(self.recovery_timeout - (time.monotonic() - self._opened_at), 0.0), 1)
+                if state == self.OPEN else 0.0,
+                **self._metrics
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    """
+    Get the process-wide circuit breaker for an upstream.
+
+    Override the defaults with CIRCUIT_<UPSTREAM>="<failure threshold>:<recovery seconds>".
+
+    Args:
+        upstream: Upstream name
+
+    Returns:
+        Shared CircuitBreaker
+    """
+    with _limiters_lock:
+        breaker = _breakers.get(upstream)
+        if breaker is None:
+            threshold, recovery = 5, 30.0
+            override = os.getenv(f"CIRCUIT_{upstream.upper()}")
+            if override:
+                try:
+                    threshold_str, recovery_str = override.split(':')
+                    threshold, recovery = int(threshold_str), float(recovery_str)
+                except ValueError:
+                    logger.warning(f"Ignoring malformed CIRCUIT_{upstream.upper()}={override}")
+            breaker = CircuitBreaker(upstream, threshold, recovery)
+            _breakers[upstream] = breaker
+        return breaker
+
+
+def breaker_metrics() -> Dict[str, Dict]:
+    """Metrics for every circuit breaker created so far."""
+    with _limiters_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.metrics() for b in breakers}
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    """Extract an HTTP status from requests/httpx/SDK exceptions."""
+    response = getattr(exc, 'response', None)
+    return getattr(response, 'status_code', None) or getattr(response, 'status', None)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """
+    Decide whether an exception is worth retrying.
+
+    Transport failures, timeouts, 429 and 5xx are retried; other 4xx and
+    non-network errors are not.
+    """
+    status = _status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+
+    return isinstance(exc, (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        httpx.TransportError,
+        ConnectionError,
+        TimeoutError
+    ))
+
+
+def counts_as_failure(exc: Exception) -> bool:
+    """
+    Decide whether an exception says the upstream is unhealthy.
+
+    Errors without a response (transport failures, timeouts), 429/5xx and
+    401/403 (credentials rejected) count. Other 4xx mean the request was
+    bad, not the upstream.
+    """
+    status = _status_code(exc)
+    return status is None or status in RETRYABLE_STATUS or status in (401, 403)
+
+
+def retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) from an error response."""
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _next_delay(previous: float, base_delay: float, max_delay: float) -> float:
+    """Decorrelated jitter: sleep = min(cap, uniform(base, previous * 3))."""
+    return min(max_delay, random.uniform(base_delay, max(previous, base_delay) * 3))
+
+
+def retry_with_backoff(
+    max_retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    upstream: Optional[str] = None
+):
+    """
+    Retry decorator with decorrelated jitter for sync and async callables.
+
+    Each attempt first takes a token from the upstream's shared limiter.
+    Retry-After is honored on 429/503 responses and also pauses the shared
+    limiter, so every caller of that upstream backs off together.
+
+    Args:
+        max_retries: Total attempts
+        base_delay: Minimum delay between attempts (seconds)
+        max_delay: Maximum delay between attempts (seconds)
+        upstream: Name of the rate-limited upstream, if any
+    """
+    def decorator(func):
+        limiter = get_limiter(upstream) if upstream else None
+
+        def plan_retry(attempt: int, exc: Exception, previous: float) -> Optional[float]:
+            if attempt == max_retries - 1 or not is_retryable(exc):
+                return None
+
+            delay = _next_delay(previous, base_delay, max_delay)
+            retry_after = retry_after_seconds(exc)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, max_delay * 4))
+                if limiter:
+                    limiter.penalize(retry_after)
+
+            logger.warning(f"Retry {attempt+1}/{max_retries} of {func.__name__} after {delay:.2f}s: {exc}")
+            return delay
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                delay = base_delay
+                for attempt in range(max_retries):
+                    if limiter:
+                        await limiter.acquire_async()
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        delay = plan_retry(attempt, e, delay)
+                        if delay is None:
+                            raise
+                        await asyncio.sleep(delay)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            delay = base_delay
+            for attempt in range(max_retries):
+                if limiter:
+                    limiter.acquire()
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    delay = plan_retry(attempt, e, delay)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+        return wrapper
+    return decorator
@@ -0,0 +1,226 @@
+"""Shared market taxonomy: keyword rules compiled into one word-boundary regex."""
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Ordered by priority: when a market matches several categories the earlier one wins
+DEFAULT_RULES: List[Tuple[str, List[str]]] = [
+    ('politics', ['election', 'president', 'presidential', 'vote', 'senate', 'congress', 'political',
+                  'governor', 'parliament', 'prime minister', 'democrat', 'republican', 'nominee']),
+    ('cryptocurrency', ['bitcoin', 'crypto', 'cryptocurrency', 'ethereum', 'btc', 'eth', 'blockchain',
+                        'solana', 'stablecoin']),
+    ('sports', ['nba', 'nfl', 'nhl', 'mlb', 'soccer', 'football', 'baseball', 'basketball', 'sports',
+                'championship', 'super bowl', 'world cup', 'playoffs']),
+    ('finance', ['fed', 'federal reserve', 'inflation', 'cpi', 'gdp', 'interest rate', 'recession',
+                 'stock', 's&p', 'nasdaq', 'treasury', 'unemployment']),
+    ('technology', ['tech', 'ai', 'technology', 'software', 'apple', 'google', 'microsoft', 'openai',
+                    'nvidia', 'tesla']),
+]
+
+# Venue-provided categories mapped onto the shared taxonomy
+DEFAULT_ALIASES: Dict[str, str] = {
+    'politics': 'politics',
+    'elections': 'politics',
+    'crypto': 'cryptocurrency',
+    'cryptocurrency': 'cryptocurrency',
+    'tech': 'technology',
+    'technology': 'technology',
+    'science': 'technology',
+    'science and technology': 'technology',
+    'sports': 'sports',
+    'finance': 'finance',
+    'financials': 'finance',
+    'economics': 'finance',
+    'culture': 'other',
+    'climate': 'other',
+    'climate and weather': 'other'
+}
+
+DEFAULT_CATEGORY = 'other'
+RELOAD_CHECK_SECONDS = 30
+
+
+class Taxonomy:
+    """Classify markets with one compiled pattern and an LRU cache per (id, text)."""
+
+    def __init__(self, rules_path: Optional[str] = None, cache_size: int = 50000):
+        """
+        Initialize taxonomy.
+
+        Args:
+            rules_path: Optional JSON rules file ({"rules": [{"category", "keywords"}], "aliases": {}}),
+                re-read automatically when it changes
+            cache_size: Classifications kept in the LRU cache
+        """
+        self.rules_path = rules_path
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self.version = 0
+
+        self.reload()
+
+    def _compile(self, rules: List[Tuple[str, List[str]]], aliases: Dict[str, str]):
+        """Build the single alternation pattern and keyword -> category lookup."""
+        keyword_category: Dict[str, str] = {}
+        priority: Dict[str, int] = {}
+        for rank, (category, keywords) in enumerate(rules):
+            priority.setdefault(category, rank)
+            for keyword in keywords:
+                keyword_category.setdefault(keyword.lower(), category)
+
+        # Longest first so multi-word keywords win over their prefixes
+        alternation = '|'.join(re.escape(k) for k in sorted(keyword_category, key=len, reverse=True))
+        pattern = re.compile(rf"(?<![a-z0-9])(?:{alternation})s?(?![a-z0-9])") if keyword_category else None
+
+        return pattern, keyword_category, priority, {k.lower(): v for k, v in aliases.items()}
+
+    def reload(self, rules: Optional[List[Tuple[str, List[str]]]] = None, aliases: Optional[Dict[str, str]] = None):
+        """
+        Recompile rules and drop cached classifications.
+
+        Args:
+            rules: Ordered (category, keywords) pairs (default: rules_path or DEFAULT_RULES)
+            aliases: Venue category aliases (default: rules_path or DEFAULT_ALIASES)
+        """
+        if rules is None and self.rules_path and os.path.exists(self.rules_path):
+            try:
+                with open(self.rules_path) as f:
+                    data = json.load(f)
+                rules = [(r['category'], r['keywords']) for r in data.get('rules', [])]
+                aliases = data.get('aliases', aliases)
+                self._mtime = os.path.getmtime(self.rules_path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Error loading taxonomy rules from {self.rules_path}: {e}")
+                if self.version:
+                    return  # Keep the rules already loaded
+
+        compiled = self._compile(rules or DEFAULT_RULES, DEFAULT_ALIASES if aliases is None else aliases)
+
+        with self._lock:
+            self._pattern, self._keywords, self._priority, self._aliases = compiled
+            self._cache.clear()
+            self.version += 1
+
+        logger.info(f"Taxonomy v{self.version} compiled with {len(self._keywords)} keywords")
+
+    def _maybe_reload(self):
+        """Re-read the rules file if it changed (checked at most every RELOAD_CHECK_SECONDS)."""
+        if not self.rules_path:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_CHECK_SECONDS:
+            return
+        self._checked_at = now
+
+        try:
+            mtime = os.path.getmtime(self.rules_path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def match(self, text: str) -> str:
+        """
+        Classify free text in one pass over it.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Highest-priority matching category, or DEFAULT_CATEGORY
+        """
+        if not self._pattern or not text:
+            return DEFAULT_CATEGORY
+
+        best, best_rank = DEFAULT_CATEGORY, len(self._priority)
+        for found in self._pattern.finditer(text.lower()):
+            keyword = found.group()
+            category = self._keywords.get(keyword) or self._keywords.get(keyword[:-1])
+            rank = self._priority[category]
+            if rank < best_rank:
+                best, best_rank = category, rank
+                if rank == 0:
+                    break
+        return best
+
+    def classify(
+        self,
+        market_id: str,
+        title: str,
+        description: str = '',
+        venue_category: Optional[str] = None
+    ) -> str:
+        """
+        Classify a market, using the venue's own category when it maps onto the taxonomy.
+
+        Args:
+            market_id: Market id (cache key together with the text)
+            title: Market title/question
+            description: Market description
+            venue_category: Category reported by the venue, if any
+
+        Returns:
+            Category name
+        """
+        self._maybe_reload()
+
+        key = (market_id, hash((title, description, venue_category)))
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        category = self._aliases.get((venue_category or '').strip().lower())
+        if category is None:
+            category = self.match(f"{title} {description}")
+
+        with self._lock:
+            self._cache[key] = category
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return category
+
+
+_taxonomy: Optional[Taxonomy] = None
+
+
+def get_taxonomy() -> Taxonomy:
+    """
+    Get the process-wide taxonomy shared by every venue client.
+
+    Rules come from TAXONOMY_RULES_PATH when set, otherwise DEFAULT_RULES.
+
+    Returns:
+        Shared Taxonomy
+    """
+    global _taxonomy
+    if _taxonomy is None:
+        _taxonomy = Taxonomy(os.getenv("TAXONOMY_RULES_PATH"))
+    return _taxonomy
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    taxonomy = get_taxonomy()
+    for title in [
+        'Will Bitcoin reach $100k?',
+        'Who wins the 2028 presidential election?',
+        'Fed rate cut in March?',
+        'Will the method change?',  # 'eth' inside a word no longer matches
+        'NBA Finals champion'
+    ]:
+        print(f"{title!r}: {taxonomy.classify(title, title)}")
+    print(f"Kalshi 'Economics': {taxonomy.classify('KX', 'CPI above 3%', venue_category='Economics')}")
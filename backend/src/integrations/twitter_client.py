@@ -3,47 +3,41 @@ import os
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import logging
-from functools import wraps
-import time
 
 logger = logging.getLogger(__name__)
 
 # Import mock data generator
 try:
     from integrations.mock_data_generator import MockDataGenerator
+    from integrations.resilience import get_limiter, get_breaker, CircuitOpenError
+    from integrations.cassette import mount_session
+    from integrations.fetch_scheduler import run_sweep, run_blocking
 except ImportError:
     from .mock_data_generator import MockDataGenerator
+    from .resilience import get_limiter, get_breaker, CircuitOpenError
+    from .cassette import mount_session
+    from .fetch_scheduler import run_sweep, run_blocking
 
-
-def retry_with_backoff(max_retries=3, backoff_factor=2):
-    """Retry decorator with exponential backoff."""
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise
-                    wait_time = backoff_factor ** attempt
-                    logger.warning(f"Retry {attempt+1}/{max_retries} after {wait_time}s: {e}")
-                    time.sleep(wait_time)
-        return wrapper
-    return decorator
+PAGE_SIZE = 100        # Recent search maximum per request
+MAX_PAGES = 10         # next_token pages followed per query
+TOPIC_CONCURRENCY = 4
 
 
 class TwitterClient:
     """Client for fetching data from Twitter API with mock data fallback."""
 
-    def __init__(self, use_mock: bool = None):
+    def __init__(self, use_mock: bool = None, mock_on_failure: bool = False):
         """
         Initialize Twitter client.
 
         Args:
             use_mock: If True, use mock data. If None, auto-detect based on env var.
+            mock_on_failure: While the API is failing, serve mock tweets tagged
+                'synthetic' instead of returning no tweets
         """
         bearer_token = os.getenv("TWITTER_BEARER_TOKEN")
+        self.mock_on_failure = mock_on_failure
+        self.breaker = get_breaker('twitter')
 
         # Auto-detect mock mode
         if use_mock is None:
@@ -56,6 +50,7 @@ class TwitterClient:
             try:
                 import tweepy
                 self.client = tweepy.Client(bearer_token=bearer_token)
+                mount_session(self.client.session)
                 logger.info("Twitter client initialized with real API")
             except Exception as e:
                 logger.warning(f"Failed to initialize Twitter API, using mock mode: {e}")
@@ -75,7 +70,7 @@ class TwitterClient:
 
         Args:
             query: Search query (keywords, hashtags, etc.)
-            max_results: Maximum number of tweets to return (10-100)
+            max_results: Maximum number of tweets to return (pages of 100 are followed via next_token)
             hours_back: How many hours back to search
 
         Returns:
@@ -90,83 +85,132 @@ class TwitterClient:
                 hours_back=hours_back
             )
 
-        # Real API call
-        try:
-            import tweepy
-
-            # Calculate start time
-            start_time = datetime.utcnow() - timedelta(hours=hours_back)
-
-            # Search tweets
-            response = self.client.search_recent_tweets(
-                query=query,
-                max_results=min(max_results, 100),
-                start_time=start_time,
-                tweet_fields=['created_at', 'public_metrics', 'author_id', 'lang'],
-                expansions=['author_id'],
-                user_fields=['username', 'public_metrics', 'verified']
-            )
-
-            if not response.data:
-                logger.info(f"No tweets found for query: {query}")
-                return []
-
-            # Extract user data
-            users = {user.id: user for user in response.includes.get('users', [])} if response.includes else {}
-
-            # Process tweets
-            tweets = []
-            for tweet in response.data:
-                user = users.get(tweet.author_id)
-                tweets.append({
-                    'id': tweet.id,
-                    'text': tweet.text,
-                    'created_at': tweet.created_at,
-                    'likes': tweet.public_metrics['like_count'],
-                    'retweets': tweet.public_metrics['retweet_count'],
-                    'replies': tweet.public_metrics['reply_count'],
-                    'author_id': tweet.author_id,
-                    'author_username': user.username if user else None,
-                    'author_followers': user.public_metrics['followers_count'] if user else 0,
-                    'author_verified': user.verified if user else False,
-                    'language': tweet.lang,
-                    'platform': 'twitter'
-                })
+        tweets = []
+        start_time = datetime.utcnow() - timedelta(hours=hours_back)
+        next_token = None
 
-            logger.info(f"Fetched {len(tweets)} tweets for query: {query}")
-            return tweets
+        try:
+            # Follow next_token until enough tweets are collected
+            for _ in range(MAX_PAGES):
+                get_limiter('twitter').acquire()
+                response = self.breaker.call(
+                    self.client.search_recent_tweets,
+                    query=query,
+                    max_results=min(max(max_results - len(tweets), 10), PAGE_SIZE),
+                    start_time=start_time,
+                    next_token=next_token,
+                    tweet_fields=['created_at', 'public_metrics', 'author_id', 'lang'],
+                    expansions=['author_id'],
+                    user_fields=['username', 'public_metrics', 'verified']
+                )
+
+                tweets.extend(self._parse_response(response))
+                next_token = (response.meta or {}).get('next_token')
+                if not next_token or len(tweets) >= max_results:
+                    break
+
+        except CircuitOpenError:
+            logger.warning(f"Twitter circuit open, skipping query: {query}")
+            return tweets or self._degraded(query, max_results, hours_back)
 
         except Exception as e:
             logger.error(f"Error fetching tweets: {e}")
-            # Fallback to mock data
-            logger.warning("Falling back to mock data")
-            self.use_mock = True
+            return tweets or self._degraded(query, max_results, hours_back)
+
+        if not tweets:
+            logger.info(f"No tweets found for query: {query}")
+        else:
+            logger.info(f"Fetched {len(tweets)} tweets for query: {query}")
+        return tweets[:max_results]
+
+    @staticmethod
+    def _parse_response(response) -> List[Dict]:
+        """Normalize one page of search results."""
+        if not response.data:
+            return []
+
+        # Extract user data
+        users = {user.id: user for user in response.includes.get('users', [])} if response.includes else {}
+
+        tweets = []
+        for tweet in response.data:
+            user = users.get(tweet.author_id)
+            tweets.append({
+                'id': tweet.id,
+                'text': tweet.text,
+                'created_at': tweet.created_at,
+                'likes': tweet.public_metrics['like_count'],
+                'retweets': tweet.public_metrics['retweet_count'],
+                'replies': tweet.public_metrics['reply_count'],
+                'author_id': tweet.author_id,
+                'author_username': user.username if user else None,
+                'author_followers': user.public_metrics['followers_count'] if user else 0,
+                'author_verified': user.verified if user else False,
+                'language': tweet.lang,
+                'platform': 'twitter'
+            })
+        return tweets
+
+    def _degraded(self, query: str, max_results: int, hours_back: int) -> List[Dict]:
+        """Result while the API is failing: nothing, or mock tweets clearly tagged as synthetic."""
+        if not self.mock_on_failure:
+            return []
+
+        if self.mock_generator is None:
             self.mock_generator = MockDataGenerator()
-            return self.mock_generator.generate_mock_tweets(query, max_results, hours_back)
+        logger.warning(f"Serving synthetic tweets for query: {query}")
+        tweets = self.mock_generator.generate_mock_tweets(query, max_results, hours_back)
+        for tweet in tweets:
+            tweet['synthetic'] = True
+        return tweets
 
-    def fetch_topics_data(self, topics: List[str], hours_back: int = 24) -> Dict[str, List[Dict]]:
+    def fetch_topics_data(
+        self,
+        topics: List[str],
+        hours_back: int = 24,
+        max_results: int = 100,
+        concurrency: int = TOPIC_CONCURRENCY
+    ) -> Dict[str, List[Dict]]:
         """
-        Fetch tweets for multiple topics.
+        Fetch tweets for multiple topics (blocking; use fetch_topics_data_async inside an event loop).
 
         Args:
             topics: List of search topics/keywords
             hours_back: How many hours back to search
+            max_results: Tweets per topic (paginated past 100)
+            concurrency: Topics fetched at once
 
         Returns:
             Dictionary mapping topic to list of tweets
         """
-        results = {}
-        for topic in topics:
-            try:
-                tweets = self.search_recent_tweets(topic, max_results=100, hours_back=hours_back)
-                results[topic] = tweets
-                # Rate limiting delay
-                time.sleep(1)
-            except Exception as e:
-                logger.error(f"Error fetching tweets for topic '{topic}': {e}")
-                results[topic] = []
+        return run_blocking(
+            lambda: self.fetch_topics_data_async(topics, hours_back, max_results, concurrency),
+            'TwitterClient.fetch_topics_data'
+        )
+
+    async def fetch_topics_data_async(
+        self,
+        topics: List[str],
+        hours_back: int = 24,
+        max_results: int = 100,
+        concurrency: int = TOPIC_CONCURRENCY
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch tweets for several topics concurrently, paced by the shared twitter token bucket.
+
+        Args:
+            topics: List of search topics/keywords
+            hours_back: How many hours back to search
+            max_results: Tweets per topic (paginated past 100)
+            concurrency: Topics fetched at once (tweepy calls run in worker threads)
+
+        Returns:
+            Dictionary mapping topic to list of tweets, deduplicated by tweet id
+        """
+        def fetch(topic: str, _source: str) -> List[Dict]:
+            return self.search_recent_tweets(topic, max_results=max_results, hours_back=hours_back)
 
-        return results
+        return await run_sweep(topics, ['recent'], fetch, concurrency=concurrency)
 
     def get_trending_topics(self, location_id: int = 1) -> List[str]:
         """
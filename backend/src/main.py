@@ -1,9 +1,10 @@
 """Main FastAPI application for AI-Powered Mindshare Market Analyzer."""
+import os
 import logging
-from fastapi import FastAPI, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import asyncio
 from contextlib import asynccontextmanager
@@ -13,10 +14,19 @@ from models.database import MarketSchema, SentimentScoreSchema, PredictionSchema
 from services.sentiment_analyzer import SentimentAnalyzer, MindshareCalculator
 from services.semantic_matcher import SemanticMatcher
 from services.prediction_engine import PredictionEngine
+from services.prediction_scheduler import PredictionScheduler
+from services.accuracy_resolver import AccuracyResolver, price_history_probability
+from services.signal_index import SignalIndex, SIGNAL_STRENGTHS
+from services.mindshare_timeseries import MindshareTimeSeries, RESOLUTION_NAMES
+from services.mindshare_leaderboard import MindshareLeaderboard
+from services.market_sync import MarketSync, diff_markets, market_key
+from services.post_store import create_post_store
 from integrations.twitter_client import TwitterClient
 from integrations.reddit_client import RedditClient
 from integrations.kalshi_client import KalshiClient
 from integrations.polymarket_client import PolymarketClient
+from integrations.http_transport import close_async_client
+from integrations.resilience import breaker_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -29,6 +39,18 @@ logger = logging.getLogger(__name__)
 sentiment_analyzer = None
 semantic_matcher = None
 prediction_engine = None
+prediction_scheduler = None
+accuracy_resolver = None
+signal_index = SignalIndex()
+mindshare_series = MindshareTimeSeries()
+mindshare_leaderboard = MindshareLeaderboard(size=100)
+market_sync = MarketSync()
+post_store = create_post_store()
+LEADERBOARD_REFRESH_SECONDS = 60
+MARKET_REFRESH_SECONDS = int(os.getenv("MARKET_REFRESH_SECONDS", "300"))
+MARKET_ID_CHUNK = 500  # Ids per IN (...) clause
+LIVE_MARKET_FIELDS = ('current_probability', 'volume', 'close_time')  # Overlaid by /api/markets?live=true
+listed_markets: Dict[str, Set[Tuple[str, str]]] = {}  # Market keys in each venue's last full fetch
 
 # API clients
 twitter_client = None
@@ -64,17 +86,29 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up application...")
 
-    global sentiment_analyzer, semantic_matcher, prediction_engine
+    global sentiment_analyzer, semantic_matcher, prediction_engine, prediction_scheduler, accuracy_resolver
     global twitter_client, reddit_client, kalshi_client, polymarket_client
 
     # Initialize database
     init_db()
 
+    # Warm the in-memory signal index from stored predictions
+    db = next(get_db())
+    try:
+        signal_index.load_from_db(db)
+    except Exception as e:
+        logger.error(f"Error loading signal index: {e}")
+    finally:
+        db.close()
+
     # Initialize AI services
     try:
-        sentiment_analyzer = SentimentAnalyzer()
+        sentiment_analyzer = SentimentAnalyzer(post_store=post_store)
         semantic_matcher = SemanticMatcher()
         prediction_engine = PredictionEngine()
+        # One scheduler for topic analysis and market refreshes alike
+        prediction_scheduler = PredictionScheduler(prediction_engine)
+        market_sync.subscribe(prediction_scheduler.on_market_changes)
         logger.info("AI services initialized")
     except Exception as e:
         logger.error(f"Error initializing AI services: {e}")
@@ -89,10 +123,24 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error initializing API clients: {e}")
 
+    # Start background jobs
+    if kalshi_client:
+        accuracy_resolver = AccuracyResolver(
+            probability_source=price_history_probability(kalshi_client.history_store),
+            history_sync=kalshi_client.sync_market_history
+        )
+    else:
+        accuracy_resolver = AccuracyResolver()
+    accuracy_task = asyncio.create_task(accuracy_resolver.run_forever())
+    market_refresh_task = asyncio.create_task(market_refresh_loop())
+
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
+    accuracy_task.cancel()
+    market_refresh_task.cancel()
+    await close_async_client()
 
 
 # Create FastAPI app
@@ -125,14 +173,48 @@ async def root():
     }
 
 
+async def fetch_live_details(markets: List[Market]) -> Dict[Tuple[str, str], Dict]:
+    """
+    Fetch current venue details for stored markets, one bulk request set per venue.
+
+    Args:
+        markets: Market rows
+
+    Returns:
+        Details keyed by (platform, market_id); markets a venue reported errors for are left out
+    """
+    clients = {'kalshi': kalshi_client, 'polymarket': polymarket_client}
+    market_ids: Dict[str, List[str]] = {}
+    for market in markets:
+        if clients.get(market.platform):
+            market_ids.setdefault(market.platform, []).append(market.market_id)
+
+    platforms = list(market_ids)
+    responses = await asyncio.gather(
+        *(clients[platform].get_market_details_bulk(market_ids[platform]) for platform in platforms),
+        return_exceptions=True
+    )
+
+    details = {}
+    for platform, response in zip(platforms, responses):
+        if isinstance(response, Exception):
+            logger.error(f"Error fetching {platform} market details: {response}")
+            continue
+        if response['errors']:
+            logger.warning(f"No {platform} details for {len(response['errors'])} markets")
+        details.update(((platform, market_id), d) for market_id, d in response['results'].items())
+    return details
+
+
 @app.get("/api/markets", response_model=List[MarketSchema])
 async def get_markets(
     platform: Optional[str] = None,
     category: Optional[str] = None,
     limit: int = 50,
+    live: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get prediction markets."""
+    """Get prediction markets, optionally with current prices from the venues."""
     query = db.query(Market)
 
     if platform:
@@ -141,7 +223,31 @@ async def get_markets(
         query = query.filter(Market.category == category)
 
     markets = query.order_by(Market.volume.desc()).limit(limit).all()
-    return markets
+    if not live:
+        return markets
+
+    # A page of markets costs a few bulk requests per venue, not one request per market
+    details = await fetch_live_details(markets)
+    enriched = []
+    for market in markets:
+        schema = MarketSchema.model_validate(market)
+        current = details.get((market.platform, market.market_id), {})
+        enriched.append(schema.model_copy(update={
+            field: current[field] for field in LIVE_MARKET_FIELDS if current.get(field) is not None
+        }))
+    return enriched
+
+
+@app.get("/api/markets/changes")
+async def get_market_changes(since: int = 0):
+    """Get market change sets recorded after a sequence number."""
+    changes = market_sync.changes_since(since)
+
+    return {
+        "sequence": market_sync.sequence,
+        "resync": changes is None,
+        "changes": changes or []
+    }
 
 
 @app.get("/api/markets/{market_id}")
@@ -186,6 +292,45 @@ async def get_sentiment(
     }
 
 
+@app.get("/api/mindshare/leaderboard")
+async def get_mindshare_leaderboard(limit: int = 20):
+    """Get topics ranked by current mindshare."""
+    updated_at = mindshare_leaderboard.updated_at
+    if not updated_at or (datetime.utcnow() - updated_at).total_seconds() >= LEADERBOARD_REFRESH_SECONDS:
+        mindshare_leaderboard.refresh_from_timeseries(mindshare_series)
+
+    return {
+        "updated_at": mindshare_leaderboard.updated_at,
+        "topics_tracked": len(mindshare_series.topics()),
+        "leaderboard": mindshare_leaderboard.top(limit)
+    }
+
+
+@app.get("/api/mindshare/{topic}")
+async def get_mindshare_trend(
+    topic: str,
+    resolution: str = '1h',
+    window_hours: int = 1,
+    hours_back: int = 24
+):
+    """Get mindshare, velocity, acceleration and trend buckets from the rollups."""
+    if resolution not in RESOLUTION_NAMES:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {', '.join(RESOLUTION_NAMES)}")
+    if topic not in mindshare_series.topics():
+        raise HTTPException(status_code=404, detail="No mindshare data found for topic")
+
+    window = timedelta(hours=window_hours)
+    return {
+        **mindshare_series.summary(topic, window),
+        "resolution": resolution,
+        "trend": mindshare_series.series(
+            topic,
+            resolution,
+            start=datetime.utcnow() - timedelta(hours=hours_back)
+        )
+    }
+
+
 @app.get("/api/predictions", response_model=List[PredictionSchema])
 async def get_predictions(
     confidence_level: Optional[str] = None,
@@ -202,6 +347,26 @@ async def get_predictions(
     return predictions
 
 
+@app.get("/api/signals")
+async def get_signals(
+    strength: str = 'strong',
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Get top prediction signals for a strength bucket, highest score first."""
+    if strength not in SIGNAL_STRENGTHS:
+        raise HTTPException(status_code=400, detail=f"strength must be one of {', '.join(SIGNAL_STRENGTHS)}")
+
+    return {
+        "strength": strength,
+        "total": signal_index.count(strength, db),
+        "offset": offset,
+        "limit": limit,
+        "signals": signal_index.top(strength, limit=limit, offset=offset, db=db)
+    }
+
+
 @app.get("/api/alerts", response_model=List[AlertSchema])
 async def get_alerts(
     unread_only: bool = False,
@@ -218,78 +383,198 @@ async def get_alerts(
     return alerts
 
 
+@app.get("/api/jobs/accuracy")
+async def get_accuracy_job_metrics():
+    """Get throughput and backlog metrics for the accuracy resolution job."""
+    if not accuracy_resolver:
+        raise HTTPException(status_code=503, detail="Accuracy resolver not running")
+    return accuracy_resolver.metrics
+
+
+def record_predictions(db: Session, predictions: List[Dict], market_pks: Dict[str, int]) -> List[Dict]:
+    """
+    Store newly computed predictions and index them for /api/signals.
+
+    Each prediction gets its row id set in place, so the scheduler's stored
+    copy carries it when the prediction is reused for an unchanged market.
+
+    Args:
+        db: SQLAlchemy session
+        predictions: Predictions from PredictionScheduler.run_pending
+        market_pks: Venue market id to Market primary key
+
+    Returns:
+        The predictions that were stored
+    """
+    stored = []
+    for prediction in predictions:
+        market_pk = market_pks.get(prediction.get('market_id'))
+        if market_pk is None:
+            continue
+        prediction['id'] = signal_index.record(db, market_pk, prediction).id
+        stored.append(prediction)
+    return stored
+
+
+async def fetch_catalog(platform: str, client) -> Optional[List[Dict]]:
+    """
+    Page through every open market a venue lists.
+
+    Args:
+        platform: Venue name for logging
+        client: KalshiClient or PolymarketClient
+
+    Returns:
+        Markets, or None if pagination failed part-way
+    """
+    if not client:
+        return None
+    try:
+        return [market async for market in client.iter_markets_async()]
+    except Exception as e:
+        logger.error(f"Error fetching the {platform} catalog: {e}")
+        return None
+
+
+async def sync_market_rows(db: Session) -> Dict:
+    """
+    Refresh market rows from the full Kalshi and Polymarket catalogs, writing only changed rows.
+
+    Every fetched market gets observed_at set, changed or not, so accuracy
+    resolution knows how recent each stored price is. Markets listed in a
+    venue's previous full fetch but missing from this one are published as
+    removed; their rows are kept for the predictions that reference them.
+
+    Args:
+        db: SQLAlchemy session
+
+    Returns:
+        Refresh summary
+    """
+    # Page through both venues concurrently; a venue whose fetch failed is left untouched
+    catalogs = dict(zip(('kalshi', 'polymarket'), await asyncio.gather(
+        fetch_catalog('kalshi', kalshi_client),
+        fetch_catalog('polymarket', polymarket_client)
+    )))
+
+    # Offset pages can shift under a changing catalog, so keep the first copy of each market
+    fresh = []
+    seen = {platform: set() for platform, markets in catalogs.items() if markets is not None}
+    for platform, keys in seen.items():
+        for market_data in catalogs[platform]:
+            key = market_key(market_data)
+            if key not in keys:
+                keys.add(key)
+                fresh.append(market_data)
+
+    # Stored fingerprints of the fetched markets only
+    market_ids = [m['market_id'] for m in fresh]
+    existing = []
+    for start in range(0, len(market_ids), MARKET_ID_CHUNK):
+        existing.extend(db.query(
+            Market.id, Market.platform, Market.market_id, Market.fingerprint
+        ).filter(Market.market_id.in_(market_ids[start:start + MARKET_ID_CHUNK])).all())
+
+    row_ids = {(row.platform, row.market_id): row.id for row in existing}
+    diff = diff_markets({(row.platform, row.market_id): row.fingerprint for row in existing}, fresh)
+    now = datetime.utcnow()
+
+    for market_data in diff['inserted']:
+        db.add(Market(
+            platform=market_data['platform'],
+            market_id=market_data['market_id'],
+            title=market_data['title'],
+            description=market_data.get('description', ''),
+            category=market_data.get('category', ''),
+            current_probability=market_data.get('current_probability', 0.5),
+            volume=market_data.get('volume', 0),
+            close_time=market_data.get('close_time'),
+            metadata=market_data.get('metadata', {}),
+            fingerprint=diff['fingerprints'][market_key(market_data)],
+            observed_at=now
+        ))
+
+    db.bulk_update_mappings(Market, [
+        {
+            'id': row_ids[market_key(market_data)],
+            'current_probability': market_data.get('current_probability', 0.5),
+            'volume': market_data.get('volume', 0),
+            'close_time': market_data.get('close_time'),
+            'fingerprint': diff['fingerprints'][market_key(market_data)],
+            'updated_at': now,
+            'observed_at': now
+        }
+        for market_data in diff['updated']
+    ])
+
+    # Unchanged markets were still seen at their stored price
+    changed = {market_key(m) for m in diff['inserted'] + diff['updated']}
+    unchanged_ids = [row_id for key, row_id in row_ids.items() if key not in changed]
+    for start in range(0, len(unchanged_ids), MARKET_ID_CHUNK):
+        db.query(Market).filter(
+            Market.id.in_(unchanged_ids[start:start + MARKET_ID_CHUNK])
+        ).update({Market.observed_at: now}, synchronize_session=False)
+
+    db.commit()
+
+    removed = []
+    for platform, keys in seen.items():
+        removed.extend(
+            {'platform': key[0], 'market_id': key[1]}
+            for key in listed_markets.get(platform, set()) - keys
+        )
+        listed_markets[platform] = keys
+
+    changes = market_sync.publish(diff['inserted'], diff['updated'], removed, diff['unchanged'])
+
+    # Re-predict markets whose price or volume moved under an analyzed topic
+    repredicted = []
+    if prediction_scheduler and prediction_scheduler.pending:
+        repredicted = record_predictions(
+            db,
+            prediction_scheduler.run_pending(),
+            {market_id: row_id for (_platform, market_id), row_id in row_ids.items()}
+        )
+
+    return {
+        "status": "success",
+        "new_markets": len(diff['inserted']),
+        "updated_markets": len(diff['updated']),
+        "removed_markets": len(removed),
+        "unchanged_markets": diff['unchanged'],
+        "repredicted": len(repredicted),
+        "sequence": changes['sequence'],
+        "total_markets": db.query(Market).count()
+    }
+
+
+async def market_refresh_loop(interval_seconds: int = MARKET_REFRESH_SECONDS):
+    """
+    Refresh market rows on a fixed interval.
+
+    Keeps stored prices observed within the accuracy resolver's tolerance
+    of each prediction's horizon end without waiting for a manual refresh.
+
+    Args:
+        interval_seconds: Delay between refreshes
+    """
+    while True:
+        db = next(get_db())
+        try:
+            await sync_market_rows(db)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error in scheduled market refresh: {e}")
+        finally:
+            db.close()
+        await asyncio.sleep(interval_seconds)
+
+
 @app.post("/api/refresh-markets")
 async def refresh_markets(db: Session = Depends(get_db)):
-    """Refresh market data from Kalshi and Polymarket."""
+    """Refresh market data from Kalshi and Polymarket, writing only changed rows."""
     try:
-        new_markets = []
-
-        # Fetch from Kalshi
-        if kalshi_client:
-            kalshi_markets = kalshi_client.get_markets(limit=100)
-            for market_data in kalshi_markets:
-                market = Market(
-                    platform=market_data['platform'],
-                    market_id=market_data['market_id'],
-                    title=market_data['title'],
-                    description=market_data.get('description', ''),
-                    category=market_data.get('category', ''),
-                    current_probability=market_data.get('current_probability', 0.5),
-                    volume=market_data.get('volume', 0),
-                    close_time=market_data.get('close_time'),
-                    metadata=market_data.get('metadata', {})
-                )
-
-                # Check if exists
-                existing = db.query(Market).filter(
-                    Market.market_id == market.market_id
-                ).first()
-
-                if existing:
-                    # Update existing
-                    existing.current_probability = market.current_probability
-                    existing.volume = market.volume
-                    existing.updated_at = datetime.utcnow()
-                else:
-                    # Add new
-                    db.add(market)
-                    new_markets.append(market)
-
-        # Fetch from Polymarket
-        if polymarket_client:
-            poly_markets = polymarket_client.get_markets(limit=100)
-            for market_data in poly_markets:
-                market = Market(
-                    platform=market_data['platform'],
-                    market_id=market_data['market_id'],
-                    title=market_data['title'],
-                    description=market_data.get('description', ''),
-                    category=market_data.get('category', ''),
-                    current_probability=market_data.get('current_probability', 0.5),
-                    volume=market_data.get('volume', 0),
-                    close_time=market_data.get('close_time'),
-                    metadata=market_data.get('metadata', {})
-                )
-
-                existing = db.query(Market).filter(
-                    Market.market_id == market.market_id
-                ).first()
-
-                if existing:
-                    existing.current_probability = market.current_probability
-                    existing.volume = market.volume
-                    existing.updated_at = datetime.utcnow()
-                else:
-                    db.add(market)
-                    new_markets.append(market)
-
-        db.commit()
-
-        return {
-            "status": "success",
-            "new_markets": len(new_markets),
-            "total_markets": db.query(Market).count()
-        }
+        return await sync_market_rows(db)
 
     except Exception as e:
         logger.error(f"Error refreshing markets: {e}")
@@ -308,11 +593,12 @@ async def analyze_topic(
         twitter_posts = []
         reddit_posts = []
 
+        # Both clients block on their rate limiters, so keep them off the event loop
         if twitter_client:
-            twitter_posts = twitter_client.search_recent_tweets(topic, hours_back=hours_back)
+            twitter_posts = await asyncio.to_thread(twitter_client.search_recent_tweets, topic, hours_back=hours_back)
 
         if reddit_client:
-            reddit_posts = reddit_client.search_posts(topic, time_filter='day')
+            reddit_posts = await asyncio.to_thread(reddit_client.search_posts, topic, time_filter='day')
 
         all_posts = twitter_posts + reddit_posts
 
@@ -321,7 +607,8 @@ async def analyze_topic(
 
         # Analyze sentiment
         if sentiment_analyzer:
-            sentiment_metrics = sentiment_analyzer.analyze_social_posts(all_posts)
+            # Model inference and post store writes are blocking
+            sentiment_metrics = await asyncio.to_thread(sentiment_analyzer.analyze_social_posts, all_posts)
 
             # Save sentiment score
             sentiment_record = SentimentScore(
@@ -335,6 +622,13 @@ async def analyze_topic(
             db.add(sentiment_record)
             db.commit()
 
+            mindshare_series.record(
+                topic,
+                sentiment_metrics['sentiment_score'],
+                sentiment_metrics['mention_count'],
+                sentiment_metrics['engagement_score']
+            )
+
         # Match to markets
         markets = db.query(Market).all()
         topic_description = semantic_matcher.create_topic_description(all_posts) if semantic_matcher else ""
@@ -347,12 +641,39 @@ async def analyze_topic(
                 [m.__dict__ for m in markets]
             )
 
+        # Predict shifts for matched markets; storing them also feeds /api/signals
+        predictions = []
+        if prediction_scheduler and sentiment_analyzer and matches:
+            previous = db.query(SentimentScore).filter(
+                SentimentScore.topic == topic,
+                SentimentScore.id != sentiment_record.id
+            ).order_by(SentimentScore.timestamp.desc()).first()
+
+            sentiment_data = {
+                'current_score': sentiment_metrics['sentiment_score'],
+                'previous_score': previous.sentiment_score if previous else 0.0,
+                'mention_count': sentiment_metrics['mention_count'],
+                'historical_avg_volume': previous.mention_count if previous and previous.mention_count else 100
+            }
+            # Only markets whose inputs changed are recomputed and stored;
+            # the rest reuse their stored predictions
+            for market, _similarity in matches:
+                prediction_scheduler.observe(sentiment_data, market)
+            record_predictions(
+                db,
+                prediction_scheduler.run_pending(),
+                {market['market_id']: market['id'] for market, _similarity in matches}
+            )
+            for market, _similarity in matches:
+                predictions.extend(prediction_scheduler.get_predictions(market['market_id']))
+
         return {
             "topic": topic,
             "sentiment": sentiment_metrics if sentiment_analyzer else {},
             "matched_markets": [
                 {"market": m[0], "similarity": m[1]} for m in matches
-            ]
+            ],
+            "predictions": predictions
         }
 
     except Exception as e:
@@ -388,7 +709,8 @@ async def health_check():
             "reddit_client": reddit_client is not None,
             "kalshi_client": kalshi_client is not None,
             "polymarket_client": polymarket_client is not None
-        }
+        },
+        "circuit_breakers": breaker_metrics()
     }
 
 
@@ -1,15 +1,20 @@
 """Database models and connection setup."""
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, JSON, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, JSON, ForeignKey, Index
+from sqlalchemy import inspect, text, false
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.schema import CreateColumn
 from pydantic import BaseModel
 import os
+import logging
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database setup - use SQLite for local development if PostgreSQL not available
 USE_SQLITE = os.getenv('USE_SQLITE', 'true').lower() == 'true'
 
@@ -43,6 +48,8 @@ class Market(Base):
     volume = Column(Float)
     close_time = Column(DateTime)
     metadata = Column(JSON)
+    fingerprint = Column(String(16))  # Hash of fields checked by delta sync
+    observed_at = Column(DateTime, nullable=True)  # Last refresh that saw the market, changed or not
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -92,17 +99,31 @@ class Prediction(Base):
     market_id = Column(Integer, ForeignKey("markets.id"))
     predicted_shift = Column(Float)  # Percentage points
     confidence_level = Column(String)  # 'high', 'medium', 'low'
+    confidence_score = Column(Float, nullable=True)
+    signal_strength = Column(String, index=True)  # 'strong', 'moderate', 'weak'
+    signal_score = Column(Float, nullable=True)  # Ranking key within a strength
     reasoning = Column(String)
     time_horizon = Column(String)  # '1h', '6h', '24h'
+    initial_probability = Column(Float, nullable=True)  # Market probability at prediction time
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     # Accuracy tracking
     actual_shift = Column(Float, nullable=True)
+    accuracy_score = Column(Float, nullable=True)
+    direction_correct = Column(Boolean, nullable=True)
     accuracy_calculated = Column(Boolean, default=False)
+    accuracy_skipped = Column(Boolean, default=False, server_default=false())  # Can never be scored
 
     # Relationships
     market = relationship("Market", back_populates="predictions")
 
+    __table_args__ = (
+        # Keyset scans over pending (unresolved, unskipped) predictions
+        Index('ix_predictions_pending', 'accuracy_calculated', 'accuracy_skipped', 'id'),
+        # Top-N signal lookups per strength
+        Index('ix_predictions_signal', 'signal_strength', 'signal_score'),
+    )
+
 
 class BlockchainProof(Base):
     """On-chain verification proofs."""
@@ -170,6 +191,9 @@ class PredictionSchema(BaseModel):
     reasoning: str
     time_horizon: str
     created_at: datetime
+    confidence_score: Optional[float] = None
+    signal_strength: Optional[str] = None
+    signal_score: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -188,10 +212,39 @@ class AlertSchema(BaseModel):
         from_attributes = True
 
 
+def _add_missing_columns():
+    """
+    Bring existing tables up to the current models.
+
+    create_all only creates missing tables, so columns and indexes added to
+    a model later are created here. New columns are nullable (or carry a
+    server default), so existing rows stay valid.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                logger.info(f"Added column {table.name}.{column.name}")
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 # Create tables
 def init_db():
-    """Initialize database tables."""
+    """Initialize database tables, adding columns introduced since they were created."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
 
 
 def get_db():
@@ -0,0 +1,305 @@
+"""Background job that resolves the accuracy of stored predictions."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from sqlalchemy import and_, or_
+
+from models.database import SessionLocal, Market, Prediction
+from integrations.price_history import PRICE_SCALE
+from services.prediction_engine import PredictionEngine, HORIZON_HOURS
+
+logger = logging.getLogger(__name__)
+
+# (market ids, horizon end times) -> probabilities, NaN where unknown
+ProbabilitySource = Callable[[object, List[int], List[datetime]], np.ndarray]
+
+# How far from horizon end an observed price still counts as the price at horizon end
+OBSERVATION_TOLERANCE = timedelta(minutes=30)
+
+# Predictions still unobservable this long after horizon end are skipped
+EXPIRE_AFTER = timedelta(hours=24)
+
+
+def stored_market_probability(db, market_ids: List[int], horizon_ends: List[datetime]) -> np.ndarray:
+    """
+    Look up the probability at horizon end from the Market table.
+
+    The table only holds each market's latest price, so it is used only while
+    the market was last observed by a refresh (observed_at, which every
+    refresh sets whether or not the market changed) within
+    OBSERVATION_TOLERANCE after the horizon end. Later observations no longer
+    say anything about the price at horizon end; such predictions need a
+    history source (see price_history_probability) or expire.
+
+    Args:
+        db: SQLAlchemy session
+        market_ids: Market primary keys
+        horizon_ends: Horizon end time per prediction
+
+    Returns:
+        Probability per prediction, NaN where not observable
+    """
+    rows = db.query(Market.id, Market.current_probability, Market.observed_at, Market.updated_at).filter(
+        Market.id.in_(set(market_ids))
+    ).all()
+    markets = {row.id: row for row in rows}
+
+    result = np.full(len(market_ids), np.nan)
+    for i, (market_id, horizon_end) in enumerate(zip(market_ids, horizon_ends)):
+        market = markets.get(market_id)
+        if market is None or market.current_probability is None:
+            continue
+        observed_at = market.observed_at or market.updated_at
+        if observed_at and horizon_end <= observed_at <= horizon_end + OBSERVATION_TOLERANCE:
+            result[i] = market.current_probability
+    return result
+
+
+def price_history_probability(history_store, fallback: ProbabilitySource = stored_market_probability) -> ProbabilitySource:
+    """
+    Build a source reading the price at horizon end from Kalshi price history.
+
+    Uses the mid of the last stored point in the OBSERVATION_TOLERANCE window
+    before horizon end; markets without history there use `fallback`.
+    Points outside 0-1 after scaling are ignored.
+
+    Args:
+        history_store: PriceHistoryStore (integer-cent prices, see PRICE_SCALE; Unix-second timestamps)
+        fallback: Source for markets the store cannot answer
+
+    Returns:
+        Probability source
+    """
+    tolerance = int(OBSERVATION_TOLERANCE.total_seconds())
+
+    def source(db, market_ids: List[int], horizon_ends: List[datetime]) -> np.ndarray:
+        rows = db.query(Market.id, Market.platform, Market.market_id).filter(
+            Market.id.in_(set(market_ids))
+        ).all()
+        tickers = {row.id: row.market_id for row in rows if row.platform == 'kalshi'}
+
+        result = fallback(db, market_ids, horizon_ends)
+        for i, (market_id, horizon_end) in enumerate(zip(market_ids, horizon_ends)):
+            ticker = tickers.get(market_id)
+            if not ticker:
+                continue
+            end = int((horizon_end - datetime(1970, 1, 1)).total_seconds())
+            points = history_store.range(ticker, end - tolerance, end)
+            if len(points['ts']):
+                mid = (points['yes_bid'][-1] + points['yes_ask'][-1]) / 2 / PRICE_SCALE
+                if 0.0 <= mid <= 1.0:
+                    result[i] = mid
+        return result
+
+    return source
+
+
+class AccuracyResolver:
+    """Resolve actual shifts and accuracy for predictions whose horizon has elapsed."""
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        probability_source: ProbabilitySource = stored_market_probability,
+        chunk_size: int = 500,
+        expire_after: timedelta = EXPIRE_AFTER,
+        history_sync: Optional[Callable[[str], int]] = None,
+        max_history_syncs: int = 50
+    ):
+        """
+        Initialize resolver.
+
+        Args:
+            session_factory: Callable returning a new SQLAlchemy session
+            probability_source: Lookup for market probability at horizon end
+            chunk_size: Predictions resolved per transaction
+            expire_after: Skip predictions still unobservable this long after horizon end
+            history_sync: Fetches new price history for a Kalshi ticker (e.g.
+                KalshiClient.sync_market_history); run before each pass for
+                markets with due predictions
+            max_history_syncs: Tickers synced per pass
+        """
+        self.session_factory = session_factory
+        self.probability_source = probability_source
+        self.chunk_size = chunk_size
+        self.expire_after = expire_after
+        self.history_sync = history_sync
+        self.max_history_syncs = max_history_syncs
+        self.metrics = {
+            'passes': 0,
+            'resolved_total': 0,
+            'skipped_total': 0,
+            'pending_last_pass': 0,
+            'backlog': None,
+            'last_pass_seconds': None,
+            'last_pass_rows_per_second': None,
+            'last_run_at': None,
+            'last_error': None
+        }
+
+    @staticmethod
+    def _due_filter(now: datetime):
+        """SQL filter for unresolved, unskipped predictions whose horizon has elapsed."""
+        return and_(
+            Prediction.accuracy_calculated == False,  # noqa: E712
+            Prediction.accuracy_skipped == False,  # noqa: E712
+            or_(*[
+                and_(
+                    Prediction.time_horizon == horizon,
+                    Prediction.created_at <= now - timedelta(hours=hours)
+                )
+                for horizon, hours in HORIZON_HOURS.items()
+            ])
+        )
+
+    def _sync_due_history(self, db, now: datetime) -> int:
+        """Pull price history for Kalshi markets that have predictions waiting on a horizon-end price."""
+        if self.history_sync is None:
+            return 0
+
+        tickers = db.query(Market.market_id).join(Prediction, Prediction.market_id == Market.id).filter(
+            self._due_filter(now),
+            Market.platform == 'kalshi'
+        ).distinct().limit(self.max_history_syncs).all()
+
+        synced = 0
+        for (ticker,) in tickers:
+            try:
+                self.history_sync(ticker)
+                synced += 1
+            except Exception as e:
+                logger.error(f"Error syncing price history for {ticker}: {e}")
+        return synced
+
+    def _resolve_chunk(self, db, rows: List, now: datetime) -> Dict[str, int]:
+        """Compute accuracy for one chunk and bulk-update the resolved and skipped rows."""
+        # Predictions without a starting probability can never be scored; they are
+        # flagged as skipped, not resolved, so they never count as scored predictions
+        skipped = [row for row in rows if row.initial_probability is None]
+        scorable = [row for row in rows if row.initial_probability is not None]
+
+        updates = [{'id': row.id, 'accuracy_skipped': True} for row in skipped]
+        resolved = 0
+        pending = 0
+
+        if scorable:
+            horizon_ends = [
+                row.created_at + timedelta(hours=HORIZON_HOURS[row.time_horizon])
+                for row in scorable
+            ]
+            final_prob = self.probability_source(db, [row.market_id for row in scorable], horizon_ends)
+            known = ~np.isnan(final_prob)
+
+            predicted = np.array([row.predicted_shift or 0.0 for row in scorable])
+            initial = np.array([row.initial_probability for row in scorable])
+            accuracy = PredictionEngine.calculate_accuracy_arrays(predicted, initial, final_prob)
+
+            for i in np.flatnonzero(known):
+                updates.append({
+                    'id': scorable[i].id,
+                    'actual_shift': round(float(accuracy['actual_shift'][i]), 2),
+                    'accuracy_score': round(float(accuracy['accuracy_score'][i]), 3),
+                    'direction_correct': bool(accuracy['direction_correct'][i]),
+                    'accuracy_calculated': True
+                })
+            resolved = int(known.sum())
+
+            # No price at horizon end turned up in time: stop retrying
+            for i in np.flatnonzero(~known):
+                if now - horizon_ends[i] >= self.expire_after:
+                    updates.append({'id': scorable[i].id, 'accuracy_skipped': True})
+                    skipped.append(scorable[i])
+                else:
+                    pending += 1
+
+        if updates:
+            db.bulk_update_mappings(Prediction, updates)
+        db.commit()
+
+        return {
+            'resolved': resolved,
+            'skipped': len(skipped),
+            'pending': pending
+        }
+
+    def run_once(self, now: Optional[datetime] = None) -> Dict:
+        """
+        Run one resolution pass over all due predictions.
+
+        Rows are walked in primary-key order with keyset pagination and each
+        chunk is committed separately, so no long-lived locks are held.
+
+        Args:
+            now: Reference time (defaults to utcnow)
+
+        Returns:
+            Summary of this pass
+        """
+        now = now or datetime.utcnow()
+        started = datetime.utcnow()
+        totals = {'resolved': 0, 'skipped': 0, 'pending': 0}
+        last_id = 0
+
+        db = self.session_factory()
+        try:
+            self._sync_due_history(db, now)
+
+            due = self._due_filter(now)
+            while True:
+                rows = db.query(
+                    Prediction.id,
+                    Prediction.market_id,
+                    Prediction.predicted_shift,
+                    Prediction.initial_probability,
+                    Prediction.time_horizon,
+                    Prediction.created_at
+                ).filter(due, Prediction.id > last_id).order_by(Prediction.id).limit(self.chunk_size).all()
+
+                if not rows:
+                    break
+
+                for key, value in self._resolve_chunk(db, rows, now).items():
+                    totals[key] += value
+                last_id = rows[-1].id
+
+            backlog = db.query(Prediction.id).filter(self._due_filter(datetime.utcnow())).count()
+            self.metrics['last_error'] = None
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error resolving prediction accuracy: {e}")
+            self.metrics['last_error'] = str(e)
+            backlog = self.metrics['backlog']
+        finally:
+            db.close()
+
+        elapsed = (datetime.utcnow() - started).total_seconds()
+        processed = totals['resolved'] + totals['skipped']
+
+        self.metrics['passes'] += 1
+        self.metrics['resolved_total'] += totals['resolved']
+        self.metrics['skipped_total'] += totals['skipped']
+        self.metrics['pending_last_pass'] = totals['pending']
+        self.metrics['backlog'] = backlog
+        self.metrics['last_pass_seconds'] = round(elapsed, 3)
+        self.metrics['last_pass_rows_per_second'] = round(processed / elapsed, 1) if elapsed > 0 else None
+        self.metrics['last_run_at'] = now.isoformat()
+
+        logger.info(
+            f"Accuracy pass: {totals['resolved']} resolved, {totals['skipped']} skipped, "
+            f"{totals['pending']} awaiting market data, backlog {backlog}"
+        )
+        return totals
+
+    async def run_forever(self, interval_seconds: int = 300):
+        """
+        Run resolution passes on a fixed interval without blocking the event loop.
+
+        Args:
+            interval_seconds: Delay between passes
+        """
+        while True:
+            await asyncio.to_thread(self.run_once)
+            await asyncio.sleep(interval_seconds)
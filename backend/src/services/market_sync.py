@@ -0,0 +1,243 @@
+"""Delta synchronization of market snapshots with change sets."""
+import hashlib
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fields whose change makes a market "updated"
+FINGERPRINT_FIELDS = ('current_probability', 'volume', 'status', 'close_time')
+
+
+def market_key(market: Dict) -> Tuple[str, str]:
+    """Identity of a normalized market across refreshes."""
+    return (market.get('platform', ''), str(market.get('market_id')))
+
+
+def fingerprint(market: Dict) -> str:
+    """
+    Hash the fields of a normalized market that matter for change detection.
+
+    Args:
+        market: Normalized market dictionary
+
+    Returns:
+        16-character hex digest
+    """
+    values = []
+    for field in FINGERPRINT_FIELDS:
+        value = market.get(field)
+        if isinstance(value, float):
+            value = round(value, 6)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        values.append(value)
+    return hashlib.blake2b(repr(values).encode(), digest_size=8).hexdigest()
+
+
+def diff_markets(previous: Dict[Tuple[str, str], str], fresh: Iterable[Dict]) -> Dict:
+    """
+    Diff a fresh fetch against known fingerprints.
+
+    A known market with a None fingerprint (e.g. a row stored before
+    fingerprints existed) counts as updated, never as inserted.
+
+    Args:
+        previous: Market key -> fingerprint of the current state (None if unknown)
+        fresh: Normalized markets from the latest fetch
+
+    Returns:
+        Dict with inserted/updated markets, removed keys, unchanged count
+        and the fingerprints of the fresh fetch
+    """
+    inserted, updated = [], []
+    fingerprints = {}
+
+    for market in fresh:
+        key = market_key(market)
+        if key in fingerprints:
+            continue
+        digest = fingerprint(market)
+        fingerprints[key] = digest
+
+        if key not in previous:
+            inserted.append(market)
+        elif previous[key] != digest:
+            updated.append(market)
+
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'removed': [key for key in previous if key not in fingerprints],
+        'unchanged': len(fingerprints) - len(inserted) - len(updated),
+        'fingerprints': fingerprints
+    }
+
+
+class MarketSync:
+    """In-memory market state updated by deltas, with a bounded change log."""
+
+    def __init__(self, history: int = 100):
+        """
+        Initialize market sync.
+
+        Args:
+            history: Number of change sets kept for changes_since()
+        """
+        self._markets: Dict[Tuple[str, str], Dict] = {}
+        self._fingerprints: Dict[Tuple[str, str], str] = {}
+        self._changes: deque = deque(maxlen=history)
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self.sequence = 0
+
+    def apply(self, fresh: List[Dict], remove_missing: bool = True, source: str = 'refresh') -> Dict:
+        """
+        Apply a fresh fetch, touching only markets that changed.
+
+        Args:
+            fresh: Normalized markets from the latest fetch
+            remove_missing: Drop known markets absent from the fetch
+            source: What produced the change set ('refresh', or 'ticks' for
+                price-only updates from a live feed)
+
+        Returns:
+            Change set (see publish)
+        """
+        diff = diff_markets(self._fingerprints, fresh)
+
+        for market in diff['inserted'] + diff['updated']:
+            key = market_key(market)
+            self._markets[key] = market
+            self._fingerprints[key] = diff['fingerprints'][key]
+
+        removed = []
+        if remove_missing:
+            for key in diff['removed']:
+                removed.append(self._markets.pop(key))
+                del self._fingerprints[key]
+
+        return self.publish(diff['inserted'], diff['updated'], removed, diff['unchanged'], source)
+
+    def publish(
+        self,
+        inserted: List[Dict],
+        updated: List[Dict],
+        removed: List[Dict],
+        unchanged: int = 0,
+        source: str = 'refresh'
+    ) -> Dict:
+        """
+        Record a change set and notify subscribers.
+
+        Empty change sets are returned but not logged or broadcast.
+
+        Args:
+            inserted: New markets
+            updated: Markets whose fingerprint changed
+            removed: Markets no longer listed
+            unchanged: Number of markets seen without changes
+            source: What produced the change set (see apply)
+
+        Returns:
+            Change set with sequence, timestamp, source, inserted, updated, removed, unchanged
+        """
+        changes = {
+            'sequence': self.sequence,
+            'timestamp': datetime.utcnow(),
+            'source': source,
+            'inserted': inserted,
+            'updated': updated,
+            'removed': removed,
+            'unchanged': unchanged
+        }
+        if not (inserted or updated or removed):
+            return changes
+
+        self.sequence += 1
+        changes['sequence'] = self.sequence
+        self._changes.append(changes)
+
+        for callback in list(self._subscribers):
+            try:
+                callback(changes)
+            except Exception as e:
+                logger.error(f"Error in market change subscriber: {e}")
+
+        logger.info(
+            f"Market sync #{self.sequence}: {len(inserted)} inserted, "
+            f"{len(updated)} updated, {len(removed)} removed, {unchanged} unchanged"
+        )
+        return changes
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """Call `callback(change_set)` for every non-empty change set."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], None]):
+        """Stop notifying a subscriber."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def changes_since(self, sequence: int) -> Optional[List[Dict]]:
+        """
+        Change sets recorded after a sequence number.
+
+        Args:
+            sequence: Last sequence the consumer has applied
+
+        Returns:
+            Change sets in order, or None if the log no longer reaches back
+            that far and the consumer must resync from markets()
+        """
+        if self._changes and sequence < self._changes[0]['sequence'] - 1:
+            return None
+        return [c for c in self._changes if c['sequence'] > sequence]
+
+    def markets(self, platform: Optional[str] = None) -> List[Dict]:
+        """Current markets, optionally for one platform."""
+        if platform is None:
+            return list(self._markets.values())
+        return [m for key, m in self._markets.items() if key[0] == platform]
+
+    def get(self, platform: str, market_id: str) -> Optional[Dict]:
+        """Look up a market by platform and id."""
+        return self._markets.get((platform, str(market_id)))
+
+    def clear(self):
+        """Forget all markets; the change log and sequence are kept."""
+        self._markets.clear()
+        self._fingerprints.clear()
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    sync = MarketSync()
+    sync.subscribe(lambda c: print(f"change set #{c['sequence']}"))
+
+    snapshot = [
+        {'platform': 'kalshi', 'market_id': 'A', 'current_probability': 0.4, 'volume': 100.0, 'status': 'open'},
+        {'platform': 'kalshi', 'market_id': 'B', 'current_probability': 0.7, 'volume': 50.0, 'status': 'open'},
+    ]
+    sync.apply(snapshot)
+
+    snapshot = [
+        {'platform': 'kalshi', 'market_id': 'A', 'current_probability': 0.45, 'volume': 120.0, 'status': 'open'},
+        {'platform': 'polymarket', 'market_id': 'C', 'current_probability': 0.2, 'volume': 10.0},
+    ]
+    changes = sync.apply(snapshot)
+    print(f"Inserted: {[m['market_id'] for m in changes['inserted']]}")
+    print(f"Updated: {[m['market_id'] for m in changes['updated']]}")
+    print(f"Removed: {[m['market_id'] for m in changes['removed']]}")
+    print(f"Unchanged fetch: {sync.apply(snapshot)['unchanged']} unchanged")
+
+    # Rows stored before fingerprinting must be updated in place, not inserted again
+    legacy = diff_markets({('kalshi', 'A'): None}, snapshot[:1])
+    assert not legacy['inserted'] and len(legacy['updated']) == 1
+    print("Legacy rows without a fingerprint: updated, not re-inserted")
@@ -0,0 +1,200 @@
+"""Top-N mindshare leaderboard over many topics."""
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from services.sentiment_analyzer import MindshareCalculator
+
+logger = logging.getLogger(__name__)
+
+
+class MindshareLeaderboard:
+    """Score topics in bulk and keep the top N in a bounded min-heap."""
+
+    def __init__(self, size: int = 50):
+        """
+        Initialize leaderboard.
+
+        Args:
+            size: Number of topics kept on the leaderboard
+        """
+        self.size = size
+        self._slots: Dict[str, int] = {}  # topic -> index into the score arrays
+        self._topics: List[str] = []
+        self._scores = np.zeros(0)
+        self._heap: List = []  # (score, topic) min-heap of the current top N
+        self._in_top = set()
+        self.updated_at: Optional[datetime] = None
+
+    def _ensure_slots(self, topics: Sequence[str]) -> np.ndarray:
+        """Map topics to array slots, growing the score array for new topics."""
+        new = [t for t in topics if t not in self._slots]
+        if new:
+            for topic in new:
+                self._slots[topic] = len(self._topics)
+                self._topics.append(topic)
+            self._scores = np.concatenate([self._scores, np.full(len(new), -np.inf)])
+        return np.array([self._slots[t] for t in topics], dtype=np.int64)
+
+    def _rebuild(self):
+        """Recompute the top N from all scores."""
+        known = np.flatnonzero(np.isfinite(self._scores))
+        if len(known) > self.size:
+            known = known[np.argpartition(self._scores[known], -self.size)[-self.size:]]
+
+        self._heap = [(float(self._scores[i]), self._topics[i]) for i in known]
+        heapq.heapify(self._heap)
+        self._in_top = {topic for _, topic in self._heap}
+
+    def update(
+        self,
+        topics: Sequence[str],
+        mention_count: np.ndarray,
+        sentiment_score: np.ndarray,
+        engagement_score: np.ndarray,
+        historical_mentions: Optional[np.ndarray] = None,
+        historical_engagement: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Score a batch of topics and fold them into the leaderboard.
+
+        Args:
+            topics: Topic names, one per array row
+            mention_count: Current mention counts
+            sentiment_score: Current sentiment scores
+            engagement_score: Current engagement scores
+            historical_mentions: Historical average mentions per topic
+            historical_engagement: Historical average engagement per topic
+
+        Returns:
+            Mindshare score per input topic
+        """
+        scores = MindshareCalculator.calculate_mindshare_batch(
+            mention_count, sentiment_score, engagement_score,
+            historical_mentions, historical_engagement
+        )
+        if not len(topics):
+            return scores
+
+        # A topic listed twice keeps its last score, so it never enters the heap twice
+        last = {topic: i for i, topic in enumerate(topics)}
+        batch_scores = scores
+        if len(last) < len(topics):
+            batch_scores = scores[np.fromiter(last.values(), dtype=np.intp, count=len(last))]
+            topics = list(last)
+
+        slots = self._ensure_slots(topics)
+        previous = self._scores[slots].copy()
+        self._scores[slots] = batch_scores
+
+        # A top member dropping can let an outside topic in, so only then rescan everything
+        in_top = np.array([t in self._in_top for t in topics])
+        if np.any(in_top & (batch_scores < previous)):
+            self._rebuild()
+        else:
+            if np.any(in_top & (batch_scores != previous)):
+                self._heap = [(float(self._scores[self._slots[t]]), t) for _, t in self._heap]
+                heapq.heapify(self._heap)
+
+            for i in np.flatnonzero(~in_top):
+                entry = (float(batch_scores[i]), topics[i])
+                if len(self._heap) < self.size:
+                    heapq.heappush(self._heap, entry)
+                    self._in_top.add(topics[i])
+                elif entry > self._heap[0]:
+                    _, evicted = heapq.heapreplace(self._heap, entry)
+                    self._in_top.discard(evicted)
+                    self._in_top.add(topics[i])
+
+        self.updated_at = datetime.utcnow()
+        return scores
+
+    def remove(self, topic: str):
+        """Drop a topic from the leaderboard."""
+        slot = self._slots.get(topic)
+        if slot is None:
+            return
+        self._scores[slot] = -np.inf
+        if topic in self._in_top:
+            self._rebuild()
+
+    def top(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get leaderboard entries, highest mindshare first.
+
+        Args:
+            limit: Number of entries (defaults to the leaderboard size)
+
+        Returns:
+            List of {'rank', 'topic', 'mindshare'} dicts
+        """
+        entries = sorted(self._heap, reverse=True)[:limit or self.size]
+        return [
+            {'rank': i, 'topic': topic, 'mindshare': score}
+            for i, (score, topic) in enumerate(entries, 1)
+        ]
+
+    def refresh_from_timeseries(
+        self,
+        series,
+        window: timedelta = timedelta(hours=1),
+        baseline: timedelta = timedelta(days=7),
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Rescore every topic tracked by a MindshareTimeSeries.
+
+        Args:
+            series: MindshareTimeSeries instance
+            window: Current window length
+            baseline: Historical period used for the averages
+            now: Reference time
+
+        Returns:
+            Number of topics scored
+        """
+        topics = series.topics()
+        if not topics:
+            return 0
+
+        end = series.window_end(now, window)
+        periods = baseline / window
+        columns = np.zeros((5, len(topics)))
+
+        for i, topic in enumerate(topics):
+            current = series.window_metrics(topic, end - window, end)
+            history = series.window_metrics(topic, end - window - baseline, end - window)
+            columns[:, i] = (
+                current['mention_count'],
+                current['sentiment_score'],
+                current['engagement_score'],
+                history['mention_count'] / periods,
+                history['engagement_score'] / periods
+            )
+
+        self.update(topics, *columns)
+        logger.info(f"Mindshare leaderboard refreshed over {len(topics)} topics")
+        return len(topics)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    rng = np.random.default_rng(1)
+    n = 10000
+    topics = [f"topic-{i}" for i in range(n)]
+
+    board = MindshareLeaderboard(size=10)
+    board.update(
+        topics,
+        rng.integers(0, 500, n),
+        rng.uniform(-1, 1, n),
+        rng.integers(0, 5000, n),
+        rng.integers(50, 300, n),
+        rng.integers(500, 3000, n)
+    )
+    for entry in board.top(5):
+        print(entry)
@@ -0,0 +1,331 @@
+"""Multi-resolution time-series store for topic mindshare metrics."""
+import bisect
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from services.sentiment_analyzer import MindshareCalculator
+
+logger = logging.getLogger(__name__)
+
+# Rollup bucket size (seconds) -> retention (seconds)
+RESOLUTIONS = {
+    60: 2 * 24 * 3600,        # 1-minute buckets for 2 days
+    3600: 90 * 24 * 3600,     # 1-hour buckets for 90 days
+    86400: 3 * 365 * 24 * 3600  # 1-day buckets for 3 years
+}
+
+RESOLUTION_NAMES = {'1m': 60, '1h': 3600, '1d': 86400}
+
+# Bucket layout: [mention_sum, engagement_sum, weighted_sentiment_sum, sentiment_sum, samples]
+MENTIONS, ENGAGEMENT, WEIGHTED_SENTIMENT, SENTIMENT, SAMPLES = range(5)
+
+
+class _Rollup:
+    """Fixed-size buckets for one resolution, kept in time order."""
+
+    def __init__(self, size: int, retention: int):
+        self.size = size
+        self.retention = retention
+        self.starts: List[int] = []
+        self.buckets: Dict[int, List[float]] = {}
+
+    def add(self, ts: float, sentiment: float, mentions: float, engagement: float):
+        """Fold one observation into its bucket, evicting expired buckets."""
+        start = int(ts // self.size) * self.size
+        bucket = self.buckets.get(start)
+        if bucket is None:
+            bucket = [0.0, 0.0, 0.0, 0.0, 0]
+            self.buckets[start] = bucket
+            if not self.starts or start > self.starts[-1]:
+                self.starts.append(start)
+            else:
+                bisect.insort(self.starts, start)
+
+        bucket[MENTIONS] += mentions
+        bucket[ENGAGEMENT] += engagement
+        bucket[WEIGHTED_SENTIMENT] += sentiment * mentions
+        bucket[SENTIMENT] += sentiment
+        bucket[SAMPLES] += 1
+
+        cutoff = self.starts[-1] - self.retention
+        expired = bisect.bisect_left(self.starts, cutoff)
+        if expired:
+            for old in self.starts[:expired]:
+                del self.buckets[old]
+            del self.starts[:expired]
+
+    def range(self, start: float, end: float) -> List[int]:
+        """Bucket starts fully inside [start, end)."""
+        lo = bisect.bisect_left(self.starts, start)
+        hi = bisect.bisect_left(self.starts, end - self.size + 1)
+        return self.starts[lo:hi]
+
+
+def _combine(buckets: List[List[float]]) -> Dict:
+    """Aggregate buckets into mindshare input metrics."""
+    mentions = sum(b[MENTIONS] for b in buckets)
+    samples = sum(b[SAMPLES] for b in buckets)
+
+    if mentions > 0:
+        sentiment = sum(b[WEIGHTED_SENTIMENT] for b in buckets) / mentions
+    elif samples > 0:
+        sentiment = sum(b[SENTIMENT] for b in buckets) / samples
+    else:
+        sentiment = 0.0
+
+    return {
+        'mention_count': int(mentions),
+        'sentiment_score': round(sentiment, 4),
+        'engagement_score': sum(b[ENGAGEMENT] for b in buckets),
+        'samples': samples
+    }
+
+
+class MindshareTimeSeries:
+    """Per-topic raw aggregates with incrementally compacted 1m/1h/1d rollups."""
+
+    def __init__(self, raw_retention: int = 10000):
+        """
+        Initialize time-series store.
+
+        Args:
+            raw_retention: Raw observations kept per topic
+        """
+        self.raw_retention = raw_retention
+        self._raw: Dict[str, deque] = {}
+        self._rollups: Dict[str, Dict[int, _Rollup]] = {}
+
+    def record(
+        self,
+        topic: str,
+        sentiment_score: float,
+        mention_count: int,
+        engagement_score: float = 0.0,
+        timestamp: Optional[datetime] = None
+    ):
+        """
+        Record one sentiment aggregate for a topic.
+
+        Args:
+            topic: Topic name
+            sentiment_score: Aggregate sentiment (-1 to +1)
+            mention_count: Mentions in the aggregate
+            engagement_score: Engagement in the aggregate
+            timestamp: Observation time (defaults to utcnow)
+        """
+        timestamp = timestamp or datetime.utcnow()
+        ts = timestamp.timestamp()
+
+        raw = self._raw.setdefault(topic, deque(maxlen=self.raw_retention))
+        raw.append((ts, sentiment_score, mention_count, engagement_score))
+
+        rollups = self._rollups.get(topic)
+        if rollups is None:
+            rollups = {size: _Rollup(size, retention) for size, retention in RESOLUTIONS.items()}
+            self._rollups[topic] = rollups
+
+        for rollup in rollups.values():
+            rollup.add(ts, sentiment_score or 0.0, mention_count or 0, engagement_score or 0.0)
+
+    def raw(self, topic: str, limit: int = 100) -> List[Dict]:
+        """Most recent raw observations for a topic, newest last."""
+        points = list(self._raw.get(topic, ()))[-limit:]
+        return [
+            {
+                'timestamp': datetime.fromtimestamp(ts),
+                'sentiment_score': sentiment,
+                'mention_count': mentions,
+                'engagement_score': engagement
+            }
+            for ts, sentiment, mentions, engagement in points
+        ]
+
+    def topics(self) -> List[str]:
+        """All topics with recorded data."""
+        return list(self._rollups)
+
+    def _pick_resolution(self, topic: str, start: float, end: float) -> _Rollup:
+        """Coarsest rollup that tiles the window, preferring one that covers its start."""
+        rollups = self._rollups[topic]
+        aligned = [
+            rollups[size] for size in sorted(rollups, reverse=True)
+            if start % size == 0 and end % size == 0
+        ]
+        if not aligned:
+            return rollups[min(rollups)]
+
+        for rollup in aligned:
+            if rollup.starts and rollup.starts[0] <= start:
+                return rollup
+        return aligned[0]
+
+    def window_metrics(self, topic: str, start: datetime, end: datetime) -> Dict:
+        """
+        Aggregate metrics over [start, end) from the rollups.
+
+        Args:
+            topic: Topic name
+            start: Window start
+            end: Window end
+
+        Returns:
+            Dict with mention_count, sentiment_score, engagement_score, samples
+        """
+        if topic not in self._rollups:
+            return _combine([])
+
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        rollup = self._pick_resolution(topic, start_ts, end_ts)
+        return _combine([rollup.buckets[s] for s in rollup.range(start_ts, end_ts)])
+
+    def series(
+        self,
+        topic: str,
+        resolution: str = '1h',
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Get precomputed buckets for charting.
+
+        Args:
+            topic: Topic name
+            resolution: '1m', '1h' or '1d'
+            start: Earliest bucket start (default: everything retained)
+            end: Latest bucket end (default: now)
+
+        Returns:
+            List of bucket dicts in time order
+        """
+        if topic not in self._rollups:
+            return []
+
+        rollup = self._rollups[topic][RESOLUTION_NAMES[resolution]]
+        start_ts = start.timestamp() if start else float('-inf')
+        end_ts = end.timestamp() if end else float('inf')
+
+        lo = bisect.bisect_left(rollup.starts, start_ts)
+        hi = bisect.bisect_left(rollup.starts, end_ts)
+        return [
+            dict(_combine([rollup.buckets[s]]), timestamp=datetime.fromtimestamp(s))
+            for s in rollup.starts[lo:hi]
+        ]
+
+    @staticmethod
+    def window_end(now: Optional[datetime], window: timedelta) -> datetime:
+        """Align the current window end to the rollup grid."""
+        now = now or datetime.utcnow()
+        size = min(RESOLUTIONS)
+        for candidate in sorted(RESOLUTIONS, reverse=True):
+            if window.total_seconds() % candidate == 0:
+                size = candidate
+                break
+        ts = (int(now.timestamp()) // size + 1) * size
+        return datetime.fromtimestamp(ts)
+
+    def mindshare(
+        self,
+        topic: str,
+        window: timedelta = timedelta(hours=1),
+        baseline: timedelta = timedelta(days=7),
+        now: Optional[datetime] = None
+    ) -> float:
+        """
+        Mindshare over the latest window, normalized by the baseline average.
+
+        Args:
+            topic: Topic name
+            window: Current window length
+            baseline: Historical period used for the average
+            now: Reference time
+
+        Returns:
+            Mindshare score (0-1)
+        """
+        end = self.window_end(now, window)
+        current = self.window_metrics(topic, end - window, end)
+        history = self.window_metrics(topic, end - window - baseline, end - window)
+
+        periods = baseline / window
+        historical_avg = {
+            'mention_count': history['mention_count'] / periods,
+            'engagement_score': history['engagement_score'] / periods
+        } if history['samples'] else None
+
+        return MindshareCalculator.calculate_mindshare(current, historical_avg)
+
+    def velocity(
+        self,
+        topic: str,
+        window: timedelta = timedelta(hours=1),
+        now: Optional[datetime] = None
+    ) -> float:
+        """
+        Sentiment change per hour between the latest window and the one before.
+
+        Args:
+            topic: Topic name
+            window: Window length
+            now: Reference time
+
+        Returns:
+            Sentiment velocity
+        """
+        end = self.window_end(now, window)
+        current = self.window_metrics(topic, end - window, end)
+        previous = self.window_metrics(topic, end - 2 * window, end - window)
+
+        if not current['samples'] or not previous['samples']:
+            return 0.0
+
+        return MindshareCalculator.calculate_sentiment_velocity(
+            current['sentiment_score'],
+            previous['sentiment_score'],
+            window.total_seconds() / 3600
+        )
+
+    def acceleration(
+        self,
+        topic: str,
+        window: timedelta = timedelta(hours=1),
+        now: Optional[datetime] = None
+    ) -> float:
+        """
+        Change in sentiment velocity per hour.
+
+        Args:
+            topic: Topic name
+            window: Window length
+            now: Reference time
+
+        Returns:
+            Sentiment acceleration
+        """
+        end = self.window_end(now, window)
+        current_velocity = self.velocity(topic, window, end - timedelta(seconds=1))
+        previous_velocity = self.velocity(topic, window, end - window - timedelta(seconds=1))
+
+        hours = window.total_seconds() / 3600
+        return round((current_velocity - previous_velocity) / hours, 4) if hours > 0 else 0.0
+
+    def summary(self, topic: str, window: timedelta = timedelta(hours=1), now: Optional[datetime] = None) -> Dict:
+        """
+        Current mindshare, velocity and acceleration for a topic.
+
+        Args:
+            topic: Topic name
+            window: Window length
+            now: Reference time
+
+        Returns:
+            Metrics dictionary
+        """
+        return {
+            'topic': topic,
+            'window_hours': window.total_seconds() / 3600,
+            'mindshare': self.mindshare(topic, window, now=now),
+            'velocity': self.velocity(topic, window, now=now),
+            'acceleration': self.acceleration(topic, window, now=now)
+        }
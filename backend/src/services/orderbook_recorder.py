@@ -0,0 +1,293 @@
+"""Top-of-book snapshot recorder with a numeric ring buffer and on-disk segments."""
+import os
+import glob
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fixed-width columns: name -> dtype
+SNAPSHOT_COLUMNS = {
+    'ts': np.float64,
+    'market': np.int32,
+    'yes_bid': np.float32,
+    'yes_ask': np.float32,
+    'no_bid': np.float32,
+    'no_ask': np.float32,
+    'liquidity': np.float32
+}
+
+
+def _price(value) -> float:
+    """Parse a dollar price (Kalshi sends strings like '0.4500'); NaN when absent."""
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return price if price > 0 else np.nan
+
+
+def book_from_market(market: Dict) -> Tuple[float, float, float, float, float]:
+    """
+    Extract top-of-book and liquidity from a normalized market.
+
+    Args:
+        market: Market dictionary from KalshiClient or PolymarketClient
+
+    Returns:
+        (yes_bid, yes_ask, no_bid, no_ask, liquidity), NaN where unknown
+    """
+    metadata = market.get('metadata') or {}
+
+    if market.get('platform') == 'kalshi':
+        return (
+            _price(metadata.get('yes_bid_dollars')),
+            _price(metadata.get('yes_ask_dollars')),
+            _price(metadata.get('no_bid_dollars')),
+            _price(metadata.get('no_ask_dollars')),
+            _price(metadata.get('liquidity_dollars'))
+        )
+
+    # Polymarket: the NO side mirrors the YES book
+    yes_bid = _price(metadata.get('best_bid'))
+    yes_ask = _price(metadata.get('best_ask'))
+    return (yes_bid, yes_ask, 1 - yes_ask, 1 - yes_bid, _price(metadata.get('liquidity')))
+
+
+class OrderBookRecorder:
+    """Append-only snapshots in a fixed-capacity ring, flushed to .npz segments."""
+
+    def __init__(self, capacity: int = 100000, directory: Optional[str] = None):
+        """
+        Initialize recorder.
+
+        Args:
+            capacity: Rows held in memory
+            directory: Where full segments are written (None = memory only, oldest rows overwritten)
+        """
+        self.capacity = capacity
+        self.directory = directory
+        self._columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in SNAPSHOT_COLUMNS.items()}
+        self._head = 0        # Next row to write
+        self._size = 0        # Rows currently held
+        self._unflushed = 0   # Rows not yet written to disk
+        self._markets: Dict[Tuple[str, str], int] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _market_slot(self, platform: str, market_id: str) -> int:
+        key = (platform, str(market_id))
+        slot = self._markets.get(key)
+        if slot is None:
+            slot = len(self._keys)
+            self._markets[key] = slot
+            self._keys.append(key)
+        return slot
+
+    def record(self, markets: List[Dict], timestamp: Optional[float] = None) -> int:
+        """
+        Append one snapshot row per market.
+
+        Args:
+            markets: Normalized market dictionaries
+            timestamp: Snapshot time (Unix seconds, defaults to now)
+
+        Returns:
+            Number of rows recorded
+        """
+        if not markets:
+            return 0
+
+        ts = timestamp or time.time()
+        rows = np.array([book_from_market(m) for m in markets], dtype=np.float32).reshape(-1, 5)
+
+        with self._lock:
+            slots = np.array(
+                [self._market_slot(m.get('platform', ''), m.get('market_id')) for m in markets],
+                dtype=np.int32
+            )
+
+            for start in range(0, len(markets), self.capacity):
+                self._write(ts, slots[start:start + self.capacity], rows[start:start + self.capacity])
+
+        return len(markets)
+
+    def _write(self, ts: float, slots: np.ndarray, rows: np.ndarray):
+        """Copy rows into the ring, flushing before unflushed rows would be overwritten."""
+        n = len(slots)
+        if self.directory and self._unflushed + n > self.capacity:
+            self._flush_locked()
+
+        positions = (self._head + np.arange(n)) % self.capacity
+        self._columns['ts'][positions] = ts
+        self._columns['market'][positions] = slots
+        for i, name in enumerate(('yes_bid', 'yes_ask', 'no_bid', 'no_ask', 'liquidity')):
+            self._columns[name][positions] = rows[:, i]
+
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        self._unflushed = min(self._unflushed + n, self.capacity)
+
+    def _ordered(self, count: int) -> np.ndarray:
+        """Ring positions of the newest `count` rows, oldest first."""
+        return (self._head - count + np.arange(count)) % self.capacity
+
+    def flush(self) -> Optional[str]:
+        """
+        Write rows recorded since the last flush as a disk segment.
+
+        Returns:
+            Segment path, or None if there was nothing to write
+        """
+        with self._lock:
+            return self._flush_locked()
+
+    def _flush_locked(self) -> Optional[str]:
+        if not self.directory or not self._unflushed:
+            return None
+
+        positions = self._ordered(self._unflushed)
+        columns = {name: column[positions] for name, column in self._columns.items()}
+
+        # Segments carry their own market table so they can be read independently
+        used, local = np.unique(columns['market'], return_inverse=True)
+        columns['market'] = local.astype(np.int32)
+        keys = np.array([f"{self._keys[i][0]}:{self._keys[i][1]}" for i in used])
+
+        path = os.path.join(
+            self.directory,
+            f"book_{int(columns['ts'][0])}_{int(columns['ts'][-1])}_{time.time_ns()}.npz"
+        )
+        np.savez_compressed(path, keys=keys, **columns)
+        self._unflushed = 0
+
+        logger.info(f"Flushed {len(positions)} order-book snapshots to {path}")
+        return path
+
+    def _memory_rows(self, slot: int, start: Optional[float], end: Optional[float]) -> Dict[str, np.ndarray]:
+        positions = self._ordered(self._size)
+        mask = self._columns['market'][positions] == slot
+        ts = self._columns['ts'][positions]
+        if start is not None:
+            mask &= ts >= start
+        if end is not None:
+            mask &= ts <= end
+        selected = positions[mask]
+        return {name: self._columns[name][selected] for name in SNAPSHOT_COLUMNS if name != 'market'}
+
+    def _segment_rows(self, key: str, start: Optional[float], end: Optional[float], before: float) -> List[Dict]:
+        """Rows for one market from disk segments older than the in-memory window."""
+        parts = []
+        for path in sorted(glob.glob(os.path.join(self.directory, 'book_*.npz'))):
+            _, first, last, _ = os.path.basename(path)[:-4].split('_')
+            if (end is not None and int(first) > end) or (start is not None and int(last) + 1 < start):
+                continue
+
+            with np.load(path) as data:
+                matches = np.flatnonzero(data['keys'] == key)
+                if not len(matches):
+                    continue
+                ts = data['ts']
+                mask = (data['market'] == matches[0]) & (ts < before)
+                if start is not None:
+                    mask &= ts >= start
+                if end is not None:
+                    mask &= ts <= end
+                parts.append({name: data[name][mask] for name in SNAPSHOT_COLUMNS if name != 'market'})
+        return parts
+
+    def history(
+        self,
+        platform: str,
+        market_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        include_segments: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Snapshot columns for one market, oldest first.
+
+        Args:
+            platform: 'kalshi' or 'polymarket'
+            market_id: Market id
+            start: Earliest snapshot time (Unix seconds)
+            end: Latest snapshot time (Unix seconds)
+            include_segments: Also read flushed segments older than the in-memory window
+
+        Returns:
+            Dict of arrays: ts, yes_bid, yes_ask, no_bid, no_ask, liquidity, mid, spread
+        """
+        with self._lock:
+            slot = self._markets.get((platform, str(market_id)))
+            if slot is None:
+                parts = []
+                oldest = float('inf')
+            else:
+                parts = [self._memory_rows(slot, start, end)]
+                oldest = self._columns['ts'][self._ordered(self._size)[0]] if self._size else float('inf')
+
+        if include_segments and self.directory:
+            parts = self._segment_rows(f"{platform}:{market_id}", start, end, oldest) + parts
+
+        columns = {
+            name: np.concatenate([p[name] for p in parts]) if parts else np.zeros(0, dtype=dtype)
+            for name, dtype in SNAPSHOT_COLUMNS.items() if name != 'market'
+        }
+        columns['mid'] = (columns['yes_bid'] + columns['yes_ask']) / 2
+        columns['spread'] = columns['yes_ask'] - columns['yes_bid']
+        return columns
+
+    def spread(self, platform: str, market_id: str, start: Optional[float] = None,
+               end: Optional[float] = None, include_segments: bool = False) -> Dict[str, np.ndarray]:
+        """YES bid/ask spread over time ({'ts', 'spread'})."""
+        columns = self.history(platform, market_id, start, end, include_segments)
+        return {'ts': columns['ts'], 'spread': columns['spread']}
+
+    def mid_price(self, platform: str, market_id: str, start: Optional[float] = None,
+                  end: Optional[float] = None, include_segments: bool = False) -> Dict[str, np.ndarray]:
+        """YES mid price over time ({'ts', 'mid'})."""
+        columns = self.history(platform, market_id, start, end, include_segments)
+        return {'ts': columns['ts'], 'mid': columns['mid']}
+
+    def stats(self) -> Dict:
+        """Buffer occupancy."""
+        return {
+            'rows': self._size,
+            'capacity': self.capacity,
+            'unflushed': self._unflushed,
+            'markets': len(self._keys)
+        }
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    recorder = OrderBookRecorder(capacity=1000, directory=tempfile.mkdtemp())
+    for minute in range(30):
+        recorder.record([
+            {
+                'platform': 'kalshi',
+                'market_id': f"KX-{i}",
+                'metadata': {
+                    'yes_bid_dollars': f"{0.40 + minute / 1000:.4f}",
+                    'yes_ask_dollars': f"{0.44 + minute / 1000:.4f}",
+                    'no_bid_dollars': '0.5600',
+                    'no_ask_dollars': '0.6000',
+                    'liquidity_dollars': '2500.00'
+                }
+            }
+            for i in range(50)
+        ], timestamp=1700000000 + minute * 60)
+
+    mid = recorder.mid_price('kalshi', 'KX-0', include_segments=True)
+    print(f"{len(mid['ts'])} snapshots, mid {mid['mid'][0]:.3f} -> {mid['mid'][-1]:.3f}")
+    print(recorder.stats())
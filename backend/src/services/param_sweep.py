@@ -0,0 +1,285 @@
+"""Parallel parameter sweeps over PredictionEngine config."""
+import copy
+import itertools
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory, util
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from services.prediction_engine import PredictionEngine
+from services.backtester import BacktestDataset, SAMPLE_FIELDS, score_arrays
+
+logger = logging.getLogger(__name__)
+
+# Metrics where a lower value ranks higher
+LOWER_IS_BETTER = {'mean_absolute_error', 'rmse'}
+
+# Worker-side handle on the shared sample block, set by _attach_shared
+_shared_block = None
+_shared_samples: Dict[str, Dict[str, np.ndarray]] = {}
+
+
+def apply_params(base_config: Dict, params: Dict) -> Dict:
+    """
+    Apply sweep parameters to an engine config.
+
+    Keys of the form 'time_multipliers.<horizon>' set a single horizon multiplier;
+    any other key replaces the top-level config value.
+
+    Args:
+        base_config: Config to start from
+        params: Parameter values for one sweep point
+
+    Returns:
+        New config dictionary
+    """
+    config = copy.deepcopy(base_config)
+    for key, value in params.items():
+        if key.startswith('time_multipliers.'):
+            config['time_multipliers'][key.split('.', 1)[1]] = value
+        else:
+            config[key] = value
+    return config
+
+
+def grid_search_space(grid: Dict[str, Sequence]) -> List[Dict]:
+    """
+    Expand a parameter grid into every combination.
+
+    Args:
+        grid: Parameter name to list of candidate values
+
+    Returns:
+        List of parameter dictionaries
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def random_search_space(
+    bounds: Dict[str, Tuple[float, float]],
+    n_samples: int,
+    seed: Optional[int] = None
+) -> List[Dict]:
+    """
+    Draw parameter sets uniformly from per-parameter bounds.
+
+    Args:
+        bounds: Parameter name to (low, high)
+        n_samples: Number of parameter sets to draw
+        seed: Random seed for reproducible sweeps
+
+    Returns:
+        List of parameter dictionaries
+    """
+    rng = random.Random(seed)
+    return [
+        {name: round(rng.uniform(low, high), 4) for name, (low, high) in bounds.items()}
+        for _ in range(n_samples)
+    ]
+
+
+def _attach_shared(name: str, layout: Dict[str, Tuple[int, int]]):
+    """
+    Pool initializer: map the shared sample block into this worker.
+
+    The parent owns (and unlinks) the block. Pool workers inherit the
+    parent's resource tracker under fork, spawn and forkserver alike, so
+    attaching only re-registers the same segment; it must not be
+    unregistered here, which would drop the parent's entry and make its
+    unlink fail in the tracker. Workers close their handle at exit.
+    """
+    global _shared_block
+    try:
+        _shared_block = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        _shared_block = shared_memory.SharedMemory(name=name)
+
+    # Pool workers exit through multiprocessing's finalizers, not atexit
+    util.Finalize(None, _detach_shared, exitpriority=10)
+
+    for horizon, (offset, count) in layout.items():
+        block = np.ndarray(
+            (len(SAMPLE_FIELDS), count),
+            dtype=np.float64,
+            buffer=_shared_block.buf,
+            offset=offset
+        )
+        _shared_samples[horizon] = dict(zip(SAMPLE_FIELDS, block))
+
+
+def _detach_shared():
+    """Worker exit: drop the array views, then close this worker's handle on the block."""
+    global _shared_block
+    _shared_samples.clear()
+    if _shared_block is not None:
+        _shared_block.close()
+        _shared_block = None
+
+
+def _evaluate_params(params: Dict, config: Dict, horizons: Sequence[str]) -> Dict:
+    """Score one config against the shared samples for every horizon."""
+    return {
+        'params': params,
+        'horizons': {h: score_arrays(config, h, _shared_samples[h]) for h in horizons}
+    }
+
+
+class ParameterSweep:
+    """Evaluate many PredictionEngine configs against one historical dataset."""
+
+    def __init__(
+        self,
+        dataset: BacktestDataset,
+        horizons: Sequence[str] = ('1h', '6h', '24h'),
+        base_config: Optional[Dict] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize sweep runner.
+
+        Args:
+            dataset: Aligned historical data
+            horizons: Horizons to evaluate each config on
+            base_config: Config overrides every sweep point starts from
+            max_workers: Process pool size (None = CPU count)
+        """
+        self.dataset = dataset
+        self.horizons = list(horizons)
+        self.base_config = PredictionEngine(base_config).config
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def _create_shared_block(self) -> Tuple[shared_memory.SharedMemory, Dict[str, Tuple[int, int]]]:
+        """Copy the per-horizon sample arrays into a single shared memory block."""
+        samples = {h: self.dataset.horizon_samples(h) for h in self.horizons}
+        row_bytes = np.dtype(np.float64).itemsize * len(SAMPLE_FIELDS)
+
+        layout = {}
+        offset = 0
+        for horizon in self.horizons:
+            count = len(samples[horizon]['current_score'])
+            layout[horizon] = (offset, count)
+            offset += row_bytes * count
+
+        block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for horizon, (start, count) in layout.items():
+            view = np.ndarray((len(SAMPLE_FIELDS), count), dtype=np.float64, buffer=block.buf, offset=start)
+            for i, field in enumerate(SAMPLE_FIELDS):
+                view[i] = samples[horizon][field]
+
+        return block, layout
+
+    def run(
+        self,
+        search_space: List[Dict],
+        rank_by: str = 'mean_absolute_error',
+        rank_horizon: str = '6h'
+    ) -> List[Dict]:
+        """
+        Evaluate every parameter set and rank the results.
+
+        Args:
+            search_space: Parameter dictionaries (see grid_search_space/random_search_space)
+            rank_by: Metric used for ranking
+            rank_horizon: Horizon whose metric is ranked
+
+        Returns:
+            Ranked list of result dicts with rank, params, config and per-horizon metrics
+        """
+        if not search_space:
+            return []
+
+        started = datetime.utcnow()
+        block, layout = self._create_shared_block()
+
+        try:
+            configs = [apply_params(self.base_config, params) for params in search_space]
+            workers = min(self.max_workers, len(search_space))
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_attach_shared,
+                initargs=(block.name, layout)
+            ) as pool:
+                futures = [
+                    pool.submit(_evaluate_params, params, config, self.horizons)
+                    for params, config in zip(search_space, configs)
+                ]
+                results = [f.result() for f in futures]
+        finally:
+            block.close()
+            block.unlink()
+
+        for result, config in zip(results, configs):
+            result['config'] = config
+            result['score'] = result['horizons'].get(rank_horizon, {}).get(rank_by)
+
+        descending = rank_by not in LOWER_IS_BETTER
+        scored = [r for r in results if r['score'] is not None]
+        unscored = [r for r in results if r['score'] is None]
+        scored.sort(key=lambda r: r['score'], reverse=descending)
+
+        ranked = scored + unscored
+        for i, result in enumerate(ranked, 1):
+            result['rank'] = i
+
+        elapsed = (datetime.utcnow() - started).total_seconds()
+        logger.info(f"Swept {len(search_space)} configs on {workers} workers in {elapsed:.2f}s")
+        return ranked
+
+    @staticmethod
+    def format_table(ranked: List[Dict], rank_horizon: str = '6h', top_n: int = 10) -> str:
+        """
+        Render ranked results as a plain-text table.
+
+        Args:
+            ranked: Output of run()
+            rank_horizon: Horizon whose metrics are shown
+            top_n: Number of rows to show
+
+        Returns:
+            Table string
+        """
+        lines = [f"{'rank':>4}  {'mae':>7}  {'hit':>6}  {'acc':>6}  params"]
+        for result in ranked[:top_n]:
+            metrics = result['horizons'].get(rank_horizon, {})
+            lines.append(
+                f"{result['rank']:>4}  "
+                f"{metrics.get('mean_absolute_error', float('nan')):>7.3f}  "
+                f"{metrics.get('direction_hit_rate', float('nan')):>6.3f}  "
+                f"{metrics.get('mean_accuracy_score', float('nan')):>6.3f}  "
+                f"{result['params']}"
+            )
+        return "\n".join(lines)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    from services.backtester import build_dataset
+
+    rng = np.random.default_rng(7)
+    hours = 24 * 60
+    start_ts = datetime(2026, 1, 1).timestamp()
+
+    sentiment = np.cumsum(rng.normal(0, 0.05, hours)).clip(-1, 1)
+    probability = (0.5 + 0.2 * np.roll(sentiment, 3)).clip(0.01, 0.99)
+    rows = [
+        {'timestamp': start_ts + i * 3600, 'sentiment_score': sentiment[i], 'mention_count': int(rng.integers(50, 400))}
+        for i in range(hours)
+    ]
+    series = [(start_ts + i * 3600, probability[i]) for i in range(hours)]
+
+    sweep = ParameterSweep(build_dataset(rows, series), max_workers=4)
+    space = grid_search_space({
+        'sentiment_multiplier': [5.0, 10.0, 20.0],
+        'volume_cap': [1.5, 2.0, 3.0],
+        'time_multipliers.6h': [0.5, 1.0]
+    })
+    ranked = sweep.run(space)
+    print(ParameterSweep.format_table(ranked))
@@ -0,0 +1,394 @@
+"""Persistent, deduplicated social post store with TTL and per-post sentiment."""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+POST_TTL_SECONDS = int(os.getenv("POST_STORE_TTL", str(7 * 86400)))  # Measured from the last fetch
+PURGE_INTERVAL_SECONDS = 3600
+
+PostKey = Tuple[str, str]
+
+
+def post_key(post: Dict) -> Optional[PostKey]:
+    """(platform, post id), or None for posts without an id."""
+    if post.get('id') is None:
+        return None
+    return (post.get('platform', ''), str(post['id']))
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _decode(data: str) -> Dict:
+    post = json.loads(data)
+    if isinstance(post.get('created_at'), str):
+        try:
+            post['created_at'] = datetime.fromisoformat(post['created_at'])
+        except ValueError:
+            pass
+    return post
+
+
+class PostStore(ABC):
+    """Backend-independent part of the post store."""
+
+    @abstractmethod
+    def upsert_posts(self, posts: List[Dict]) -> int:
+        """
+        Insert new posts and refresh stored ones with the latest fetch.
+
+        The stored post body (and so its engagement metrics) is replaced and
+        its TTL restarts; sentiment already stored for the post is kept.
+
+        Args:
+            posts: Normalized posts from the Reddit/Twitter clients
+
+        Returns:
+            Number of posts written
+        """
+
+    @abstractmethod
+    def get(self, platform: str, post_id: str) -> Optional[Dict]:
+        """Stored post with a 'sentiment' entry (or None if unscored)."""
+
+    @abstractmethod
+    def get_sentiments(self, keys: Iterable[PostKey], model_version: str) -> Dict[PostKey, Dict]:
+        """Stored sentiment for the keys that were scored by `model_version`."""
+
+    @abstractmethod
+    def set_sentiments(self, sentiments: Dict[PostKey, Dict], model_version: str):
+        """Store sentiment results ({'label', 'score', 'normalized_score'}) per post."""
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Delete posts past their TTL; returns the number removed."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored posts."""
+
+    def score_posts(
+        self,
+        posts: List[Dict],
+        texts: List[str],
+        model_version: str,
+        analyze: Callable[[List[str]], List[Dict]]
+    ) -> List[Optional[Dict]]:
+        """
+        Sentiment per post, running the model only on posts it has not scored yet.
+
+        Posts are upserted first, so every analysis also refreshes the store.
+
+        Args:
+            posts: Posts to score
+            texts: Text to score for each post (same order)
+            model_version: Model identifier; results from other versions are rescored
+            analyze: Batch scorer returning one result per text
+
+        Returns:
+            Sentiment dict per post, None where no score is available
+        """
+        self.upsert_posts(posts)
+
+        keys = [post_key(p) for p in posts]
+        known = self.get_sentiments([k for k in keys if k], model_version)
+
+        todo = [i for i, key in enumerate(keys) if key not in known and texts[i] and texts[i].strip()]
+        results = analyze([texts[i] for i in todo]) if todo else []
+
+        fresh: Dict[int, Dict] = {}
+        if len(results) == len(todo):
+            fresh = dict(zip(todo, results))
+            # A model confidence of exactly 0 is an analyzer fallback, not a result worth keeping
+            self.set_sentiments(
+                {keys[i]: r for i, r in fresh.items() if keys[i] and r.get('score')},
+                model_version
+            )
+        elif todo:
+            logger.warning(f"Sentiment model returned {len(results)} results for {len(todo)} posts; not storing")
+
+        logger.info(f"Sentiment for {len(posts)} posts: {len(posts) - len(todo)} from store, {len(fresh)} scored")
+        return [known.get(key) or fresh.get(i) for i, key in enumerate(keys)]
+
+
+class SQLitePostStore(PostStore):
+    """Single-node post store in a local SQLite file."""
+
+    def __init__(self, path: str = "social_posts.db", ttl_seconds: int = POST_TTL_SECONDS):
+        """
+        Initialize SQLite post store.
+
+        Args:
+            path: Database file (':memory:' for a throwaway store)
+            ttl_seconds: Seconds a post is kept after it was last fetched
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._purged_at = 0.0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS posts (
+                platform TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                sentiment_label TEXT,
+                sentiment_score REAL,
+                sentiment_normalized REAL,
+                model_version TEXT,
+                PRIMARY KEY (platform, post_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_posts_expires_at ON posts (expires_at);
+        """)
+        self._conn.commit()
+
+    def upsert_posts(self, posts: List[Dict]) -> int:
+        now = time.time()
+        rows = [
+            (key[0], key[1], json.dumps(post, default=_json_default), now, now, now + self.ttl_seconds)
+            for post in posts
+            for key in [post_key(post)] if key
+        ]
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.executemany("""
+                INSERT INTO posts (platform, post_id, data, first_seen, last_seen, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (platform, post_id) DO UPDATE SET
+                    data = excluded.data,
+                    last_seen = excluded.last_seen,
+                    expires_at = excluded.expires_at
+            """, rows)
+            self._conn.commit()
+
+        if now - self._purged_at > PURGE_INTERVAL_SECONDS:
+            self.purge_expired()
+        return len(rows)
+
+    def get(self, platform: str, post_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, sentiment_label, sentiment_score, sentiment_normalized, model_version "
+                "FROM posts WHERE platform = ? AND post_id = ? AND expires_at > ?",
+                (platform, str(post_id), time.time())
+            ).fetchone()
+        if row is None:
+            return None
+
+        post = _decode(row[0])
+        post['sentiment'] = None if row[4] is None else {
+            'label': row[1], 'score': row[2], 'normalized_score': row[3], 'model_version': row[4]
+        }
+        return post
+
+    def get_sentiments(self, keys: Iterable[PostKey], model_version: str) -> Dict[PostKey, Dict]:
+        keys = list(keys)
+        found: Dict[PostKey, Dict] = {}
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 400):
+                chunk = keys[start:start + 400]
+                clause = ' OR '.join(['(platform = ? AND post_id = ?)'] * len(chunk))
+                params = [value for key in chunk for value in key] + [model_version]
+                for platform, post_id, label, score, normalized in self._conn.execute(
+                    "SELECT platform, post_id, sentiment_label, sentiment_score, sentiment_normalized "
+                    f"FROM posts WHERE ({clause}) AND model_version = ?",
+                    params
+                ):
+                    found[(platform, post_id)] = {'label': label, 'score': score, 'normalized_score': normalized}
+        return found
+
+    def set_sentiments(self, sentiments: Dict[PostKey, Dict], model_version: str):
+        if not sentiments:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE posts SET sentiment_label = ?, sentiment_score = ?, sentiment_normalized = ?, "
+                "model_version = ? WHERE platform = ? AND post_id = ?",
+                [
+                    (s.get('label'), s.get('score'), s.get('normalized_score'), model_version, key[0], key[1])
+                    for key, s in sentiments.items()
+                ]
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM posts WHERE expires_at <= ?", (time.time(),)).rowcount
+            self._conn.commit()
+            self._purged_at = time.time()
+        if removed:
+            logger.info(f"Purged {removed} expired posts")
+        return removed
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class MongoPostStore(PostStore):
+    """Post store in the MongoDB instance provisioned by docker-compose."""
+
+    def __init__(
+        self,
+        uri: str = "mongodb://localhost:27017",
+        database: str = "mindshare_social",
+        ttl_seconds: int = POST_TTL_SECONDS
+    ):
+        """
+        Initialize MongoDB post store.
+
+        Expiry uses a MongoDB TTL index on 'expires_at', so no purge pass is needed.
+
+        Args:
+            uri: MongoDB connection string
+            database: Database name
+            ttl_seconds: Seconds a post is kept after it was last fetched
+        """
+        from pymongo import MongoClient
+
+        self.ttl_seconds = ttl_seconds
+        self._client = MongoClient(uri)
+        self._posts = self._client[database]['posts']
+        self._posts.create_index('expires_at', expireAfterSeconds=0)
+
+    @staticmethod
+    def _id(key: PostKey) -> str:
+        return f"{key[0]}:{key[1]}"
+
+    def upsert_posts(self, posts: List[Dict]) -> int:
+        from pymongo import UpdateOne
+
+        now = datetime.utcnow()
+        expires_at = datetime.utcfromtimestamp(time.time() + self.ttl_seconds)
+        operations = [
+            UpdateOne(
+                {'_id': self._id(key)},
+                {
+                    '$set': {'data': json.dumps(post, default=_json_default), 'last_seen': now,
+                             'expires_at': expires_at},
+                    '$setOnInsert': {'platform': key[0], 'post_id': key[1], 'first_seen': now}
+                },
+                upsert=True
+            )
+            for post in posts
+            for key in [post_key(post)] if key
+        ]
+        if operations:
+            self._posts.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def get(self, platform: str, post_id: str) -> Optional[Dict]:
+        document = self._posts.find_one({'_id': self._id((platform, str(post_id)))})
+        if document is None:
+            return None
+        post = _decode(document['data'])
+        post['sentiment'] = document.get('sentiment')
+        return post
+
+    def get_sentiments(self, keys: Iterable[PostKey], model_version: str) -> Dict[PostKey, Dict]:
+        ids = [self._id(key) for key in keys]
+        if not ids:
+            return {}
+        return {
+            (d['platform'], d['post_id']): {k: v for k, v in d['sentiment'].items() if k != 'model_version'}
+            for d in self._posts.find(
+                {'_id': {'$in': ids}, 'sentiment.model_version': model_version},
+                {'platform': 1, 'post_id': 1, 'sentiment': 1}
+            )
+        }
+
+    def set_sentiments(self, sentiments: Dict[PostKey, Dict], model_version: str):
+        from pymongo import UpdateOne
+
+        if not sentiments:
+            return
+        self._posts.bulk_write([
+            UpdateOne({'_id': self._id(key)}, {'$set': {'sentiment': {
+                'label': s.get('label'),
+                'score': s.get('score'),
+                'normalized_score': s.get('normalized_score'),
+                'model_version': model_version
+            }}})
+            for key, s in sentiments.items()
+        ], ordered=False)
+
+    def purge_expired(self) -> int:
+        return self._posts.delete_many({'expires_at': {'$lte': datetime.utcnow()}}).deleted_count
+
+    def count(self) -> int:
+        return self._posts.estimated_document_count()
+
+
+def create_post_store() -> Optional[PostStore]:
+    """
+    Build the configured post store.
+
+    POST_STORE selects 'none' (default), 'sqlite' (file at POST_STORE_PATH)
+    or 'mongodb' (MONGODB_URI / MONGODB_DB). Nothing is created on disk
+    unless a store is configured.
+
+    Returns:
+        Post store, or None if disabled or unavailable
+    """
+    backend = os.getenv("POST_STORE", "none").lower()
+    try:
+        if backend == 'mongodb':
+            return MongoPostStore(
+                os.getenv("MONGODB_URI", "mongodb://localhost:27017"),
+                os.getenv("MONGODB_DB", "mindshare_social")
+            )
+        if backend == 'sqlite':
+            return SQLitePostStore(os.getenv("POST_STORE_PATH", "social_posts.db"))
+    except Exception as e:
+        logger.error(f"Error opening {backend} post store: {e}")
+    return None
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    store = SQLitePostStore(':memory:')
+    calls = []
+
+    def fake_model(texts: List[str]) -> List[Dict]:
+        calls.append(len(texts))
+        return [{'label': 'POSITIVE', 'score': 0.9, 'normalized_score': 0.9} for _ in texts]
+
+    posts = [
+        {'id': f"p{i}", 'platform': 'reddit', 'title': f"Post {i}", 'upvotes': i, 'created_at': datetime.utcnow()}
+        for i in range(50)
+    ]
+    texts = [p['title'] for p in posts]
+
+    store.score_posts(posts, texts, 'demo-v1', fake_model)
+    posts[0]['upvotes'] = 999
+    store.score_posts(posts + [{'id': 'new', 'platform': 'reddit', 'title': 'New'}], texts + ['New'],
+                      'demo-v1', fake_model)
+
+    print(f"Model calls: {calls}, stored posts: {store.count()}")
+    print(f"p0 upvotes: {store.get('reddit', 'p0')['upvotes']}, sentiment: {store.get('reddit', 'p0')['sentiment']}")
@@ -6,18 +6,37 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Default shift scaling per prediction horizon
+TIME_MULTIPLIERS = {'1h': 0.5, '6h': 1.0, '24h': 1.5}
+
+# Length of each prediction horizon
+HORIZON_HOURS = {'1h': 1, '6h': 6, '24h': 24}
+
+# Predicted shifts are capped to this range (percentage points)
+MAX_SHIFT = 20.0
+
 
 class PredictionEngine:
     """Predict market probability shifts based on sentiment changes."""
 
-    def __init__(self):
-        """Initialize prediction engine."""
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize prediction engine.
+
+        Args:
+            config: Optional overrides for the default engine config
+        """
         self.config = {
             'sentiment_multiplier': 10.0,  # Base shift per sentiment change
             'volume_cap': 2.0,  # Maximum volume factor
             'min_confidence_threshold': 0.4,
-            'high_confidence_threshold': 0.7
+            'high_confidence_threshold': 0.7,
+            'time_multipliers': dict(TIME_MULTIPLIERS)  # Shift scaling per horizon
         }
+        if config:
+            # Merge horizon overrides so unlisted horizons keep their defaults
+            self.config.update({k: v for k, v in config.items() if k != 'time_multipliers'})
+            self.config['time_multipliers'].update(config.get('time_multipliers') or {})
         logger.info("Prediction engine initialized")
 
     def predict_market_shift(
@@ -64,8 +83,7 @@ class PredictionEngine:
             adjusted_shift = base_shift * volume_factor * agreement
 
             # Time horizon adjustment
-            time_multipliers = {'1h': 0.5, '6h': 1.0, '24h': 1.5}
-            time_multiplier = time_multipliers.get(time_horizon, 1.0)
+            time_multiplier = self.config['time_multipliers'].get(time_horizon, 1.0)
             final_shift = adjusted_shift * time_multiplier
 
             # Calculate confidence
@@ -88,9 +106,9 @@ class PredictionEngine:
             )
 
             # Cap final shift to reasonable range (-20% to +20%)
-            final_shift = max(-20.0, min(20.0, final_shift))
+            final_shift = max(-MAX_SHIFT, min(MAX_SHIFT, final_shift))
 
-            return {
+            prediction = {
                 'predicted_shift': round(final_shift, 2),
                 'confidence_level': confidence_level,
                 'confidence_score': round(confidence_score, 3),
@@ -106,6 +124,11 @@ class PredictionEngine:
                 }
             }
 
+            # Materialize signal strength so stored predictions can be indexed by it
+            prediction['signal_strength'] = self.get_signal_strength(prediction)
+            prediction['signal_score'] = self.get_signal_score(prediction)
+            return prediction
+
         except Exception as e:
             logger.error(f"Error predicting market shift: {e}")
             return {
@@ -114,7 +137,9 @@ class PredictionEngine:
                 'confidence_score': 0.0,
                 'reasoning': 'Error in prediction calculation',
                 'time_horizon': time_horizon,
-                'created_at': datetime.utcnow()
+                'created_at': datetime.utcnow(),
+                'signal_strength': 'weak',
+                'signal_score': 0.0
             }
 
     def _generate_reasoning(
@@ -246,6 +271,82 @@ class PredictionEngine:
                 'error': str(e)
             }
 
+    def predict_shift_arrays(
+        self,
+        current_score: np.ndarray,
+        previous_score: np.ndarray,
+        mention_count: np.ndarray,
+        avg_volume: np.ndarray,
+        agreement: np.ndarray,
+        time_horizon: str = '6h'
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized equivalent of predict_market_shift for many samples.
+
+        Args:
+            current_score: Current sentiment scores
+            previous_score: Previous sentiment scores
+            mention_count: Current mention counts
+            avg_volume: Historical average mention counts
+            agreement: Cross-platform agreement per sample (0.5 if single platform)
+            time_horizon: Prediction timeframe ('1h', '6h', '24h')
+
+        Returns:
+            Dictionary of arrays: predicted_shift, confidence_score, confidence_level
+            (0 = low, 1 = medium, 2 = high)
+        """
+        sentiment_delta = np.asarray(current_score, dtype=np.float64) - previous_score
+        volume_factor = np.minimum(
+            np.asarray(mention_count, dtype=np.float64) / np.maximum(avg_volume, 1),
+            self.config['volume_cap']
+        )
+
+        time_multiplier = self.config['time_multipliers'].get(time_horizon, 1.0)
+        shift = sentiment_delta * self.config['sentiment_multiplier'] * volume_factor * agreement
+        shift = np.clip(shift * time_multiplier, -MAX_SHIFT, MAX_SHIFT)
+
+        confidence_score = np.minimum(volume_factor * agreement, 1.0)
+        confidence_level = (
+            (confidence_score >= self.config['min_confidence_threshold']).astype(np.int8) +
+            (confidence_score >= self.config['high_confidence_threshold']).astype(np.int8)
+        )
+
+        return {
+            'predicted_shift': shift,
+            'confidence_score': confidence_score,
+            'confidence_level': confidence_level
+        }
+
+    @staticmethod
+    def calculate_accuracy_arrays(
+        predicted_shift: np.ndarray,
+        initial_probability: np.ndarray,
+        final_probability: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized equivalent of calculate_prediction_accuracy.
+
+        Args:
+            predicted_shift: Predicted shifts (percentage points)
+            initial_probability: Market probability when the prediction was made
+            final_probability: Market probability at the end of the horizon
+
+        Returns:
+            Dictionary of arrays: actual_shift, absolute_error, relative_error,
+            direction_correct, accuracy_score
+        """
+        actual_shift = (np.asarray(final_probability, dtype=np.float64) - initial_probability) * 100
+        absolute_error = np.abs(predicted_shift - actual_shift)
+        relative_error = absolute_error / np.maximum(np.abs(actual_shift), 0.01)
+
+        return {
+            'actual_shift': actual_shift,
+            'absolute_error': absolute_error,
+            'relative_error': relative_error,
+            'direction_correct': np.sign(predicted_shift) == np.sign(actual_shift),
+            'accuracy_score': np.maximum(0.0, 1 - relative_error)
+        }
+
     def get_signal_strength(self, prediction: Dict) -> str:
         """
         Categorize prediction signal strength.
@@ -266,6 +367,21 @@ class PredictionEngine:
         else:
             return 'weak'
 
+    @staticmethod
+    def get_signal_score(prediction: Dict) -> float:
+        """
+        Rank key for signals within a strength bucket.
+
+        Args:
+            prediction: Prediction dictionary
+
+        Returns:
+            Confidence-weighted shift magnitude
+        """
+        confidence = prediction.get('confidence_score', 0) or 0
+        shift_magnitude = abs(prediction.get('predicted_shift', 0) or 0)
+        return round(confidence * shift_magnitude, 4)
+
 
 # Example usage and testing
 if __name__ == "__main__":
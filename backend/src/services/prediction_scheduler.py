@@ -0,0 +1,237 @@
+"""Incremental re-prediction scheduler with per-market dirty tracking."""
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from services.prediction_engine import PredictionEngine
+
+logger = logging.getLogger(__name__)
+
+
+def sentiment_version(sentiment_data: Dict) -> str:
+    """
+    Get the version of a sentiment aggregate.
+
+    Uses an explicit 'version' key when the producer sets one (e.g. the
+    SentimentScore row id); otherwise hashes the fields the engine reads.
+
+    Args:
+        sentiment_data: Sentiment metrics as passed to PredictionEngine
+
+    Returns:
+        Version string
+    """
+    if sentiment_data.get('version') is not None:
+        return str(sentiment_data['version'])
+
+    platforms = sentiment_data.get('platforms', {})
+    fingerprint = json.dumps([
+        sentiment_data.get('current_score', 0.0),
+        sentiment_data.get('previous_score', 0.0),
+        sentiment_data.get('mention_count', 0),
+        sentiment_data.get('historical_avg_volume', 100),
+        sorted((name, p.get('sentiment_score', 0)) for name, p in platforms.items())
+    ], default=str)
+    return hashlib.md5(fingerprint.encode()).hexdigest()
+
+
+class PredictionScheduler:
+    """Recompute predictions only for markets whose inputs changed."""
+
+    def __init__(
+        self,
+        engine: Optional[PredictionEngine] = None,
+        probability_epsilon: float = 0.005,
+        volume_epsilon: float = 0.05,
+        batch_size: int = 100,
+        time_horizons: Sequence[str] = ('1h', '6h', '24h')
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            engine: Prediction engine to run (a default engine if None)
+            probability_epsilon: Absolute probability change that triggers a recompute
+            volume_epsilon: Relative volume change that triggers a recompute
+            batch_size: Markets per engine batch
+            time_horizons: Horizons predicted for each market
+        """
+        self.engine = engine or PredictionEngine()
+        self.probability_epsilon = probability_epsilon
+        self.volume_epsilon = volume_epsilon
+        self.batch_size = batch_size
+        self.time_horizons = list(time_horizons)
+
+        self._versions: Dict[str, Dict] = {}  # Inputs behind each stored prediction
+        self._pending: 'OrderedDict[str, Dict]' = OrderedDict()  # Dirty markets awaiting recompute
+        self._predictions: Dict[str, List[Dict]] = {}
+        self._sentiments: Dict[str, Dict] = {}  # Latest sentiment per market, reused on price updates
+
+        self.stats = {'observed': 0, 'enqueued': 0, 'recomputed': 0, 'skipped': 0}
+
+    def _is_dirty(self, market_id: str, version: Dict) -> bool:
+        """Check whether new inputs differ from the stored ones beyond epsilon."""
+        last = self._versions.get(market_id)
+        if last is None:
+            return True
+
+        if version['sentiment'] != last['sentiment']:
+            return True
+
+        if abs(version['probability'] - last['probability']) > self.probability_epsilon:
+            return True
+
+        volume_change = abs(version['volume'] - last['volume']) / max(last['volume'], 1.0)
+        return volume_change > self.volume_epsilon
+
+    def observe(self, sentiment_data: Dict, market_data: Dict) -> bool:
+        """
+        Record the latest inputs for a market and enqueue it if they changed.
+
+        Args:
+            sentiment_data: Sentiment metrics for the market's topic
+            market_data: Market dictionary with market_id, probability and volume
+
+        Returns:
+            True if the market is queued for recompute
+        """
+        market_id = market_data.get('market_id')
+        if market_id is None:
+            return False
+
+        version = {
+            'sentiment': sentiment_version(sentiment_data),
+            'probability': float(market_data.get('current_probability') or 0.0),
+            'volume': float(market_data.get('volume') or 0.0)
+        }
+        self.stats['observed'] += 1
+        self._sentiments[market_id] = sentiment_data
+
+        if not self._is_dirty(market_id, version):
+            # Drop a queued recompute if the inputs moved back within epsilon
+            self._pending.pop(market_id, None)
+            self.stats['skipped'] += 1
+            return False
+
+        if market_id not in self._pending:
+            self.stats['enqueued'] += 1
+        self._pending[market_id] = {
+            'sentiment': sentiment_data,
+            'market': market_data,
+            'version': version
+        }
+        return True
+
+    def observe_markets(self, markets: Sequence[Dict]) -> int:
+        """
+        Re-observe price and volume updates against each market's latest sentiment.
+
+        Markets never observed with sentiment are ignored, so a price feed can
+        pass every market that moved without scheduling unrequested predictions.
+
+        Args:
+            markets: Updated market dictionaries
+
+        Returns:
+            Number of markets queued for recompute
+        """
+        return sum(
+            1 for market in markets
+            if market.get('market_id') in self._sentiments
+            and self.observe(self._sentiments[market['market_id']], market)
+        )
+
+    def on_market_changes(self, changes: Dict):
+        """MarketSync subscriber: re-observe updated markets and forget removed ones."""
+        self.observe_markets(changes.get('updated', []))
+        for market in changes.get('removed', []):
+            self.forget(market.get('market_id'))
+
+    @property
+    def pending(self) -> int:
+        """Number of markets awaiting recompute."""
+        return len(self._pending)
+
+    def run_pending(self) -> List[Dict]:
+        """
+        Recompute predictions for every dirty market in batches.
+
+        Returns:
+            Newly computed predictions
+        """
+        computed = []
+
+        while self._pending:
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popitem(last=False))
+
+            predictions = self.engine.predict_multiple_markets(
+                [{'sentiment': item['sentiment'], 'market': item['market']} for _, item in batch],
+                time_horizons=self.time_horizons
+            )
+
+            per_market = len(self.time_horizons)
+            for i, (market_id, item) in enumerate(batch):
+                self._predictions[market_id] = predictions[i * per_market:(i + 1) * per_market]
+                self._versions[market_id] = item['version']
+
+            computed.extend(predictions)
+            self.stats['recomputed'] += len(batch)
+
+        return computed
+
+    def tick(self, matched_data: List[Dict]) -> Dict:
+        """
+        Observe a full round of inputs and recompute only what changed.
+
+        Args:
+            matched_data: List of dicts with sentiment and market data
+
+        Returns:
+            Summary with observed, recomputed and unchanged market counts
+        """
+        enqueued = sum(
+            1 for data in matched_data
+            if self.observe(data.get('sentiment', {}), data.get('market', {}))
+        )
+        predictions = self.run_pending()
+
+        logger.info(f"Prediction tick: {enqueued}/{len(matched_data)} markets changed")
+        return {
+            'observed': len(matched_data),
+            'recomputed': enqueued,
+            'unchanged': len(matched_data) - enqueued,
+            'predictions': predictions
+        }
+
+    def get_predictions(self, market_id: str) -> List[Dict]:
+        """Get the stored predictions for a market."""
+        return self._predictions.get(market_id, [])
+
+    def forget(self, market_id: str):
+        """Drop all state for a market that is no longer watched."""
+        self._versions.pop(market_id, None)
+        self._pending.pop(market_id, None)
+        self._predictions.pop(market_id, None)
+        self._sentiments.pop(market_id, None)
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    scheduler = PredictionScheduler()
+    sentiment = {'current_score': 0.6, 'previous_score': 0.2, 'mention_count': 500}
+    markets = [
+        {'market_id': f'M{i}', 'title': f'Market {i}', 'current_probability': 0.5, 'volume': 10000}
+        for i in range(1000)
+    ]
+
+    first = scheduler.tick([{'sentiment': sentiment, 'market': m} for m in markets])
+    markets[0] = dict(markets[0], current_probability=0.55)
+    second = scheduler.tick([{'sentiment': sentiment, 'market': m} for m in markets])
+
+    print(f"First tick recomputed {first['recomputed']}, second tick recomputed {second['recomputed']}")
@@ -0,0 +1,280 @@
+"""Streaming price ingestion: venue feeds -> coalesced ticks -> market state and subscribers."""
+import time
+import random
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from integrations.market_record import MarketRecord
+from services.market_sync import MarketSync
+
+logger = logging.getLogger(__name__)
+
+# Where each venue keeps its YES top of book in market metadata
+BOOK_FIELDS = {
+    'kalshi': ('yes_bid_dollars', 'yes_ask_dollars'),
+    'polymarket': ('best_bid', 'best_ask')
+}
+
+
+class PriceFeed(ABC):
+    """
+    Source of price ticks for a set of markets.
+
+    Subclasses yield tick dicts with 'platform', 'market_id' and any of
+    'probability', 'yes_bid', 'yes_ask', 'volume' and 'ts' (Unix seconds).
+    `markets` is called whenever the feed wants the current catalog, so
+    it can follow markets being listed and delisted.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def stream(self, markets: Callable[[], List[Dict]]) -> AsyncIterator[Dict]:
+        """
+        Yield ticks until cancelled.
+
+        Args:
+            markets: Returns the markets currently tracked
+        """
+
+    async def close(self):
+        """Release connections held by the feed."""
+
+
+class SimulatedFeed(PriceFeed):
+    """Random-walk ticks around each market's current probability (tests and benchmarks)."""
+
+    name = 'simulated'
+
+    def __init__(
+        self,
+        rate: float = 20.0,
+        volatility: float = 0.01,
+        batch_size: int = 10,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize simulated feed.
+
+        Args:
+            rate: Ticks per second across all markets
+            volatility: Standard deviation of each probability step
+            batch_size: Ticks emitted per wake-up
+            seed: Random seed (deterministic runs)
+        """
+        self.rate = rate
+        self.volatility = volatility
+        self.batch_size = batch_size
+        self._random = random.Random(seed)
+        self._prices: Dict[Tuple[str, str], float] = {}
+
+    def _tick(self, market: Dict) -> Dict:
+        key = (market.get('platform', ''), str(market.get('market_id')))
+        price = self._prices.get(key, market.get('current_probability') or 0.5)
+        price = min(max(price + self._random.gauss(0, self.volatility), 0.01), 0.99)
+        self._prices[key] = price
+
+        half_spread = self._random.uniform(0.005, 0.02)
+        return {
+            'platform': key[0],
+            'market_id': key[1],
+            'probability': round(price, 4),
+            'yes_bid': round(max(price - half_spread, 0.0), 4),
+            'yes_ask': round(min(price + half_spread, 1.0), 4),
+            'volume': (market.get('volume') or 0) + self._random.randint(0, 500),
+            'ts': time.time()
+        }
+
+    async def stream(self, markets: Callable[[], List[Dict]]) -> AsyncIterator[Dict]:
+        while True:
+            catalog = markets()
+            if not catalog:
+                await asyncio.sleep(1.0)
+                continue
+
+            for market in self._random.choices(catalog, k=self.batch_size):
+                yield self._tick(market)
+            await asyncio.sleep(self.batch_size / self.rate)
+
+
+FEEDS = {'simulated': SimulatedFeed}
+
+
+def create_feed(name: Optional[str]) -> Optional[PriceFeed]:
+    """
+    Build a feed by name (see FEEDS).
+
+    Args:
+        name: Feed name, e.g. 'simulated'
+
+    Returns:
+        Feed instance, or None if the name is empty or unknown
+    """
+    if not name:
+        return None
+    feed_class = FEEDS.get(name)
+    if feed_class is None:
+        logger.warning(f"Unknown price feed '{name}', streaming disabled")
+        return None
+    return feed_class()
+
+
+def apply_tick(market: Dict, tick: Dict) -> Dict:
+    """
+    Copy of a market with a tick's price, volume and top of book applied.
+
+    Args:
+        market: Current market (dict or MarketRecord)
+        tick: Price tick
+
+    Returns:
+        Updated market of the same kind
+    """
+    updated = dict(market)
+    metadata = dict(updated.get('metadata') or {})
+
+    if tick.get('probability') is not None:
+        updated['current_probability'] = tick['probability']
+    if tick.get('volume') is not None:
+        updated['volume'] = tick['volume']
+
+    bid_field, ask_field = BOOK_FIELDS.get(market.get('platform'), BOOK_FIELDS['polymarket'])
+    if tick.get('yes_bid') is not None:
+        metadata[bid_field] = f"{tick['yes_bid']:.4f}" if market.get('platform') == 'kalshi' else tick['yes_bid']
+    if tick.get('yes_ask') is not None:
+        metadata[ask_field] = f"{tick['yes_ask']:.4f}" if market.get('platform') == 'kalshi' else tick['yes_ask']
+    updated['metadata'] = metadata
+
+    return MarketRecord(updated) if isinstance(market, MarketRecord) else updated
+
+
+class PriceStream:
+    """Consume a feed, coalesce ticks per market and apply them to MarketSync in batches."""
+
+    def __init__(self, market_sync: MarketSync, feed: PriceFeed, flush_interval: float = 2.0):
+        """
+        Initialize price stream.
+
+        Args:
+            market_sync: Market state that ticks are applied to (its change-set
+                subscribers see every price move)
+            feed: Tick source
+            flush_interval: Seconds between batched applies
+        """
+        self.market_sync = market_sync
+        self.feed = feed
+        self.flush_interval = flush_interval
+        self._pending: Dict[Tuple[str, str], Dict] = {}
+        self._subscribers: List[Callable[[List[Dict]], None]] = []
+        self.stats = {'ticks': 0, 'applied': 0, 'dropped': 0, 'batches': 0, 'lag_seconds': None}
+
+    def subscribe(self, callback: Callable[[List[Dict]], None]):
+        """Call `callback(updated_markets)` after every batch that moved a market."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[List[Dict]], None]):
+        """Stop notifying a subscriber."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def push(self, tick: Dict):
+        """Queue a tick; only the latest tick per market survives until the next flush."""
+        self._pending[(tick.get('platform', ''), str(tick.get('market_id')))] = tick
+        self.stats['ticks'] += 1
+
+    def flush(self) -> List[Dict]:
+        """
+        Apply queued ticks as one MarketSync change set (source 'ticks').
+
+        Ticks for markets that are not (or no longer) tracked are dropped.
+
+        Returns:
+            Markets that changed
+        """
+        if not self._pending:
+            return []
+
+        pending, self._pending = self._pending, {}
+        updated = []
+        for (platform, market_id), tick in pending.items():
+            market = self.market_sync.get(platform, market_id)
+            if market is None:
+                self.stats['dropped'] += 1
+                continue
+            updated.append(apply_tick(market, tick))
+
+        changed = self.market_sync.apply(updated, remove_missing=False, source='ticks')['updated']
+        newest = max((t.get('ts') or 0) for t in pending.values())
+        self.stats['applied'] += len(changed)
+        self.stats['batches'] += 1
+        self.stats['lag_seconds'] = round(time.time() - newest, 3) if newest else None
+
+        if changed:
+            for callback in list(self._subscribers):
+                try:
+                    callback(changed)
+                except Exception as e:
+                    logger.error(f"Error in price stream subscriber: {e}")
+        return changed
+
+    async def _consume(self):
+        async for tick in self.feed.stream(self.market_sync.markets):
+            self.push(tick)
+
+    async def _flush_forever(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.flush()
+
+    async def run_forever(self, reconnect_delay: float = 5.0):
+        """
+        Stream ticks until cancelled, reconnecting the feed if it fails.
+
+        Args:
+            reconnect_delay: Seconds to wait before reconnecting a failed feed
+        """
+        logger.info(f"Price stream started ({self.feed.name} feed, flush every {self.flush_interval}s)")
+        flusher = asyncio.create_task(self._flush_forever())
+        try:
+            while True:
+                try:
+                    await self._consume()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Price feed {self.feed.name} failed: {e}; reconnecting")
+                await asyncio.sleep(reconnect_delay)
+        finally:
+            flusher.cancel()
+            await self.feed.close()
+            self.flush()
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    sync = MarketSync()
+    sync.apply([
+        {'platform': 'kalshi', 'market_id': f"KX-{i}", 'title': f"Market {i}", 'current_probability': 0.5,
+         'volume': 1000, 'metadata': {'yes_bid_dollars': '0.4900', 'yes_ask_dollars': '0.5100'}}
+        for i in range(20)
+    ])
+
+    stream = PriceStream(sync, SimulatedFeed(rate=200, seed=1), flush_interval=0.5)
+    stream.subscribe(lambda markets: print(f"{len(markets)} markets moved, e.g. "
+                                           f"{markets[0]['market_id']} -> {markets[0]['current_probability']}"))
+
+    async def demo():
+        task = asyncio.create_task(stream.run_forever())
+        await asyncio.sleep(2)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(demo())
+    print(stream.stats)
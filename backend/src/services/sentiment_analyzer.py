@@ -12,13 +12,17 @@ logger = logging.getLogger(__name__)
 class SentimentAnalyzer:
     """Sentiment analysis using Hugging Face transformers."""
 
-    def __init__(self, model_name: str = "cardiffnlp/twitter-roberta-base-sentiment"):
+    def __init__(self, model_name: str = "cardiffnlp/twitter-roberta-base-sentiment", post_store=None):
         """
         Initialize sentiment analyzer with pre-trained model.
 
         Args:
             model_name: Hugging Face model identifier
+            post_store: Optional PostStore; posts it has already scored with this model are not rescored
         """
+        self.model_name = model_name
+        self.post_store = post_store
+
         try:
             logger.info(f"Loading sentiment model: {model_name}")
 
@@ -149,24 +153,32 @@ class SentimentAnalyzer:
             }
 
         # Extract texts
+        text_posts = []
         texts = []
         for post in posts:
             if post.get('platform') == 'twitter':
+                text_posts.append(post)
                 texts.append(post.get('text', ''))
             elif post.get('platform') == 'reddit':
                 # Combine title and text
                 title = post.get('title', '')
                 text = post.get('text', '')
+                text_posts.append(post)
                 texts.append(f"{title} {text}")
 
-        # Analyze sentiments
-        sentiments = self.analyze_batch(texts)
+        # Analyze sentiments (only posts the store has not scored with this model)
+        if self.post_store is not None:
+            stored = self.post_store.score_posts(text_posts, texts, self.model_name, self.analyze_batch)
+            scored = [(post, s) for post, s in zip(text_posts, stored) if s is not None]
+        else:
+            scored = list(zip(text_posts, self.analyze_batch(texts)))
+        sentiments = [s for _, s in scored]
 
         # Calculate weighted sentiment score (weight by engagement)
         weighted_scores = []
         total_weight = 0
 
-        for post, sentiment in zip(posts, sentiments):
+        for post, sentiment in scored:
             # Calculate engagement weight
             if post.get('platform') == 'twitter':
                 engagement = (
@@ -282,6 +294,59 @@ class MindshareCalculator:
 
         return round(mindshare, 3)
 
+    @staticmethod
+    def calculate_mindshare_batch(
+        mention_count: np.ndarray,
+        sentiment_score: np.ndarray,
+        engagement_score: np.ndarray,
+        historical_mentions: Optional[np.ndarray] = None,
+        historical_engagement: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_mindshare over columnar metrics for many topics.
+
+        Args:
+            mention_count: Current mention counts
+            sentiment_score: Current sentiment scores
+            engagement_score: Current engagement scores
+            historical_mentions: Historical average mentions (<= 0 means no baseline)
+            historical_engagement: Historical average engagement (<= 0 means no baseline)
+
+        Returns:
+            Array of mindshare scores
+        """
+        mention_count = np.asarray(mention_count, dtype=np.float64)
+        engagement_score = np.asarray(engagement_score, dtype=np.float64)
+
+        if historical_mentions is None:
+            historical_mentions = np.zeros_like(mention_count)
+        if historical_engagement is None:
+            historical_engagement = np.zeros_like(engagement_score)
+
+        has_volume_baseline = historical_mentions > 0
+        normalized_volume = np.where(
+            has_volume_baseline,
+            np.minimum(mention_count / np.where(has_volume_baseline, historical_mentions, 1), 2.0) / 2.0,
+            np.minimum(mention_count / 100, 1.0)
+        )
+
+        weighted_sentiment = (np.asarray(sentiment_score, dtype=np.float64) + 1) / 2
+
+        has_engagement_baseline = historical_engagement > 0
+        normalized_engagement = np.where(
+            has_engagement_baseline,
+            np.minimum(engagement_score / np.where(has_engagement_baseline, historical_engagement, 1), 2.0) / 2.0,
+            np.minimum(engagement_score / 1000, 1.0)
+        )
+
+        mindshare = (
+            0.4 * normalized_volume +
+            0.3 * weighted_sentiment +
+            0.3 * normalized_engagement
+        )
+
+        return np.round(mindshare, 3)
+
     @staticmethod
     def calculate_sentiment_velocity(
         current_score: float,
@@ -0,0 +1,220 @@
+"""In-memory ordered index of prediction signals by strength."""
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from sortedcontainers import SortedList
+
+from services.prediction_engine import PredictionEngine
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_STRENGTHS = ('strong', 'moderate', 'weak')
+
+
+class SignalIndex:
+    """
+    Sorted per-strength signal lists supporting top-N pages in O(log n + k).
+
+    Each bucket holds the top max_per_strength signals. Once a bucket has
+    dropped signals, pages past its end and its total come from the
+    predictions table instead.
+    """
+
+    def __init__(self, max_per_strength: Optional[int] = 5000):
+        """
+        Initialize signal index.
+
+        Args:
+            max_per_strength: Keep at most this many top signals per strength (None = unbounded)
+        """
+        self.max_per_strength = max_per_strength
+        self.engine = PredictionEngine()
+        self._keys: Dict[str, SortedList] = {s: SortedList() for s in SIGNAL_STRENGTHS}
+        self._truncated: Dict[str, bool] = {s: False for s in SIGNAL_STRENGTHS}  # Bucket missing stored signals
+        self._entries: Dict[int, Tuple[str, Tuple]] = {}  # prediction id -> (strength, key)
+        self._payloads: Dict[int, Dict] = {}
+
+    @staticmethod
+    def _sort_key(prediction_id: int, prediction: Dict) -> Tuple:
+        """Descending by signal score, then newest first."""
+        created_at = prediction.get('created_at')
+        created_ts = created_at.timestamp() if isinstance(created_at, datetime) else 0.0
+        score = prediction.get('signal_score')
+        if score is None:
+            score = PredictionEngine.get_signal_score(prediction)
+        return (-score, -created_ts, prediction_id)
+
+    def upsert(self, prediction_id: int, prediction: Dict):
+        """
+        Insert or reposition a prediction in the index.
+
+        Args:
+            prediction_id: Prediction primary key
+            prediction: Prediction dictionary (signal_strength computed if absent)
+        """
+        self.remove(prediction_id)
+
+        strength = prediction.get('signal_strength') or self.engine.get_signal_strength(prediction)
+        if strength not in self._keys:
+            strength = 'weak'
+
+        key = self._sort_key(prediction_id, prediction)
+        keys = self._keys[strength]
+
+        # Ignore signals that would fall straight off the end of a full bucket
+        if self.max_per_strength and keys.bisect_left(key) >= self.max_per_strength:
+            self._truncated[strength] = True
+            return
+
+        keys.add(key)
+        self._entries[prediction_id] = (strength, key)
+        self._payloads[prediction_id] = dict(prediction, id=prediction_id, signal_strength=strength)
+
+        if self.max_per_strength and len(keys) > self.max_per_strength:
+            evicted = keys.pop()
+            self._entries.pop(evicted[-1], None)
+            self._payloads.pop(evicted[-1], None)
+            self._truncated[strength] = True
+
+    def remove(self, prediction_id: int):
+        """Remove a prediction from the index if present."""
+        entry = self._entries.pop(prediction_id, None)
+        if entry is None:
+            return
+
+        strength, key = entry
+        self._keys[strength].discard(key)
+        self._payloads.pop(prediction_id, None)
+
+    def top(self, strength: str = 'strong', limit: int = 50, offset: int = 0, db=None) -> List[Dict]:
+        """
+        Get a page of the highest-ranked signals for a strength.
+
+        Args:
+            strength: 'strong', 'moderate' or 'weak'
+            limit: Page size
+            offset: Number of signals to skip
+            db: SQLAlchemy session for pages past the end of a truncated bucket
+
+        Returns:
+            List of prediction dictionaries
+        """
+        keys = self._keys.get(strength)
+        if keys is None:
+            return []
+
+        if db is not None and self._truncated[strength] and offset + limit > len(keys):
+            return self._top_from_db(db, strength, limit, offset)
+
+        return [self._payloads[key[-1]] for key in keys.islice(offset, offset + limit)]
+
+    def count(self, strength: str, db=None) -> int:
+        """
+        Number of signals for a strength.
+
+        Args:
+            strength: 'strong', 'moderate' or 'weak'
+            db: SQLAlchemy session to count a truncated bucket's stored signals
+
+        Returns:
+            Signal count (indexed signals only if db is None)
+        """
+        keys = self._keys.get(strength)
+        if keys is None:
+            return 0
+
+        if db is not None and self._truncated[strength]:
+            from models.database import Prediction
+            return db.query(Prediction).filter(Prediction.signal_strength == strength).count()
+
+        return len(keys)
+
+    def _top_from_db(self, db, strength: str, limit: int, offset: int) -> List[Dict]:
+        """Read a page from the predictions table in the index's order."""
+        from models.database import Prediction
+
+        rows = db.query(Prediction).filter(
+            Prediction.signal_strength == strength
+        ).order_by(
+            Prediction.signal_score.desc().nullslast(),
+            Prediction.created_at.desc(),
+            Prediction.id.asc()
+        ).offset(offset).limit(limit).all()
+
+        return [self._row_to_dict(row) for row in rows]
+
+    def load_from_db(self, db):
+        """
+        Warm the index from stored predictions.
+
+        Args:
+            db: SQLAlchemy session
+        """
+        from models.database import Prediction
+
+        loaded = 0
+        for strength in SIGNAL_STRENGTHS:
+            query = db.query(Prediction).filter(
+                Prediction.signal_strength == strength
+            ).order_by(
+                Prediction.signal_score.desc().nullslast(),
+                Prediction.created_at.desc(),
+                Prediction.id.asc()
+            )
+
+            if self.max_per_strength:
+                # One extra row tells whether the bucket is missing stored signals
+                query = query.limit(self.max_per_strength + 1)
+
+            for row in query.all():
+                self.upsert(row.id, self._row_to_dict(row))
+                loaded += 1
+
+        logger.info(f"Signal index loaded with {loaded} predictions")
+
+    def record(self, db, market_pk: int, prediction: Dict):
+        """
+        Persist a prediction with its signal fields and index it.
+
+        Args:
+            db: SQLAlchemy session
+            market_pk: Market primary key
+            prediction: Prediction dictionary from PredictionEngine
+
+        Returns:
+            Stored Prediction row
+        """
+        from models.database import Prediction
+
+        row = Prediction(
+            market_id=market_pk,
+            predicted_shift=prediction.get('predicted_shift', 0.0),
+            confidence_level=prediction.get('confidence_level', 'low'),
+            confidence_score=prediction.get('confidence_score'),
+            signal_strength=prediction.get('signal_strength') or self.engine.get_signal_strength(prediction),
+            signal_score=prediction.get('signal_score', self.engine.get_signal_score(prediction)),
+            reasoning=prediction.get('reasoning', ''),
+            time_horizon=prediction.get('time_horizon', '6h'),
+            initial_probability=prediction.get('current_probability')
+        )
+        db.add(row)
+        db.commit()
+
+        self.upsert(row.id, self._row_to_dict(row))
+        return row
+
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        """Serialize a Prediction row for API responses."""
+        return {
+            'id': row.id,
+            'market_id': row.market_id,
+            'predicted_shift': row.predicted_shift,
+            'confidence_level': row.confidence_level,
+            'confidence_score': row.confidence_score,
+            'signal_strength': row.signal_strength,
+            'signal_score': row.signal_score or 0.0,
+            'reasoning': row.reasoning,
+            'time_horizon': row.time_horizon,
+            'created_at': row.created_at
+        }
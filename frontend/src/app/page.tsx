@@ -60,7 +60,7 @@ export default function Home() {
   const fetchMarkets = async () => {
     try {
       const response = await axios.get(`${API_BASE_URL}/api/markets`, {
-        params: { limit: 50 }
+        params: { limit: 50, live: true }
       });
       setMarkets(response.data);
       setLoading(false);